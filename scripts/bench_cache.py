@@ -0,0 +1,91 @@
+"""
+Prediction cache: hit rate and time saved on repeated scoring runs.
+
+Builds a workload by sampling `--rows` rows with replacement from the input
+(so patients recur, as in repeated screening batches), then scores it
+`--runs` times per model: uncached, and through a `PredictionCache` with a
+fresh disk tier that persists between runs (a new process each run would
+see the same disk state). Reports wall time per run, hit rates and the max
+|proba difference| against uncached scoring.
+
+Usage:
+  PYTHONPATH=src python scripts/bench_cache.py --input data/processed/test.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from mlproj.inference.cache import DISK_FILENAME, DiskTier, PredictionCache, artifact_sha256
+from mlproj.inference.predict_baseline import prepare_features
+from mlproj.inference.registry import load_models, parse_model_specs
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--input", default="data/processed/test.csv")
+    ap.add_argument("--model", action="append", metavar="NAME=PATH")
+    ap.add_argument("--rows", type=int, default=20_000)
+    ap.add_argument("--runs", type=int, default=3)
+    args = ap.parse_args()
+
+    paths = parse_model_specs(args.model)
+    models = load_models(paths)
+    df = pd.read_csv(Path(args.input)).sample(n=args.rows, replace=True, random_state=0)
+
+    rows = []
+    for name, model in models.items():
+        x = prepare_features(model, df)
+
+        def score(frame: pd.DataFrame, model: Any = model) -> np.ndarray:
+            return np.asarray(model.predict_proba(frame))[:, 1]
+
+        t0 = time.perf_counter()
+        expected = score(x)
+        plain_s = time.perf_counter() - t0
+
+        with tempfile.TemporaryDirectory() as tmp:
+            sha = artifact_sha256(paths[name])
+            for run in range(1, args.runs + 1):
+                # Fresh process state each run; only the disk tier carries over.
+                disk = DiskTier(Path(tmp) / DISK_FILENAME, max_bytes=256 * 2**20)
+                cache = PredictionCache(sha, disk=disk)
+                t0 = time.perf_counter()
+                got = cache.wrap(score)(x)
+                cached_s = time.perf_counter() - t0
+                cache.close()
+                rows.append(
+                    {
+                        "model": name,
+                        "run": run,
+                        "uncached_ms": plain_s * 1e3,
+                        "cached_ms": cached_s * 1e3,
+                        "hit_rate": cache.stats.hit_rate,
+                        "scored_rows": cache.stats.scored_rows,
+                        "max_abs_diff": float(np.abs(got - expected).max()),
+                    }
+                )
+
+    out = pd.DataFrame(rows)
+    print(f"rows={args.rows} distinct={len(df.drop_duplicates())}")
+    print(
+        out.to_string(
+            index=False,
+            formatters={
+                "hit_rate": lambda v: f"{v:.1%}",
+                "max_abs_diff": lambda v: f"{v:.1e}",
+            },
+            float_format=lambda v: f"{v:,.1f}",
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
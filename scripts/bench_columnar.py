@@ -0,0 +1,94 @@
+"""
+Loading a split: `pd.read_csv` vs the columnar cache (`mlproj.data.columnar.read_table`).
+
+For each `--rows`, writes a heart-shaped synthetic CSV (13 integer / float
+features + target) and times:
+
+- read_csv: the parse every loader used to do;
+- cold: the first read_table (parse, hash, write the .cols file);
+- warm: later read_tables (stat + map, copy the columns out, no parse);
+- mapped: warm with readonly=True (the columns wrap the map, no copy);
+- mapped + touch: mapped, then summing every column so all pages are read.
+
+Small tables are timed over `--repeats` runs (best). Checks the cached frame
+equals read_csv's.
+
+Usage:
+  PYTHONPATH=src python scripts/bench_columnar.py --rows 303 10000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from mlproj.data.columnar import cache_dir, read_table
+
+_INT = ["age", "sex", "cp", "trestbps", "chol", "fbs", "restecg", "thalach", "exang", "slope"]
+_FLOAT = ["oldpeak", "ca", "thal"]
+
+
+def _write(path: Path, rows: int) -> None:
+    rng = np.random.default_rng(0)
+    data: dict[str, np.ndarray] = {c: rng.integers(0, 250, rows) for c in _INT}
+    data.update({c: rng.integers(0, 70, rows) / 10.0 for c in _FLOAT})
+    data["target"] = rng.integers(0, 2, rows)
+    pd.DataFrame(data).to_csv(path, index=False)
+
+
+def _best(fn: Callable[[], object], repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def _bench(path: Path, repeats: int) -> tuple[list[float], bool]:
+    """(read_csv, cold, warm, mapped, mapped + touch) seconds, and whether the frames are equal."""
+    parse_s = _best(lambda: pd.read_csv(path), repeats)
+
+    def cold() -> None:
+        shutil.rmtree(cache_dir(path), ignore_errors=True)
+        read_table(path, cache=True)
+
+    cold_s = _best(cold, repeats)
+    warm_s = _best(lambda: read_table(path, cache=True), repeats)
+    mapped_s = _best(lambda: read_table(path, cache=True, readonly=True), repeats)
+    touch_s = _best(lambda: read_table(path, cache=True, readonly=True).sum(), repeats)
+    equal = read_table(path, cache=True).equals(pd.read_csv(path))
+    return [parse_s, cold_s, warm_s, mapped_s, touch_s], equal
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[303, 10_000_000])
+    ap.add_argument("--repeats", type=int, default=20, help="Runs per timing below 100k rows")
+    args = ap.parse_args()
+
+    print(
+        f"{'rows':>12} {'CSV MB':>8} {'read_csv':>10} {'cold':>10} {'warm':>10} {'mapped':>10} "
+        f"{'map+touch':>10} {'speedup':>8}  equal"
+    )
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "train.csv"
+            _write(path, rows)
+            repeats = args.repeats if rows < 100_000 else 1
+            times, equal = _bench(path, repeats)
+            mb = path.stat().st_size / 1e6
+
+        cells = " ".join(f"{t * 1e3:>8.2f}ms" for t in times)
+        print(f"{rows:>12,} {mb:>8.1f} {cells} {times[0] / times[2]:>7.0f}x  {equal}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Three-model comparison: the per-model Make chain of subprocesses vs one `compare` run.
+
+The legacy chain runs, per model, predict (val) -> sweep_thresholds --exact
+-> pick_best_threshold -> predict (test, tuned threshold) -> eval_predictions,
+then compare_models_3: 16 interpreter starts, each re-importing pandas /
+sklearn, re-loading the model and re-parsing CSVs. `mlproj.evaluation.compare`
+does the same work from the manifest in one process. Reports wall time of
+both and whether the two markdown reports are identical.
+
+Run from the repo root after training (models/*.joblib, data/processed/*.csv).
+
+Usage:
+  PYTHONPATH=src python scripts/bench_compare.py --workers 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from mlproj.evaluation.compare import load_manifest
+
+# Manifest model name -> compare_models_3 flag prefix (and mlproj.inference.predict_<key>).
+_LEGACY = {"baseline_logreg": "baseline", "random_forest": "rf", "hist_gradient_boosting": "hgb"}
+
+
+def _py(*argv: str) -> str:
+    out = subprocess.run([sys.executable, *argv], check=True, capture_output=True, text=True)
+    return out.stdout
+
+
+def _legacy(manifest_path: Path, metric: str, out_dir: Path) -> tuple[Path, int]:
+    manifest = load_manifest(manifest_path)
+    val, test = str(manifest.val), str(manifest.test)
+    calls = 0
+    compare_args = ["--metric", metric, "--input", test]
+    for spec in manifest.models:
+        key = _LEGACY[spec.name]
+        module = f"mlproj.inference.predict_{key}"
+        d = {
+            s: str(out_dir / f"{key}_{s}")
+            for s in ("val.csv", "sweep.csv", "test.csv", "eval.json")
+        }
+        thr_file = out_dir / f"{key}_thr.txt"
+        model = ["--model", str(spec.artifact)]
+        _py("-m", module, *model, "--input", val, "--out", d["val.csv"])
+        _py(
+            "-m",
+            "mlproj.evaluation.sweep_thresholds",
+            "--input",
+            val,
+            "--preds",
+            d["val.csv"],
+            "--out",
+            d["sweep.csv"],
+            "--exact",
+        )
+        thr = _py(
+            "-m",
+            "mlproj.evaluation.pick_best_threshold",
+            "--csv",
+            d["sweep.csv"],
+            "--metric",
+            metric,
+        ).strip()
+        thr_file.write_text(thr + "\n", encoding="utf-8")
+        _py("-m", module, *model, "--input", test, "--out", d["test.csv"], "--threshold", thr)
+        _py(
+            "-m",
+            "mlproj.evaluation.eval_predictions",
+            "--input",
+            test,
+            "--preds",
+            d["test.csv"],
+            "--out",
+            d["eval.json"],
+        )
+        calls += 5
+        compare_args += [f"--{key}-eval", d["eval.json"], f"--{key}-threshold-file", str(thr_file)]
+        compare_args += [f"--{key}-preds", d["test.csv"]]
+    report = out_dir / "legacy.md"
+    _py("-m", "mlproj.evaluation.compare_models_3", *compare_args, "--out", str(report))
+    return report, calls + 1
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--manifest", default="configs/compare_models.json")
+    ap.add_argument("--metric", default="f1")
+    ap.add_argument("--workers", type=int, default=3)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = Path(tmp)
+        t0 = time.perf_counter()
+        legacy_report, calls = _legacy(Path(args.manifest), args.metric, out_dir)
+        legacy_s = time.perf_counter() - t0
+
+        engine_report = out_dir / "engine.md"
+        t0 = time.perf_counter()
+        _py(
+            "-m",
+            "mlproj.evaluation.compare",
+            "--manifest",
+            args.manifest,
+            "--metric",
+            args.metric,
+            "--workers",
+            str(args.workers),
+            "--out",
+            str(engine_report),
+        )
+        engine_s = time.perf_counter() - t0
+        same = legacy_report.read_bytes() == engine_report.read_bytes()
+
+    print(f"legacy chain ({calls} subprocesses): {legacy_s:6.1f} s")
+    print(f"compare engine (1 process, workers={args.workers}): {engine_s:6.1f} s")
+    print(f"speedup x{legacy_s / engine_s:.1f} | reports identical: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark the compiled NumPy baseline scorer against the joblib pipeline.
+
+Reports max |proba difference|, single-row latency (one record per call, as an
+online scorer would see it) and batch throughput.
+
+Usage:
+  PYTHONPATH=src python scripts/bench_compiled_baseline.py --model models/baseline_logreg.joblib
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from mlproj.inference.compiled_linear import compile_pipeline
+
+
+def _per_call_us(fn: Callable[[], object], calls: int) -> float:
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - t0) / calls * 1e6
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", default="models/baseline_logreg.joblib")
+    ap.add_argument("--batch-rows", type=int, default=1_000_000)
+    ap.add_argument("--single-calls", type=int, default=2000)
+    args = ap.parse_args()
+
+    pipe = joblib.load(args.model)
+    compiled = compile_pipeline(pipe)
+    features = list(compiled.feature_names)
+
+    rng = np.random.default_rng(0)
+    x = rng.normal(loc=1.0, scale=2.0, size=(args.batch_rows, len(features)))
+    x[rng.random(x.shape) < 0.01] = np.nan
+    df = pd.DataFrame(x, columns=features)
+
+    max_diff = float(np.max(np.abs(pipe.predict_proba(df)[:, 1] - compiled.proba(x))))
+
+    one_df = df.head(1)
+    one_x = x[:1]
+    rows = [
+        {
+            "path": "joblib pipeline",
+            "single_row_us": _per_call_us(lambda: pipe.predict_proba(one_df), args.single_calls),
+            "batch_rows_per_s": args.batch_rows
+            / (_per_call_us(lambda: pipe.predict_proba(df), 3) / 1e6),
+        },
+        {
+            "path": "compiled npz",
+            "single_row_us": _per_call_us(lambda: compiled.proba(one_x), args.single_calls),
+            "batch_rows_per_s": args.batch_rows
+            / (_per_call_us(lambda: compiled.proba(x), 3) / 1e6),
+        },
+    ]
+    out = pd.DataFrame(rows)
+    print(f"max |proba diff| = {max_diff:.3e} over {args.batch_rows} rows")
+    print(out.to_string(index=False, float_format=lambda v: f"{v:,.1f}"))
+    print(f"single-row speedup: {rows[0]['single_row_us'] / rows[1]['single_row_us']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
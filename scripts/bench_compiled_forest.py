@@ -0,0 +1,130 @@
+"""
+Benchmark the compiled RandomForest (.trees) against the joblib artifact.
+
+Load time and RSS growth are measured in fresh subprocesses (so neither path
+benefits from objects already in memory); scoring is timed in-process, and
+probabilities are checked for exact equality with `predict_proba` (n_jobs=1).
+
+Usage:
+  PYTHONPATH=src python scripts/bench_compiled_forest.py --model models/rf.joblib
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from mlproj.inference.compiled_forest import compile_forest, save_compiled_forest
+
+# Current RSS (VmRSS) rather than ru_maxrss, which is inherited across exec.
+_LOAD_SNIPPET = """
+import json, sys, time
+from pathlib import Path
+import numpy, joblib
+from mlproj.inference.compiled_forest import load_compiled_forest
+def rss_kb():
+    line = next(l for l in open("/proc/self/status") if l.startswith("VmRSS:"))
+    return int(line.split()[1])
+before = rss_kb()
+t0 = time.perf_counter()
+m = joblib.load(sys.argv[1]) if sys.argv[1].endswith(".joblib") else load_compiled_forest(Path(sys.argv[1]))
+load_s = time.perf_counter() - t0
+print(json.dumps({"load_ms": load_s * 1e3, "rss_delta_mb": (rss_kb() - before) / 1024}))
+"""
+
+
+def _load_stats(path: Path, repeats: int = 3) -> dict[str, float]:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(Path(__file__).resolve().parents[1] / "src")
+    runs = [
+        json.loads(
+            subprocess.run(
+                [sys.executable, "-c", _LOAD_SNIPPET, str(path)],
+                check=True,
+                capture_output=True,
+                text=True,
+                env=env,
+            ).stdout
+        )
+        for _ in range(repeats)
+    ]
+    return {k: float(np.median([r[k] for r in runs])) for k in runs[0]}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", default="models/rf.joblib")
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--single-calls", type=int, default=200)
+    args = ap.parse_args()
+
+    clf = joblib.load(args.model)
+    clf.n_jobs = 1
+    compiled = compile_forest(clf)
+
+    rng = np.random.default_rng(0)
+    x = pd.DataFrame(
+        rng.normal(size=(args.rows, len(compiled.feature_names))) * 50 + 100,
+        columns=list(compiled.feature_names),
+    )
+    arr = x.to_numpy()
+
+    t0 = time.perf_counter()
+    expected = np.asarray(clf.predict_proba(x))[:, 1]
+    sk_batch = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    got = compiled.proba(arr)
+    c_batch = time.perf_counter() - t0
+
+    one_df, one_arr = x.head(1), arr[:1]
+    t0 = time.perf_counter()
+    for _ in range(args.single_calls):
+        clf.predict_proba(one_df)
+    sk_single = (time.perf_counter() - t0) / args.single_calls
+    t0 = time.perf_counter()
+    for _ in range(args.single_calls):
+        compiled.proba(one_arr)
+    c_single = (time.perf_counter() - t0) / args.single_calls
+
+    with tempfile.TemporaryDirectory() as td:
+        trees_path = Path(td) / "rf.trees"
+        save_compiled_forest(compiled, trees_path)
+        joblib_stats = _load_stats(Path(args.model))
+        trees_stats = _load_stats(trees_path)
+        sizes = (Path(args.model).stat().st_size, trees_path.stat().st_size)
+
+    rows = [
+        {
+            "artifact": "joblib",
+            "file_mb": sizes[0] / 2**20,
+            **joblib_stats,
+            "single_row_ms": sk_single * 1e3,
+            "batch_rows_per_s": args.rows / sk_batch,
+        },
+        {
+            "artifact": "compiled .trees",
+            "file_mb": sizes[1] / 2**20,
+            **trees_stats,
+            "single_row_ms": c_single * 1e3,
+            "batch_rows_per_s": args.rows / c_batch,
+        },
+    ]
+    print(
+        f"trees={compiled.n_trees} nodes={len(compiled.feature)} max_depth={compiled.max_depth} "
+        f"identical={bool(np.array_equal(got, expected))}"
+    )
+    print(pd.DataFrame(rows).to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark the compiled HistGradientBoosting model (.trees) against the joblib artifact.
+
+Cold start is the wall time of a fresh interpreter that imports what it
+needs, loads the model and scores one row. Steady-state single-row latency
+and batch throughput are timed in-process; raw scores are checked for exact
+equality with sklearn's `decision_function`.
+
+Usage:
+  PYTHONPATH=src python scripts/bench_compiled_hgb.py --model models/hgb.joblib
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from mlproj.inference.compiled_hgb import compile_hgb, save_compiled_hgb
+
+_COLD_JOBLIB = """
+import sys
+import joblib, pandas as pd
+m = joblib.load(sys.argv[1])
+m.predict_proba(pd.DataFrame([[0.0] * m.n_features_in_], columns=m.feature_names_in_))
+"""
+
+_COLD_TREES = """
+import sys
+from pathlib import Path
+from mlproj.inference.compiled_hgb import load_compiled_hgb
+m = load_compiled_hgb(Path(sys.argv[1]))
+m.proba([[0.0] * len(m.feature_names)])
+"""
+
+
+def _cold_start_ms(snippet: str, path: Path, repeats: int) -> float:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(Path(__file__).resolve().parents[1] / "src")
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", snippet, str(path)], check=True, env=env)
+        times.append(time.perf_counter() - t0)
+    return float(np.median(times)) * 1e3
+
+
+def _per_call_s(fn: Callable[[], object], calls: int) -> float:
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - t0) / calls
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", default="models/hgb.joblib")
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--single-calls", type=int, default=500)
+    ap.add_argument("--cold-repeats", type=int, default=5)
+    args = ap.parse_args()
+
+    clf = joblib.load(args.model)
+    compiled = compile_hgb(clf)
+
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(args.rows, len(compiled.feature_names))) * 50 + 100
+    x[rng.random(x.shape) < 0.02] = np.nan
+    df = pd.DataFrame(x, columns=list(compiled.feature_names))
+    identical = bool(
+        np.array_equal(compiled.decision_function(x), np.asarray(clf.decision_function(df)))
+    )
+
+    with tempfile.TemporaryDirectory() as td:
+        trees_path = Path(td) / "hgb.trees"
+        save_compiled_hgb(compiled, trees_path)
+        cold = (
+            _cold_start_ms(_COLD_JOBLIB, Path(args.model), args.cold_repeats),
+            _cold_start_ms(_COLD_TREES, trees_path, args.cold_repeats),
+        )
+
+    one_df, one_x = df.head(1), x[:1]
+    rows = [
+        {
+            "path": "joblib sklearn",
+            "cold_start_ms": cold[0],
+            "single_row_us": _per_call_s(lambda: clf.predict_proba(one_df), args.single_calls)
+            * 1e6,
+            "batch_rows_per_s": args.rows / _per_call_s(lambda: clf.predict_proba(df), 1),
+        },
+        {
+            "path": "compiled lookup",
+            "cold_start_ms": cold[1],
+            "single_row_us": _per_call_s(lambda: compiled.proba(one_x), args.single_calls) * 1e6,
+            "batch_rows_per_s": args.rows / _per_call_s(lambda: compiled.proba(x), 1),
+        },
+        {
+            "path": "compiled nodes",
+            "cold_start_ms": float("nan"),
+            "single_row_us": _per_call_s(
+                lambda: compiled.decision_function(one_x, method="nodes"), args.single_calls
+            )
+            * 1e6,
+            "batch_rows_per_s": args.rows
+            / _per_call_s(lambda: compiled.decision_function(x, method="nodes"), 1),
+        },
+    ]
+    print(
+        f"trees={compiled.n_trees} nodes={len(compiled.feature)} "
+        f"mask={compiled.leaf_masks.dtype} identical_raw_scores={identical}"
+    )
+    print(pd.DataFrame(rows).to_string(index=False, float_format=lambda v: f"{v:,.1f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Cross-validation wall time: a loop of sklearn `cross_val_score` calls vs `cross_validate`.
+
+The loop is what the engine replaces: one `cross_val_score` per (model,
+candidate) over the same RepeatedStratifiedKFold. Each call refits the
+baseline's imputer and scaler for every candidate, and the calls run one
+after another. `mlproj.models.cross_validate` fits the preprocessing once
+per fold and spreads the (model, fold) jobs over `--workers` processes.
+Reports wall time of each, and the largest difference between their
+per-candidate mean scores.
+
+Run from the repo root after `make split`.
+
+Usage:
+  PYTHONPATH=src python scripts/bench_cv.py --grid configs/cv_grid.json --workers 1 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import pandas as pd
+from sklearn.model_selection import RepeatedStratifiedKFold, cross_val_score
+
+from mlproj.data.columnar import read_table
+from mlproj.models.cross_validate import cross_validate, load_grid, make_estimator
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--grid", default="configs/cv_grid.json")
+    ap.add_argument(
+        "--data", nargs="+", default=["data/processed/train.csv", "data/processed/val.csv"]
+    )
+    ap.add_argument("--metric", default="roc_auc")
+    ap.add_argument("--splits", type=int, default=5)
+    ap.add_argument("--repeats", type=int, default=3)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    args = ap.parse_args()
+
+    grid = load_grid(Path(args.grid))
+    paths = [Path(p) for p in args.data]
+    df = pd.concat([read_table(p) for p in paths], ignore_index=True)
+    x, y = df.drop(columns=["target"]), df["target"].astype(int)
+    cv = RepeatedStratifiedKFold(n_splits=args.splits, n_repeats=args.repeats, random_state=42)
+
+    t0 = time.perf_counter()
+    expected = {
+        (model, json.dumps(params, sort_keys=True)): cross_val_score(
+            make_estimator(model, params, x), x, y, cv=cv, scoring=args.metric
+        ).mean()
+        for model, candidates in grid.items()
+        for params in candidates
+    }
+    loop_s = time.perf_counter() - t0
+    n_fits = len(expected) * args.splits * args.repeats
+    print(f"{len(expected)} candidates x {args.splits * args.repeats} folds = {n_fits} fits")
+    print(f"cross_val_score loop:          {loop_s:7.2f} s")
+
+    for workers in args.workers:
+        t0 = time.perf_counter()
+        results, _ = cross_validate(
+            grid,
+            paths,
+            metric=args.metric,
+            n_splits=args.splits,
+            n_repeats=args.repeats,
+            workers=workers,
+        )
+        engine_s = time.perf_counter() - t0
+        diff = max(
+            abs(row.mean - expected[(row.model, row.params)])
+            for row in results.itertuples(index=False)
+        )
+        print(
+            f"cross_validate (workers={workers}): {engine_s:7.2f} s | x{loop_s / engine_s:.2f} "
+            f"| max |mean diff| {diff:.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Measure the import-time cost of every `mlproj` CLI entry point and enforce a budget.
+
+Each module with an `if __name__ == "__main__":` block is imported in a fresh
+interpreter under `python -X importtime`; the report is parsed and the
+cumulative times of the top-level `mlproj` imports are summed (the module, its
+parent packages and everything they pull in, excluding interpreter startup
+imports such as `site`). The best of `--repeats` runs is compared
+with the budget from `[tool.mlproj.import-budget]` in pyproject.toml:
+
+    [tool.mlproj.import-budget]
+    default-ms = 1000
+    overrides = { "mlproj.models.train_rf" = 3500 }
+
+Exits non-zero if any entry point is over its budget.
+
+Usage:
+  PYTHONPATH=src python scripts/bench_import_time.py [--repeats 3] [--module mlproj.x.y ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tomllib
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+# "import time: self [us] | cumulative | imported package" (nesting = leading spaces)
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass(frozen=True)
+class ImportProfile:
+    total_ms: float
+    heaviest: list[tuple[str, float]]
+
+
+def entry_points() -> list[str]:
+    modules = []
+    for path in sorted(SRC.rglob("*.py")):
+        if 'if __name__ == "__main__":' in path.read_text(encoding="utf-8"):
+            modules.append(".".join(path.relative_to(SRC).with_suffix("").parts))
+    return modules
+
+
+def load_budget(pyproject: Path) -> tuple[float, dict[str, float]]:
+    config = tomllib.loads(pyproject.read_text(encoding="utf-8"))
+    budget = config.get("tool", {}).get("mlproj", {}).get("import-budget", {})
+    overrides = {str(k): float(v) for k, v in budget.get("overrides", {}).items()}
+    return float(budget.get("default-ms", 1000)), overrides
+
+
+def parse_importtime(stderr: str) -> ImportProfile:
+    """Sum top-level `mlproj` cumulative times; report the heaviest direct imports under them."""
+    total_ms = 0.0
+    direct: list[tuple[str, float]] = []
+    # Children are reported before their parent, so hold them until it appears.
+    pending: list[tuple[str, float]] = []
+    for line in stderr.splitlines():
+        m = _LINE.match(line)
+        if m is None:
+            continue
+        level = (len(m.group(3)) - 1) // 2
+        name, cumulative_ms = m.group(4), int(m.group(2)) / 1e3
+        if level == 1:
+            pending.append((name, cumulative_ms))
+        elif level == 0:
+            if name.split(".")[0] == "mlproj":
+                total_ms += cumulative_ms
+                direct.extend(pending)
+            pending = []
+    heaviest = sorted(direct, key=lambda kv: kv[1], reverse=True)[:3]
+    return ImportProfile(total_ms=total_ms, heaviest=heaviest)
+
+
+def profile_module(module: str, repeats: int) -> ImportProfile:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(SRC)
+    runs = []
+    for _ in range(repeats):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            raise SystemExit(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+        runs.append(parse_importtime(proc.stderr))
+    return min(runs, key=lambda p: p.total_ms)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeats", type=int, default=3)
+    ap.add_argument("--module", action="append", help="Entry point(s) to check (default: all)")
+    ap.add_argument("--pyproject", default=str(ROOT / "pyproject.toml"))
+    args = ap.parse_args()
+
+    default_ms, overrides = load_budget(Path(args.pyproject))
+    modules = args.module or entry_points()
+
+    rows = []
+    for module in modules:
+        profile = profile_module(module, args.repeats)
+        budget = overrides.get(module, default_ms)
+        rows.append((module, profile, budget))
+
+    width = max(len(m) for m, _, _ in rows)
+    print(
+        f"{'module':<{width}}  {'import_ms':>9}  {'budget_ms':>9}  status  heaviest direct imports"
+    )
+    over = []
+    for module, profile, budget in sorted(rows, key=lambda r: r[1].total_ms, reverse=True):
+        status = "ok" if profile.total_ms <= budget else "OVER"
+        if status == "OVER":
+            over.append(module)
+        print(
+            f"{module:<{width}}  {profile.total_ms:>9.0f}  {budget:>9.0f}  {status:<6}  "
+            + ", ".join(f"{name} {ms:.0f}" for name, ms in profile.heaviest)
+        )
+
+    if over:
+        raise SystemExit(f"{len(over)} entry point(s) over the import budget: {', '.join(over)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Permutation importance wall time: sklearn per model vs `permutation_importance` at N workers.
+
+sklearn.inspection.permutation_importance runs once per model: it re-scores
+the unshuffled baseline, copies the feature matrix for each shuffle and
+predicts through the estimator. `mlproj.evaluation.permutation_importance`
+scores all models on one preallocated buffer per process, shuffling one
+column in place, with (feature, repeat) jobs spread over `--workers`
+processes. Reports wall time of each, and whether every worker count gives
+the same table.
+
+Run from the repo root after training. `--tile K` repeats the test rows K
+times (a larger input, same features).
+
+Usage:
+  PYTHONPATH=src python scripts/bench_importance.py --workers 1 2 4 --tile 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from mlproj.evaluation.permutation_importance import permutation_importance
+from mlproj.inference.registry import load_models, parse_model_specs
+
+
+def _sklearn(model_paths: dict[str, Path], input_path: Path, repeats: int) -> float:
+    from sklearn.inspection import permutation_importance as sk_permutation_importance
+
+    df = pd.read_csv(input_path)
+    x, y = df.drop(columns=["target"]), df["target"].astype(int)
+    t0 = time.perf_counter()
+    for model in load_models(model_paths).values():
+        sk_permutation_importance(model, x, y, scoring="roc_auc", n_repeats=repeats, random_state=0)
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--input", default="data/processed/test.csv")
+    ap.add_argument("--model", action="append", metavar="NAME=PATH")
+    ap.add_argument("--repeats", type=int, default=10)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--tile", type=int, default=1, help="Repeat the input rows this many times")
+    args = ap.parse_args()
+
+    model_paths = parse_model_specs(args.model)
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = Path(tmp) / "input.csv"
+        df = pd.read_csv(args.input)
+        pd.concat([df] * args.tile, ignore_index=True).to_csv(input_path, index=False)
+        n_features = df.shape[1] - 1
+        print(
+            f"{len(df) * args.tile:,} rows x {n_features} features x {args.repeats} repeats, "
+            f"{len(model_paths)} models, {os.cpu_count()} CPUs"
+        )
+
+        sk = _sklearn(model_paths, input_path, args.repeats)
+        print(f"sklearn permutation_importance, per model: {sk:7.2f} s")
+        tables = []
+        for workers in args.workers:
+            t0 = time.perf_counter()
+            tables.append(
+                permutation_importance(
+                    model_paths, input_path, repeats=args.repeats, workers=workers
+                )
+            )
+            elapsed = time.perf_counter() - t0
+            print(
+                f"permutation_importance, workers={workers}:  {elapsed:7.2f} s | x{sk / elapsed:.1f}"
+            )
+    same = all(t.equals(tables[0]) for t in tables)
+    print(f"identical across worker counts: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Per-call cost of threshold metrics: four sklearn scorers vs one confusion-count kernel.
+
+`accuracy_score`, `precision_score`, `recall_score` and `f1_score` each
+validate their inputs and rebuild the confusion matrix;
+`classification_metrics` does one np.bincount and derives all four from
+(tp, fp, tn, fn). Times both per call at each `--sizes` n (split-sized and
+large) and checks the results are identical.
+
+Usage:
+  PYTHONPATH=src python scripts/bench_metrics.py --sizes 300 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+from typing import Any, cast
+
+import numpy as np
+
+from mlproj.evaluation.metrics import classification_metrics
+
+
+def _sklearn(y: np.ndarray, pred: np.ndarray) -> dict[str, float]:
+    from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+
+    zd = cast(Any, 0)
+    return {
+        "accuracy": float(accuracy_score(y, pred)),
+        "precision": float(precision_score(y, pred, zero_division=zd)),
+        "recall": float(recall_score(y, pred, zero_division=zd)),
+        "f1": float(f1_score(y, pred, zero_division=zd)),
+    }
+
+
+def _per_call(fn: Callable[..., dict[str, float]], *args: np.ndarray) -> float:
+    """Mean seconds per call over at least one second of calls."""
+    calls, t0 = 0, time.perf_counter()
+    while True:
+        fn(*args)
+        calls += 1
+        elapsed = time.perf_counter() - t0
+        if elapsed >= 1.0:
+            return elapsed / calls
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[300, 1_000_000])
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    for n in args.sizes:
+        y = rng.integers(0, 2, n)
+        pred = np.where(rng.random(n) < 0.8, y, 1 - y)
+        same = _sklearn(y, pred) == classification_metrics(y, pred)
+        sk = _per_call(_sklearn, y, pred)
+        kernel = _per_call(classification_metrics, y, pred)
+        print(
+            f"n={n:>10,}: sklearn scorers {sk * 1e3:9.3f} ms | kernel {kernel * 1e3:8.3f} ms"
+            f" | x{sk / kernel:6.1f} | identical: {same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
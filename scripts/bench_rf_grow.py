@@ -0,0 +1,93 @@
+"""
+Adding trees to the RandomForest: warm-start growth vs retraining from scratch.
+
+Retraining fits all `--trees + --grow` trees again. `train_rf --grow` loads
+the `--trees` forest and fits only the new trees. Both use the same
+random_state, so they should give the same forest. Reports the fit time of
+each, trees/s, whether they predict identically on val and test, and the
+single-threaded predict_proba latency per extra tree. Nothing outside a
+scratch directory is written.
+
+Run from the repo root after `make split`.
+
+Usage:
+  PYTHONPATH=src python scripts/bench_rf_grow.py --trees 400 --grow 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import joblib
+import numpy as np
+
+from mlproj.data.columnar import read_table
+from mlproj.models.train_rf import train_rf, tree_latency
+
+
+def _fit(splits: tuple, model_out: Path, n_estimators: int, n_jobs: int, **grow: Any) -> float:
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        train_rf(
+            *splits,
+            model_out=model_out,
+            report_out=model_out.with_suffix(".md"),
+            n_estimators=n_estimators,
+            max_depth=None,
+            random_state=42,
+            n_jobs=n_jobs,
+            **grow,
+        )
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--data-dir", default="data/processed")
+    ap.add_argument("--trees", type=int, default=400)
+    ap.add_argument("--grow", type=int, default=100)
+    ap.add_argument("--n-jobs", type=int, default=-1)
+    args = ap.parse_args()
+
+    data_dir = Path(args.data_dir)
+    splits = tuple(read_table(data_dir / f"{s}.csv") for s in ("train", "val", "test"))
+    val, test = splits[1], splits[2]
+    total = args.trees + args.grow
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp)
+        _fit(splits, out / "base.joblib", args.trees, args.n_jobs)
+        scratch_s = _fit(splits, out / "scratch.joblib", total, args.n_jobs)
+        base = joblib.load(out / "base.joblib")
+        grow_s = _fit(splits, out / "grown.joblib", 0, args.n_jobs, base=base, grow=args.grow)
+        scratch, grown = joblib.load(out / "scratch.joblib"), joblib.load(out / "grown.joblib")
+
+    same = True
+    for df in (val, test):
+        x = df.drop(columns=["target"])
+        same &= bool(np.array_equal(scratch.predict_proba(x), grown.predict_proba(x)))
+    x_test = test.drop(columns=["target"])
+    per_row, _ = tree_latency(grown, x_test.iloc[:1])
+    per_batch, _ = tree_latency(grown, x_test)
+
+    print(f"{args.trees} -> {total} trees (train + val/test evaluation, n_jobs={args.n_jobs})")
+    print(f"retrain {total} from scratch: {scratch_s:6.2f} s | {total / scratch_s:7.1f} trees/s")
+    print(
+        f"grow by {args.grow}:{' ' * 13}{grow_s:6.2f} s | {args.grow / grow_s:7.1f} trees/s "
+        f"| x{scratch_s / grow_s:.1f}"
+    )
+    print(f"identical predictions: {same}")
+    print(
+        f"latency per extra tree (1 thread): {per_row * 1e6:.1f} µs for 1 row, "
+        f"{per_batch * 1e6:.1f} µs for {len(x_test)} rows"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Per-record scoring latency: DataFrame + predict_proba vs `score_records`.
+
+Each of the baseline, RF and HGB artifacts scores one record per call, as
+the serving path would. Reports p50 / p99 latency in microseconds for the
+DataFrame route (`prepare_features` + `predict_proba`) and for
+`score_records`, plus the max |proba difference| between the two.
+
+Usage:
+  PYTHONPATH=src python scripts/bench_score_records.py --input data/processed/test.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from mlproj.inference.predict_baseline import prepare_features
+from mlproj.inference.records import score_records
+from mlproj.inference.registry import load_models, parse_model_specs
+
+
+def _latencies_us(
+    fn: Callable[[dict[str, Any]], object], records: list[dict[str, Any]]
+) -> np.ndarray:
+    fn(records[0])
+    out = np.empty(len(records))
+    for i, rec in enumerate(records):
+        t0 = time.perf_counter()
+        fn(rec)
+        out[i] = time.perf_counter() - t0
+    return out * 1e6
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--input", default="data/processed/test.csv")
+    ap.add_argument("--model", action="append", metavar="NAME=PATH")
+    ap.add_argument("--calls", type=int, default=500)
+    args = ap.parse_args()
+
+    models = load_models(parse_model_specs(args.model))
+    df = pd.read_csv(Path(args.input))
+    sample = df.sample(n=args.calls, replace=True, random_state=0)
+    records: list[dict[str, Any]] = sample.to_dict(orient="records")  # pyright: ignore[reportAssignmentType]
+
+    rows = []
+    for name, model in models.items():
+
+        def via_frame(rec: dict[str, Any], model: Any = model) -> np.ndarray:
+            x = prepare_features(model, pd.DataFrame.from_records([rec]))
+            return np.asarray(model.predict_proba(x))[:, 1]
+
+        def via_records(rec: dict[str, Any], model: Any = model) -> np.ndarray:
+            return score_records(model, [rec])
+
+        frame_us = _latencies_us(via_frame, records)
+        records_us = _latencies_us(via_records, records)
+        diff = np.abs(
+            np.asarray(model.predict_proba(prepare_features(model, sample)))[:, 1]
+            - score_records(model, records)
+        ).max()
+        rows.append(
+            {
+                "model": name,
+                "frame_p50_us": np.percentile(frame_us, 50),
+                "frame_p99_us": np.percentile(frame_us, 99),
+                "records_p50_us": np.percentile(records_us, 50),
+                "records_p99_us": np.percentile(records_us, 99),
+                "speedup_p50": np.percentile(frame_us, 50) / np.percentile(records_us, 50),
+                "max_abs_diff": diff,
+            }
+        )
+
+    out = pd.DataFrame(rows)
+    print(
+        out.to_string(
+            index=False,
+            formatters={"max_abs_diff": lambda v: f"{v:.1e}"},
+            float_format=lambda v: f"{v:,.1f}",
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Time to the best config: full grid at the full resource vs successive halving.
+
+The full grid scores every candidate of the search space with 400 trees /
+iterations, through the same k-fold CV as the search. `mlproj.models.search`
+scores the whole grid with only a few trees and iterations, and promotes
+the best 1/eta per rung. Reports wall time of each, and where the halving
+winner ranks in the full-grid leaderboard.
+
+Run from the repo root after `make split`.
+
+Usage:
+  PYTHONPATH=src python scripts/bench_search.py --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from mlproj.models.cross_validate import load_state, score_candidate
+from mlproj.models.search import RESOURCES, load_candidates, successive_halving
+
+
+def _score(job: tuple[str, dict]) -> float:
+    return score_candidate(*job)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--space", default="configs/search_space.json")
+    ap.add_argument(
+        "--data", nargs="+", default=["data/processed/train.csv", "data/processed/val.csv"]
+    )
+    ap.add_argument("--splits", type=int, default=3)
+    ap.add_argument("--workers", type=int, default=1)
+    args = ap.parse_args()
+
+    candidates = load_candidates(Path(args.space), None, 42)
+    paths = [Path(p) for p in args.data]
+    init_args = (paths, {}, "roc_auc", args.splits, 1, 42, 1 if args.workers > 1 else None)
+    jobs = [
+        (m, {**p, RESOURCES[m][0]: RESOURCES[m][2]}) for m, grid in candidates.items() for p in grid
+    ]
+
+    t0 = time.perf_counter()
+    if args.workers > 1:
+        with ProcessPoolExecutor(args.workers, initializer=load_state, initargs=init_args) as ex:
+            scores = list(ex.map(_score, jobs))
+    else:
+        load_state(*init_args)
+        scores = [_score(job) for job in jobs]
+    grid_s = time.perf_counter() - t0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        _, winners = successive_halving(
+            candidates,
+            paths,
+            Path(tmp) / "checkpoint.jsonl",
+            n_splits=args.splits,
+            workers=args.workers,
+        )
+        halving_s = time.perf_counter() - t0
+
+    print(f"{len(jobs)} candidates | workers={args.workers}")
+    print(f"full grid (400 trees / iterations): {grid_s:7.2f} s")
+    print(f"successive halving:                 {halving_s:7.2f} s | x{grid_s / halving_s:.1f}")
+    for model, win in winners.items():
+        board = sorted(
+            ((s, p) for (m, p), s in zip(jobs, scores, strict=True) if m == model),
+            key=lambda sp: -sp[0],
+        )
+        rank = 1 + [p for _, p in board].index(win["params"])
+        print(
+            f"{model}: halving winner ranks {rank}/{len(board)} in the full grid "
+            f"(roc_auc {win['score']:.4f}; grid best {board[0][0]:.4f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
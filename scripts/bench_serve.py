@@ -0,0 +1,146 @@
+"""
+Load-test the scoring server and compare it with one-shot CLI inference.
+
+Starts `mlproj.inference.serve.ScoringServer` in-process on a free port, fires
+single-patient requests from concurrent client threads, then times the
+equivalent `python -m mlproj.inference.predict_*` invocation on a one-row CSV.
+
+Usage:
+  PYTHONPATH=src python scripts/bench_serve.py --requests 2000 --concurrency 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from mlproj.inference.registry import load_models, parse_model_specs
+from mlproj.inference.serve import ScoringServer
+
+CLI_MODULES = {
+    "baseline": "mlproj.inference.predict_baseline",
+    "rf": "mlproj.inference.predict_rf",
+    "hgb": "mlproj.inference.predict_hgb",
+}
+
+
+def _post(url: str, record: dict[str, Any]) -> float:
+    body = json.dumps({"record": record}).encode("utf-8")
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    t0 = time.perf_counter()
+    with urllib.request.urlopen(req) as resp:
+        resp.read()
+    return time.perf_counter() - t0
+
+
+def _load_generator(
+    url: str, records: list[dict[str, Any]], n_requests: int, concurrency: int
+) -> tuple[np.ndarray, float]:
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        lat = list(ex.map(lambda i: _post(url, records[i % len(records)]), range(n_requests)))
+    return np.asarray(lat), time.perf_counter() - t0
+
+
+def _time_cli(module: str, model_path: Path, one_row_csv: Path, runs: int) -> np.ndarray:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(Path(__file__).resolve().parents[1] / "src")
+    out: list[float] = []
+    with tempfile.TemporaryDirectory() as td:
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    module,
+                    "--model",
+                    str(model_path),
+                    "--input",
+                    str(one_row_csv),
+                    "--out",
+                    str(Path(td) / "out.csv"),
+                ],
+                check=True,
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            out.append(time.perf_counter() - t0)
+    return np.asarray(out)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", action="append", metavar="NAME=PATH")
+    ap.add_argument("--input", default="data/processed/test.csv")
+    ap.add_argument("--requests", type=int, default=2000)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--max-batch", type=int, default=64)
+    ap.add_argument("--max-wait-ms", type=float, default=2.0)
+    ap.add_argument("--cli-runs", type=int, default=5)
+    args = ap.parse_args()
+
+    paths = parse_model_specs(args.model)
+    models = load_models(paths)
+
+    df = pd.read_csv(args.input)
+    features = df.drop(columns=["target"]) if "target" in df.columns else df
+    records: list[dict[str, Any]] = features.to_dict(orient="records")  # pyright: ignore[reportAssignmentType]
+
+    server = ScoringServer(
+        ("127.0.0.1", 0), models, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms
+    )
+    port = server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    rows: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as td:
+        one_row = Path(td) / "one_row.csv"
+        df.head(1).to_csv(one_row, index=False)
+        try:
+            for name in paths:
+                url = f"http://127.0.0.1:{port}/predict/{name}"
+                _post(url, records[0])  # warm-up
+                lat, wall = _load_generator(url, records, args.requests, args.concurrency)
+                stats = server.batchers[name].stats.snapshot()
+                row: dict[str, Any] = {
+                    "model": name,
+                    "server_p50_ms": float(np.percentile(lat, 50) * 1e3),
+                    "server_p99_ms": float(np.percentile(lat, 99) * 1e3),
+                    "server_rps": args.requests / wall,
+                    "mean_batch": stats["mean_batch_size"],
+                }
+                module = CLI_MODULES.get(name)
+                if module is not None and args.cli_runs > 0:
+                    cli = _time_cli(module, paths[name], one_row, args.cli_runs)
+                    row["cli_p50_ms"] = float(np.percentile(cli, 50) * 1e3)
+                    row["speedup_p50"] = row["cli_p50_ms"] / row["server_p50_ms"]
+                rows.append(row)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    print(
+        f"requests={args.requests} concurrency={args.concurrency} "
+        f"max_batch={args.max_batch} max_wait_ms={args.max_wait_ms}"
+    )
+    print(pd.DataFrame(rows).to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+
+
+if __name__ == "__main__":
+    main()
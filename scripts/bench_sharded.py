@@ -0,0 +1,80 @@
+"""
+Measure `--workers` scaling of sharded RF/HGB batch inference.
+
+Writes a synthetic input with the model's feature columns, times the
+single-process CLI path, then `predict_sharded` for 1..N workers, and checks
+every sharded output is byte-identical to the single-process one.
+
+Usage:
+  PYTHONPATH=src python scripts/bench_sharded.py --model models/rf.joblib --rows 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from mlproj.inference import predict_hgb, predict_rf
+from mlproj.inference.sharded import predict_sharded
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", default="models/rf.joblib")
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = ap.parse_args()
+
+    model = joblib.load(args.model)
+    features = [str(c) for c in model.feature_names_in_]
+    cli = predict_hgb if "HistGradientBoosting" in type(model).__name__ else predict_rf
+
+    rows: list[dict[str, float | int]] = []
+    with tempfile.TemporaryDirectory() as td:
+        model_path = Path(td) / "model.joblib"
+        joblib.dump(model, model_path)
+        inp = Path(td) / "in.csv"
+        rng = np.random.default_rng(0)
+        pd.DataFrame(rng.normal(size=(args.rows, len(features))).round(3), columns=features).to_csv(
+            inp, index=False
+        )
+
+        single_out = Path(td) / "single.csv"
+        argv = sys.argv
+        sys.argv = ["predict", "--input", str(inp), "--out", str(single_out)]
+        sys.argv += ["--model", str(model_path)]
+        t0 = time.perf_counter()
+        cli.main()
+        single_s = time.perf_counter() - t0
+        sys.argv = argv
+        reference = single_out.read_bytes()
+
+        for workers in range(1, args.max_workers + 1):
+            out = Path(td) / f"sharded_{workers}.csv"
+            t0 = time.perf_counter()
+            predict_sharded(inp, out, model_path=model_path, threshold=0.5, workers=workers)
+            wall = time.perf_counter() - t0
+            rows.append(
+                {
+                    "workers": workers,
+                    "wall_s": wall,
+                    "speedup_vs_single": single_s / wall,
+                    "identical": int(out.read_bytes() == reference),
+                }
+            )
+            out.unlink()
+
+    print(f"model={args.model} rows={args.rows} single_process_s={single_s:.2f}")
+    print(pd.DataFrame(rows).to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Measure peak RSS of whole-file vs chunked (`--chunksize`) batch inference.
+
+Writes synthetic inputs with the model's feature columns at several sizes and
+runs the predictor CLI on each in a fresh subprocess that reports its own peak
+RSS (`VmHWM`, which unlike `ru_maxrss` is reset on exec and so does not inherit
+this process's high-water mark). In streaming mode peak RSS should stay flat
+as rows grow.
+
+Usage:
+  PYTHONPATH=src python scripts/bench_streaming.py --rows 100000 1000000 --chunksize 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+# Run a module as __main__, then report this process's peak RSS (KiB) on stderr.
+_WRAPPER = """
+import runpy, sys
+sys.argv = sys.argv[1:]
+runpy.run_module(sys.argv[0], run_name="__main__", alter_sys=True)
+hwm = next(line for line in open("/proc/self/status") if line.startswith("VmHWM:"))
+print("VmHWM_KB=" + hwm.split()[1], file=sys.stderr)
+"""
+
+MODULES = {
+    "baseline": "mlproj.inference.predict_baseline",
+    "rf": "mlproj.inference.predict_rf",
+    "hgb": "mlproj.inference.predict_hgb",
+}
+
+
+def _write_input(path: Path, features: list[str], n_rows: int, block: int = 200_000) -> None:
+    rng = np.random.default_rng(0)
+    with path.open("w", encoding="utf-8", newline="") as f:
+        for start in range(0, n_rows, block):
+            n = min(block, n_rows - start)
+            df = pd.DataFrame(rng.normal(size=(n, len(features))).round(3), columns=features)
+            df.to_csv(f, header=start == 0, index=False)
+
+
+def _peak_rss_mb(module: str, args: list[str]) -> tuple[float, float]:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(Path(__file__).resolve().parents[1] / "src")
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", _WRAPPER, module, *args],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise SystemExit(f"{module} failed:\n{proc.stderr}")
+    kb = next(ln for ln in proc.stderr.splitlines() if ln.startswith("VmHWM_KB="))
+    return int(kb.split("=")[1]) / 1024, wall
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--predictor", choices=sorted(MODULES), default="baseline")
+    ap.add_argument("--model", default="models/baseline_logreg.joblib")
+    ap.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    ap.add_argument("--chunksize", type=int, default=50_000)
+    args = ap.parse_args()
+
+    model = joblib.load(args.model)
+    features = [str(c) for c in model.feature_names_in_]
+
+    rows: list[dict[str, float | int | str]] = []
+    with tempfile.TemporaryDirectory() as td:
+        for n in args.rows:
+            inp = Path(td) / f"in_{n}.csv"
+            _write_input(inp, features, n)
+            for mode, extra in (("whole", []), ("chunked", ["--chunksize", str(args.chunksize)])):
+                cli_args = [
+                    "--model",
+                    args.model,
+                    "--input",
+                    str(inp),
+                    "--out",
+                    str(Path(td) / "out.csv"),
+                    *extra,
+                ]
+                rss, wall = _peak_rss_mb(MODULES[args.predictor], cli_args)
+                rows.append(
+                    {
+                        "rows": n,
+                        "input_mb": inp.stat().st_size / 2**20,
+                        "mode": mode,
+                        "peak_rss_mb": rss,
+                        "wall_s": wall,
+                    }
+                )
+            inp.unlink()
+
+    print(f"predictor={args.predictor} chunksize={args.chunksize}")
+    print(pd.DataFrame(rows).to_string(index=False, float_format=lambda v: f"{v:.1f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+eval_predictions on a large prediction file: whole-file merge vs `--chunksize` streaming.
+
+Writes a labeled input CSV (`--features` feature columns + target) and a
+predictions CSV (row_id, proba_disease, pred) with `--rows` rows, then runs
+`eval_predictions` in a subprocess for each mode (bootstrap off) and reports
+wall time, peak RSS of the process (VmHWM, so Linux only), and the metrics
+of both runs.
+
+Usage:
+  PYTHONPATH=src python scripts/bench_streaming_eval.py --rows 5000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ru_maxrss survives fork + exec (it would include this process's arrays), so
+# the child reports its own high-water mark instead.
+_CHILD = """
+import runpy, sys
+sys.argv = ["eval_predictions", *sys.argv[1:]]
+runpy.run_module("mlproj.evaluation.eval_predictions", run_name="__main__")
+hwm = next(line for line in open("/proc/self/status") if line.startswith("VmHWM"))
+print(int(hwm.split()[1]) / 1024)
+"""
+
+
+def _run(argv: list[str]) -> tuple[float, float]:
+    """Wall seconds and peak RSS (MiB) of one eval_predictions process."""
+    t0 = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, *argv], check=True, capture_output=True, text=True
+    )
+    return time.perf_counter() - t0, float(out.stdout.splitlines()[-1])
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=5_000_000)
+    ap.add_argument("--features", type=int, default=13)
+    ap.add_argument("--chunksize", type=int, default=200_000)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    y = (rng.random(args.rows) < 0.45).astype(int)
+    p = np.clip(0.35 * y + 0.65 * rng.random(args.rows), 0.0, 1.0)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        features = {f"f{i}": rng.normal(size=args.rows).round(3) for i in range(args.features)}
+        pd.DataFrame({**features, "target": y}).to_csv(root / "in.csv", index=False)
+        pd.DataFrame(
+            {"row_id": np.arange(args.rows), "proba_disease": p, "pred": (p >= 0.5).astype(int)}
+        ).to_csv(root / "preds.csv", index=False)
+        del features
+
+        common = ["--input", str(root / "in.csv"), "--preds", str(root / "preds.csv")]
+        full_s, full_mb = _run([*common, "--out", str(root / "full.json"), "--bootstrap", "0"])
+        stream_s, stream_mb = _run(
+            [
+                *common,
+                "--out",
+                str(root / "stream.json"),
+                "--bootstrap",
+                "0",
+                "--chunksize",
+                str(args.chunksize),
+            ]
+        )
+        full = json.loads((root / "full.json").read_text())
+        stream = json.loads((root / "stream.json").read_text())
+
+    print(f"rows={args.rows:,} features={args.features} chunksize={args.chunksize:,}")
+    print(f"whole-file merge: {full_s:6.1f} s | peak RSS {full_mb:8,.0f} MiB")
+    print(f"streaming:        {stream_s:6.1f} s | peak RSS {stream_mb:8,.0f} MiB")
+    for k, v in full["metrics"].items():
+        print(f"  {k:<17} whole={v:.10f} streaming={stream['metrics'][k]:.10f}")
+    print(f"  streaming bounds: {stream['streaming']['bounds']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Threshold sweep: per-threshold sklearn loop vs the sort-once `BinaryCurves` engine.
+
+Generates `--rows` synthetic (label, probability) pairs and sweeps
+`--thresholds` evenly spaced thresholds with `sweep_thresholds`. The legacy
+loop (confusion_matrix + accuracy/precision/recall/f1 per threshold) is
+linear in the threshold count, so it is timed on the first
+`--legacy-thresholds` thresholds and extrapolated; its rows are compared
+with the engine's for those thresholds.
+
+Usage:
+  PYTHONPATH=src python scripts/bench_sweep.py --rows 10000000 --thresholds 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, cast
+
+import numpy as np
+import pandas as pd
+
+from mlproj.evaluation.sweep_thresholds import sweep_thresholds
+
+
+def _legacy_rows(y_true: np.ndarray, proba: np.ndarray, thresholds: np.ndarray) -> pd.DataFrame:
+    from sklearn.metrics import (
+        accuracy_score,
+        confusion_matrix,
+        f1_score,
+        precision_score,
+        recall_score,
+    )
+
+    rows = []
+    for t in thresholds:
+        pred = (proba >= float(t)).astype(int)
+        tn, fp, fn, tp = confusion_matrix(y_true, pred, labels=[0, 1]).ravel()
+        rows.append(
+            {
+                "threshold": float(t),
+                "accuracy": float(accuracy_score(y_true, pred)),
+                "precision": float(precision_score(y_true, pred, zero_division=cast(Any, 0))),
+                "recall": float(recall_score(y_true, pred, zero_division=cast(Any, 0))),
+                "f1": float(f1_score(y_true, pred, zero_division=cast(Any, 0))),
+                "tp": int(tp),
+                "fp": int(fp),
+                "tn": int(tn),
+                "fn": int(fn),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=10_000_000)
+    ap.add_argument("--thresholds", type=int, default=1000)
+    ap.add_argument("--legacy-thresholds", type=int, default=3)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    y = (rng.random(args.rows) < 0.45).astype(int)
+    proba = np.clip(0.35 * y + 0.65 * rng.random(args.rows), 0.0, 1.0)
+    step = 1.0 / args.thresholds
+    t_max = step * (args.thresholds - 1)
+
+    t0 = time.perf_counter()
+    df = sweep_thresholds(pd.Series(y), pd.Series(proba), t_min=0.0, t_max=t_max, t_step=step)
+    engine_s = time.perf_counter() - t0
+
+    legacy_t = df["threshold"].to_numpy()[: args.legacy_thresholds]
+    t0 = time.perf_counter()
+    legacy = _legacy_rows(y, proba, legacy_t)
+    legacy_s = (time.perf_counter() - t0) / len(legacy_t) * len(df)
+
+    same = legacy.equals(df.loc[: len(legacy_t) - 1, list(legacy.columns)])
+    print(f"rows={args.rows:,} thresholds={len(df)}")
+    print(f"legacy loop (extrapolated from {len(legacy_t)} thresholds): {legacy_s:,.1f} s")
+    print(f"sort-once engine: {engine_s:,.3f} s | speedup x{legacy_s / engine_s:,.0f}")
+    print(f"rows identical on the legacy thresholds: {same}")
+
+
+if __name__ == "__main__":
+    main()
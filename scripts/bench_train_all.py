@@ -0,0 +1,82 @@
+"""
+End-to-end training wall time: the serial Make chain vs one `train_all` run.
+
+The chain is `train_baseline`, `train_rf` and `train_hgb` as three
+subprocesses, one after another. Each re-imports sklearn and re-reads the
+splits, and RF and HGB each take every core. `mlproj.models.train_all` loads
+the splits once and fits the three concurrently within a CPU budget. Both
+run in scratch copies of the working tree's data/processed, so models/ and
+reports/ are untouched. Reports wall time of both and whether the three
+artifacts predict identically on val and test.
+
+Run from the repo root after `make split`.
+
+Usage:
+  PYTHONPATH=src python scripts/bench_train_all.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from mlproj.data.columnar import read_table
+
+_ARTIFACTS = ("models/baseline_logreg.joblib", "models/rf.joblib", "models/hgb.joblib")
+_CHAIN = (
+    ["-m", "mlproj.models.train_baseline"],
+    ["-m", "mlproj.models.train_rf", "--model-out", "models/rf.joblib"],
+    ["-m", "mlproj.models.train_hgb"],
+)
+
+
+def _run(cwd: Path, *argvs: list[str]) -> float:
+    env = {**os.environ, "PYTHONPATH": str(Path(__file__).resolve().parents[1] / "src")}
+    t0 = time.perf_counter()
+    for argv in argvs:
+        subprocess.run([sys.executable, *argv], cwd=cwd, env=env, check=True, capture_output=True)
+    return time.perf_counter() - t0
+
+
+def _scratch(root: Path, data_dir: Path) -> Path:
+    shutil.copytree(data_dir, root / "data/processed", ignore=shutil.ignore_patterns(".cache"))
+    return root
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--data-dir", default="data/processed")
+    ap.add_argument("--cpus", type=int, default=os.cpu_count() or 1)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        chain = _scratch(Path(tmp) / "chain", Path(args.data_dir))
+        engine = _scratch(Path(tmp) / "train_all", Path(args.data_dir))
+
+        chain_s = _run(chain, *_CHAIN)
+        engine_s = _run(engine, ["-m", "mlproj.models.train_all", "--cpus", str(args.cpus)])
+
+        same = True
+        for split in ("val", "test"):
+            x = read_table(chain / f"data/processed/{split}.csv").drop(columns=["target"])
+            for artifact in _ARTIFACTS:
+                a = joblib.load(chain / artifact).predict_proba(x)
+                b = joblib.load(engine / artifact).predict_proba(x)
+                same &= bool(np.array_equal(a, b))
+
+    print(f"serial chain (3 processes): {chain_s:6.2f} s")
+    print(f"train_all (cpus={args.cpus}):      {engine_s:6.2f} s | x{chain_s / engine_s:.2f}")
+    print(f"artifacts predict identically: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Memory-mappable columnar cache for CSV tables (the processed splits and model inputs).
+
+`read_table(path)` returns what `pd.read_csv(path)` returns, but parses each
+CSV only once. The first read also writes the columns into one binary file,
+each column's raw values at a 64-byte aligned offset. Later reads map
+that file once and copy each requested column out of it, so no parse
+happens. With `readonly=True` the columns wrap the map (np.frombuffer)
+instead, so nothing is copied and pages are read on first touch. The frame
+is then read-only: in-place writes raise, whatever pandas' copy-on-write
+setting.
+
+Only the pipeline's own splits are cached by default: CSVs in a
+`data/processed` directory. `cache=True` caches any CSV; ad-hoc inputs
+(e.g. a `predict_* --input`) are otherwise read as plain CSVs, so no
+`.cache/` copy is written next to them.
+
+Layout, next to the CSV:
+
+    <csv_dir>/.cache/<stem>/current.json       source sha256, size, mtime; column dtypes, offsets
+    <csv_dir>/.cache/<stem>/<sha256[:16]>.cols  the column data
+
+The cache is keyed by the CSV's sha256. If the file's size and mtime still
+match current.json, the cache is used without hashing. If only the mtime
+changed, the file is re-hashed, and an unchanged hash keeps the cache. Any
+other change rebuilds it. A new version is written to a temporary file
+and renamed into place, so concurrent readers see either the old version or
+the new one.
+
+Tables with non-numeric columns are not cached, and neither are CSVs in
+read-only locations. Both are read from the CSV as before.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = ".cache"
+CACHED_DIR = ("data", "processed")  # cached unless cache=False; elsewhere only with cache=True
+FORMAT_VERSION = 1
+_POINTER = "current.json"
+_ALIGN = 64
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def cache_dir(path: Path) -> Path:
+    """Directory holding the cached versions of `path`."""
+    return path.parent / CACHE_DIR / path.stem
+
+
+def _read_pointer(directory: Path) -> dict[str, Any] | None:
+    try:
+        pointer = json.loads((directory / _POINTER).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return pointer if pointer.get("format_version") == FORMAT_VERSION else None
+
+
+def _write_pointer(directory: Path, pointer: dict[str, Any]) -> None:
+    tmp = directory / f".{_POINTER}.{os.getpid()}"
+    tmp.write_text(json.dumps(pointer, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, directory / _POINTER)
+
+
+def _current(path: Path, stat: os.stat_result) -> dict[str, Any] | None:
+    """The cache pointer if it still describes `path`'s contents, else None."""
+    directory = cache_dir(path)
+    pointer = _read_pointer(directory)
+    if pointer is None or pointer["size"] != stat.st_size:
+        return None
+    if pointer["mtime_ns"] == stat.st_mtime_ns:
+        return pointer
+    if file_sha256(path) != pointer["sha256"]:
+        return None
+    # Touched (or rewritten byte-identically): keep the cache, refresh the fast path.
+    pointer["mtime_ns"] = stat.st_mtime_ns
+    _write_pointer(directory, pointer)
+    return pointer
+
+
+def _build(path: Path, stat: os.stat_result, df: pd.DataFrame) -> None:
+    if df.empty or not all(dtype.kind in "biuf" for dtype in df.dtypes):
+        return
+    sha = file_sha256(path)
+    directory = cache_dir(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    version = directory / f"{sha[:16]}.cols"
+    tmp = directory / f".{version.name}.{os.getpid()}"
+    columns = []
+    with tmp.open("wb") as f:
+        for name in df.columns:
+            values = np.ascontiguousarray(df[name].to_numpy())
+            f.write(b"\0" * (-f.tell() % _ALIGN))
+            columns.append({"name": str(name), "dtype": values.dtype.str, "offset": f.tell()})
+            values.tofile(f)
+    os.replace(tmp, version)
+    _write_pointer(
+        directory,
+        {
+            "format_version": FORMAT_VERSION,
+            "source": path.name,
+            "sha256": sha,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "version": version.name,
+            "rows": len(df),
+            "columns": columns,
+        },
+    )
+    for old in directory.glob("*.cols"):
+        if old != version:
+            old.unlink(missing_ok=True)
+
+
+def _select(names: Sequence[str], columns: Sequence[str] | None) -> list[str]:
+    """`columns` in file order (like read_csv's usecols); all names if None."""
+    if columns is None:
+        return list(names)
+    missing = [c for c in columns if c not in names]
+    if missing:
+        raise ValueError(f"Usecols do not match columns, columns expected but not found: {missing}")
+    wanted = set(columns)
+    return [c for c in names if c in wanted]
+
+
+def read_table(
+    path: str | Path,
+    *,
+    columns: Sequence[str] | None = None,
+    cache: bool | None = None,
+    readonly: bool = False,
+) -> pd.DataFrame:
+    """
+    `pd.read_csv(path, usecols=columns)`, served from the columnar cache when possible.
+
+    `cache`: None caches CSVs in a data/processed directory, True any CSV, and
+    False always parses the CSV. `readonly=True` returns cached columns as
+    read-only memory maps instead of copies (a parsed CSV is still writable).
+    """
+    path = Path(path)
+    if cache is None:
+        cache = path.resolve().parent.parts[-2:] == CACHED_DIR
+    if not cache:
+        return pd.read_csv(path, usecols=None if columns is None else list(columns))
+    stat = path.stat()
+
+    pointer = _current(path, stat)
+    if pointer is not None:
+        specs = {c["name"]: c for c in pointer["columns"]}
+        selected = _select(list(specs), columns)
+        try:
+            with (cache_dir(path) / pointer["version"]).open("rb") as f:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            data = {
+                name: np.frombuffer(
+                    buf,
+                    dtype=specs[name]["dtype"],
+                    count=pointer["rows"],
+                    offset=specs[name]["offset"],
+                )
+                for name in selected
+            }
+        except (OSError, ValueError):
+            pass  # removed or truncated under us: fall back to the CSV
+        else:
+            return pd.DataFrame(data, columns=selected, copy=not readonly)
+
+    df = pd.read_csv(path)
+    try:
+        _build(path, stat, df)
+    except OSError:
+        pass  # e.g. a read-only data directory: serve from the CSV
+    if columns is None:
+        return df
+    return df.loc[:, _select([str(c) for c in df.columns], columns)]
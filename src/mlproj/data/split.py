@@ -4,7 +4,8 @@ from pathlib import Path
 from typing import cast
 
 import pandas as pd
-from sklearn.model_selection import train_test_split
+
+from mlproj.data.columnar import read_table
 
 
 def stratified_split(
@@ -19,6 +20,8 @@ def stratified_split(
 
     test_size and val_size are fractions of the FULL dataset.
     """
+    from sklearn.model_selection import train_test_split
+
     if "target" not in df.columns:
         raise ValueError("Expected column 'target' in dataframe.")
 
@@ -62,7 +65,7 @@ def main() -> None:
     val_path = Path("data/processed/val.csv")
     test_path = Path("data/processed/test.csv")
 
-    df = pd.read_csv(in_path)
+    df = read_table(in_path)
 
     train, val, test = stratified_split(df, test_size=0.15, val_size=0.15, random_state=42)
 
@@ -0,0 +1,313 @@
+"""
+Bootstrap confidence intervals for classification metrics.
+
+Resampling n rows with replacement only decides how many times each row is
+used: a Multinomial(n, 1/n) count vector. Rows that every metric treats
+alike (same label, and the same prediction and score for every model) are
+collapsed into one *cell*, so one resample is a Multinomial(n, cell sizes / n)
+draw over cells and B resamples are a (B, cells) count matrix -- the same
+distribution as a (B, n) index matrix, at a fraction of the size. Metrics
+are vectorized over the B resamples: confusion counts are matrix products
+with per-cell indicator vectors, ROC AUC / AP come from cumulative counts
+over the cells in score order (np.add.reduceat over tied scores).
+
+Scores with more than `max_bins` distinct values are coarsened to quantile
+bins for the resamples (values within a bin count as tied). Point estimates
+are never binned.
+
+Models evaluated on the same rows are resampled jointly (paired): each
+resample reweights the same rows for every model, so per-resample
+differences give intervals for the gap between two models. The joint cells
+key on every model's score bin, so with many models on many rows they can
+outnumber `max_cells`. In that case only the threshold metrics are resampled
+over the joint (label, predictions) cells. ROC AUC / AP are resampled over
+each model's own (label, score bin) cells, independently per model
+(`paired_scores` is False). Each model's intervals are unaffected. Gaps in
+ROC AUC / AP then ignore the correlation between models and are conservative
+(too wide).
+
+Resamples are drawn in fixed-size chunks seeded by SeedSequence(seed).spawn,
+so results depend only on the seed, not on how chunks are spread over the
+process pool.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from mlproj.evaluation.metrics import THRESHOLD_METRICS, metrics_from_counts
+
+METRICS = (*THRESHOLD_METRICS, "roc_auc", "average_precision")
+DEFAULT_RESAMPLES = 10_000
+_CHUNK = 500
+
+
+@dataclass(frozen=True)
+class _Cells:
+    n: int
+    sizes: np.ndarray  # (K,) rows per cell
+    label: np.ndarray  # (K,) float 0/1
+    # Model index -> (K,) float 0/1 prediction, for the models whose threshold metrics use these.
+    pred: dict[int, np.ndarray]
+    # Model index -> cells in decreasing score order and the start of each tie group, for the
+    # models whose ROC AUC / AP use these cells.
+    order: dict[int, np.ndarray]
+    starts: dict[int, np.ndarray]
+
+
+@dataclass(frozen=True)
+class Bootstrap:
+    """Per-resample metric values for each model (paired: resample b is shared)."""
+
+    samples: dict[str, dict[str, np.ndarray]]
+    n_resamples: int
+    seed: int
+    cells: int
+    score_bins: int | None  # bins per model if scores were coarsened, else None
+    paired_scores: bool = True  # False: ROC AUC / AP resampled independently per model
+
+    def interval(self, model: str, metric: str, level: float = 0.95) -> tuple[float, float]:
+        return percentile_interval(self.samples[model][metric], level)
+
+    def diff_interval(
+        self, model: str, other: str, metric: str, level: float = 0.95
+    ) -> tuple[float, float]:
+        """Interval for metric(model) - metric(other) over the shared resamples."""
+        return percentile_interval(self.samples[model][metric] - self.samples[other][metric], level)
+
+    def intervals(self, model: str, level: float = 0.95) -> dict[str, tuple[float, float]]:
+        return {m: self.interval(model, m, level) for m in self.samples[model]}
+
+
+def percentile_interval(samples: np.ndarray, level: float = 0.95) -> tuple[float, float]:
+    """Central `level` percentile interval, ignoring resamples where the metric is undefined."""
+    if not 0.0 < level < 1.0:
+        raise ValueError("level must be in (0, 1)")
+    finite = samples[~np.isnan(samples)]
+    if finite.size == 0:
+        return (float("nan"), float("nan"))
+    tail = (1.0 - level) / 2.0 * 100.0
+    lo, hi = np.percentile(finite, [tail, 100.0 - tail])
+    return (float(lo), float(hi))
+
+
+def _group_sizes(inverse: np.ndarray, weights: np.ndarray | None) -> np.ndarray:
+    """Rows per group (each row counted `weights` times, if given)."""
+    if weights is None:
+        return np.bincount(inverse)
+    return np.bincount(inverse, weights=weights).astype(np.int64)
+
+
+def _score_ranks(proba: np.ndarray, weights: np.ndarray | None) -> tuple[np.ndarray, np.ndarray]:
+    """Dense rank of every score, and the number of rows below each distinct score."""
+    _, inverse = np.unique(proba, return_inverse=True)
+    counts = _group_sizes(inverse, weights)
+    return inverse, np.cumsum(counts) - counts
+
+
+def _unique_rows(
+    columns: list[np.ndarray], weights: np.ndarray | None
+) -> tuple[np.ndarray, np.ndarray]:
+    """(cell sizes, one representative row per cell) of the rows' distinct column tuples."""
+    radices = [int(c.max()) + 1 for c in columns]
+    if math.prod(radices) < 2**63:
+        # One mixed-radix int64 key per row: a 1-D unique is much cheaper than axis=0.
+        key = np.zeros(len(columns[0]), dtype=np.int64)
+        for c, radix in zip(columns, radices, strict=True):
+            key = key * radix + c
+        _, first, inverse = np.unique(key, return_index=True, return_inverse=True)
+        return _group_sizes(inverse, weights), np.stack(columns, axis=1)[first]
+    uniq, inverse = np.unique(np.stack(columns, axis=1), axis=0, return_inverse=True)
+    return _group_sizes(inverse.ravel(), weights), uniq
+
+
+def _score_order(codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    o = np.argsort(-codes, kind="stable")
+    return o, np.flatnonzero(np.r_[True, np.diff(codes[o]) != 0])
+
+
+def _build_cells(
+    y: np.ndarray,
+    preds: list[np.ndarray],
+    probas: list[np.ndarray | None],
+    weights: np.ndarray | None,
+    *,
+    max_bins: int,
+    max_cells: int,
+) -> tuple[list[_Cells], int | None, bool]:
+    """(cell tables, score bins or None if exact, whether scores are resampled jointly)."""
+    n = len(y) if weights is None else int(weights.sum())
+    ranks = [None if p is None else _score_ranks(p, weights) for p in probas]
+    exact = all(r is None or len(r[1]) <= max_bins for r in ranks)
+    bins: int | None = None if exact else max_bins
+    label = y.astype(np.int64)
+    codes: dict[int, np.ndarray] = {}
+    for m, rank in enumerate(ranks):
+        if rank is not None:
+            inverse, below = rank
+            # Quantile bins of the rows; tied scores always share a bin.
+            codes[m] = inverse if bins is None else (below * bins // n)[inverse]
+    pred_cols = [p.astype(np.int64) for p in preds]
+
+    def table(pred_models: list[int], score_models: list[int]) -> _Cells:
+        columns = [label, *(pred_cols[m] for m in pred_models), *(codes[m] for m in score_models)]
+        sizes, uniq = _unique_rows(columns, weights)
+        pred = {m: uniq[:, 1 + i].astype(np.float64) for i, m in enumerate(pred_models)}
+        order, starts = {}, {}
+        for i, m in enumerate(score_models):
+            order[m], starts[m] = _score_order(uniq[:, 1 + len(pred_models) + i])
+        return _Cells(
+            n=n,
+            sizes=sizes,
+            label=uniq[:, 0].astype(np.float64),
+            pred=pred,
+            order=order,
+            starts=starts,
+        )
+
+    models = list(range(len(preds)))
+    joint = table(models, list(codes))
+    if len(joint.sizes) <= max_cells or len(codes) <= 1:
+        return [joint], bins, True
+    tables = [table(models, [])] + [table([], [m]) for m in codes]
+    return tables, bins, False
+
+
+def _divide(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    out = np.zeros_like(num, dtype=np.float64)
+    np.divide(num, den, out=out, where=den != 0)
+    return out
+
+
+def _chunk_metrics(
+    tables: list[_Cells], seed: np.random.SeedSequence, size: int, n_models: int
+) -> list[np.ndarray]:
+    """(size, len(METRICS)) metric values per model for one chunk of resamples."""
+    rng = np.random.default_rng(seed)
+    out = [np.full((size, len(METRICS)), np.nan) for _ in range(n_models)]
+    for cells in tables:
+        w = rng.multinomial(cells.n, cells.sizes / cells.n, size=size).astype(np.float64)
+        pos_w = w * cells.label
+        neg_w = w - pos_w
+        n_pos = pos_w.sum(axis=1)
+        n_neg = cells.n - n_pos
+
+        for m, pred in cells.pred.items():
+            tp = pos_w @ pred
+            fp = neg_w @ pred
+            counts = metrics_from_counts(tp, fp, n_neg - fp, n_pos - tp)
+            for i, metric in enumerate(THRESHOLD_METRICS):
+                out[m][:, i] = counts[metric]
+
+        for m, order in cells.order.items():
+            starts = cells.starts[m]
+            pos = np.add.reduceat(pos_w[:, order], starts, axis=1)
+            neg = np.add.reduceat(neg_w[:, order], starts, axis=1)
+            tps = np.cumsum(pos, axis=1)
+            fps = np.cumsum(neg, axis=1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                # Trapezoid ROC area: each tie group adds neg * (TP above + half its own TP).
+                auc = (neg * (tps - 0.5 * pos)).sum(axis=1) / (n_pos * n_neg)
+                ap = (pos * _divide(tps, tps + fps)).sum(axis=1) / n_pos
+            out[m][:, 4] = np.where((n_pos > 0) & (n_neg > 0), auc, np.nan)
+            out[m][:, 5] = np.where(n_pos > 0, ap, np.nan)
+    return out
+
+
+def bootstrap_metrics(
+    y_true: Any,
+    models: Mapping[str, tuple[Any, Any]],
+    *,
+    n_resamples: int = DEFAULT_RESAMPLES,
+    seed: int = 0,
+    workers: int = 1,
+    weights: Any = None,
+    max_bins: int = 1024,
+    max_cells: int = 4096,
+) -> Bootstrap:
+    """
+    Paired bootstrap of METRICS for `models` = {name: (pred, proba or None)}.
+
+    All models must be aligned with `y_true` (0/1). ROC AUC and AP are only
+    resampled for models with probabilities. `weights` (non-negative ints)
+    gives the number of rows each entry stands for, e.g. the cells of a
+    `MetricAccumulator` histogram; resamples then draw sum(weights) rows.
+    """
+    if n_resamples < 1:
+        raise ValueError("n_resamples must be >= 1")
+    y = np.asarray(y_true)
+    if not np.all((y == 0) | (y == 1)):
+        raise ValueError("y_true must contain only 0/1 labels")
+    preds = [np.asarray(pred) for pred, _ in models.values()]
+    probas = [None if p is None else np.asarray(p, dtype=np.float64) for _, p in models.values()]
+    for pred in preds:
+        if pred.shape != y.shape:
+            raise ValueError(f"Predictions must align with y_true: {pred.shape} vs {y.shape}")
+    w = None if weights is None else np.asarray(weights, dtype=np.int64)
+    if w is not None and (w.shape != y.shape or (w < 0).any()):
+        raise ValueError("weights must be non-negative and align with y_true")
+
+    tables, bins, paired_scores = _build_cells(
+        y, preds, probas, w, max_bins=max_bins, max_cells=max_cells
+    )
+    sizes = [_CHUNK] * (n_resamples // _CHUNK)
+    if n_resamples % _CHUNK:
+        sizes.append(n_resamples % _CHUNK)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if workers > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(sizes))) as ex:
+            chunks = list(
+                ex.map(
+                    _chunk_metrics,
+                    [tables] * len(sizes),
+                    seeds,
+                    sizes,
+                    [len(preds)] * len(sizes),
+                )
+            )
+    else:
+        chunks = [
+            _chunk_metrics(tables, s, k, len(preds)) for s, k in zip(seeds, sizes, strict=True)
+        ]
+
+    samples: dict[str, dict[str, np.ndarray]] = {}
+    for m, name in enumerate(models):
+        values = np.concatenate([c[m] for c in chunks])
+        metrics = METRICS if probas[m] is not None else THRESHOLD_METRICS
+        samples[name] = {metric: values[:, METRICS.index(metric)] for metric in metrics}
+    return Bootstrap(
+        samples=samples,
+        n_resamples=n_resamples,
+        seed=seed,
+        cells=sum(len(t.sizes) for t in tables),
+        score_bins=bins,
+        paired_scores=paired_scores,
+    )
+
+
+def ci_payload(boot: Bootstrap, model: str, level: float = 0.95) -> dict[str, Any]:
+    """JSON-ready summary of one model's intervals (undefined bounds -> null)."""
+
+    def bound(v: float) -> float | None:
+        return None if np.isnan(v) else v
+
+    return {
+        "level": level,
+        "method": "percentile bootstrap",
+        "n_resamples": boot.n_resamples,
+        "seed": boot.seed,
+        "cells": boot.cells,
+        "score_bins": boot.score_bins,
+        "paired_scores": boot.paired_scores,
+        "metrics": {
+            metric: [bound(lo), bound(hi)]
+            for metric, (lo, hi) in boot.intervals(model, level).items()
+        },
+    }
@@ -0,0 +1,225 @@
+"""
+Calibration diagnostics for predicted P(class 1): Brier score, ECE / MCE and the
+reliability curve.
+
+Scores are split into `bins` equal-width bins over [0, 1] (edges as in
+sklearn's `calibration_curve`, so a score on an edge falls in the lower bin).
+`CalibrationAccumulator` keeps, per bin, the row count, the sum of scores and
+the number of positives, plus the summed squared error; a chunk is added with
+one bin assignment and two np.bincount calls. Everything below follows from
+those sums, so a prediction file can be read in chunks (`--chunksize`) and
+accumulators over disjoint rows merge by adding.
+
+- Reliability curve: per non-empty bin, mean predicted score vs observed
+  positive rate (sklearn's `calibration_curve`).
+- ECE: row-weighted mean of |mean score - positive rate| over bins; MCE: the
+  largest such gap.
+- Brier score: mean (proba - y)^2 (sklearn's `brier_score_loss`).
+
+Usage:
+  python -m mlproj.evaluation.calibration --input data/processed/test.csv \\
+      --preds reports/predictions_rf_valtuned_auto.csv \\
+      --out-csv reports/calibration_rf.csv --out-md reports/calibration_rf.md
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from mlproj.evaluation.eval_predictions import aligned_chunks, load_and_align
+
+DEFAULT_BINS = 10
+CSV_COLUMNS = ["bin", "lower", "upper", "count", "mean_proba", "frac_positive", "gap"]
+
+
+@dataclass
+class CalibrationAccumulator:
+    """Per-bin sums of rows, scores and positives; see the module docstring."""
+
+    count: np.ndarray  # (bins,) int64
+    proba_sum: np.ndarray  # (bins,) float64
+    positives: np.ndarray  # (bins,) int64
+    sq_error: float  # sum of (proba - y)^2
+
+    @classmethod
+    def empty(cls, bins: int = DEFAULT_BINS) -> CalibrationAccumulator:
+        if bins < 1:
+            raise ValueError("bins must be >= 1")
+        return cls(
+            count=np.zeros(bins, dtype=np.int64),
+            proba_sum=np.zeros(bins, dtype=np.float64),
+            positives=np.zeros(bins, dtype=np.int64),
+            sq_error=0.0,
+        )
+
+    @property
+    def bins(self) -> int:
+        return len(self.count)
+
+    @property
+    def n(self) -> int:
+        return int(self.count.sum())
+
+    @property
+    def edges(self) -> np.ndarray:
+        return np.linspace(0.0, 1.0, self.bins + 1)
+
+    def update(self, y_true: Any, proba: Any) -> None:
+        """Add one chunk of aligned 0/1 labels and P(class 1) scores."""
+        y = np.asarray(y_true)
+        p = np.asarray(proba, dtype=np.float64)
+        if y.ndim != 1 or p.shape != y.shape:
+            raise ValueError(
+                f"y_true and proba must be 1-D of equal length: {y.shape} vs {p.shape}"
+            )
+        if not np.all((y == 0) | (y == 1)):
+            raise ValueError("y_true must contain only 0/1 values")
+        if not np.all((p >= 0.0) & (p <= 1.0)):
+            raise ValueError("proba must lie in [0, 1] (and not be NaN)")
+        idx = np.searchsorted(self.edges[1:-1], p)
+        by_label = np.bincount(idx + self.bins * y.astype(np.int64), minlength=2 * self.bins)
+        self.count += by_label[: self.bins] + by_label[self.bins :]
+        self.positives += by_label[self.bins :]
+        self.proba_sum += np.bincount(idx, weights=p, minlength=self.bins)
+        self.sq_error += float(np.square(p - y).sum())
+
+    def merge(self, other: CalibrationAccumulator) -> CalibrationAccumulator:
+        """Add `other` (disjoint rows, same bins) into this accumulator; returns self."""
+        if other.bins != self.bins:
+            raise ValueError("Can only merge accumulators with the same bins")
+        self.count += other.count
+        self.proba_sum += other.proba_sum
+        self.positives += other.positives
+        self.sq_error += other.sq_error
+        return self
+
+    def curve(self) -> pd.DataFrame:
+        """CSV_COLUMNS per non-empty bin: the reliability curve and each bin's |gap|."""
+        keep = self.count > 0
+        count = self.count[keep]
+        mean_proba = self.proba_sum[keep] / count
+        frac_positive = self.positives[keep] / count
+        edges = self.edges
+        return pd.DataFrame(
+            {
+                "bin": np.flatnonzero(keep),
+                "lower": edges[:-1][keep],
+                "upper": edges[1:][keep],
+                "count": count,
+                "mean_proba": mean_proba,
+                "frac_positive": frac_positive,
+                "gap": np.abs(mean_proba - frac_positive),
+            },
+            columns=CSV_COLUMNS,
+        )
+
+    def summary(self) -> dict[str, float]:
+        """Brier score, ECE and MCE (NaN without rows)."""
+        n = self.n
+        if n == 0:
+            return {"brier": float("nan"), "ece": float("nan"), "mce": float("nan")}
+        curve = self.curve()
+        gap = curve["gap"].to_numpy()
+        return {
+            "brier": self.sq_error / n,
+            "ece": float((curve["count"].to_numpy() * gap).sum() / n),
+            "mce": float(gap.max()),
+        }
+
+
+def calibration_from_arrays(
+    y_true: Any, proba: Any, *, bins: int = DEFAULT_BINS
+) -> CalibrationAccumulator:
+    acc = CalibrationAccumulator.empty(bins)
+    acc.update(y_true, proba)
+    return acc
+
+
+def stream_calibration(
+    input_path: Path,
+    preds_path: Path,
+    *,
+    chunksize: int,
+    model: str | None = None,
+    bins: int = DEFAULT_BINS,
+) -> CalibrationAccumulator:
+    """Accumulate calibration over input and predictions read in lockstep chunks."""
+    scored, chunks = aligned_chunks(input_path, preds_path, chunksize=chunksize, model=model)
+    if not scored:
+        raise ValueError(f"Predictions must contain probabilities: {preds_path}")
+    acc = CalibrationAccumulator.empty(bins)
+    for y, _, proba in chunks:
+        acc.update(y, proba)
+    return acc
+
+
+def render_calibration_summary(acc: CalibrationAccumulator) -> str:
+    s = acc.summary()
+    parts = [
+        "# Calibration summary\n\n",
+        f"- **Brier score:** `{s['brier']:.4f}`\n",
+        f"- **ECE ({acc.bins} equal-width bins):** `{s['ece']:.4f}`\n",
+        f"- **MCE:** `{s['mce']:.4f}`\n",
+        "\n| Bin | Rows | Mean predicted | Observed positive rate | Gap |\n",
+        "|---|---:|---:|---:|---:|\n",
+    ]
+    for row in acc.curve().itertuples(index=False):
+        parts.append(
+            f"| [{row.lower:.2f}, {row.upper:.2f}] | {row.count} | {row.mean_proba:.3f} "
+            f"| {row.frac_positive:.3f} | {row.gap:.3f} |\n"
+        )
+    return "".join(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Calibration diagnostics of predicted probabilities."
+    )
+    parser.add_argument("--input", required=True)
+    parser.add_argument("--preds", required=True)
+    parser.add_argument("--out-csv", required=True)
+    parser.add_argument("--out-md", required=True)
+    parser.add_argument("--model", default=None, help="Model column set in a wide predict_all CSV")
+    parser.add_argument("--bins", type=int, default=DEFAULT_BINS, help="Equal-width score bins")
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Read input and preds in lockstep chunks of this many rows (constant memory)",
+    )
+    args = parser.parse_args()
+
+    if args.chunksize is not None:
+        acc = stream_calibration(
+            Path(args.input),
+            Path(args.preds),
+            chunksize=args.chunksize,
+            model=args.model,
+            bins=args.bins,
+        )
+    else:
+        y_true, _, proba, _ = load_and_align(Path(args.input), Path(args.preds), model=args.model)
+        if proba is None:
+            raise ValueError(f"Predictions must contain probabilities: {args.preds}")
+        acc = calibration_from_arrays(y_true, proba, bins=args.bins)
+
+    out_csv = Path(args.out_csv)
+    out_md = Path(args.out_md)
+    out_csv.parent.mkdir(parents=True, exist_ok=True)
+    out_md.parent.mkdir(parents=True, exist_ok=True)
+
+    acc.curve().to_csv(out_csv, index=False)
+    out_md.write_text(render_calibration_summary(acc), encoding="utf-8")
+
+    print(f"Wrote: {out_csv}")
+    print(f"Wrote: {out_md}")
+
+
+if __name__ == "__main__":
+    main()
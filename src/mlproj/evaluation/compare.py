@@ -0,0 +1,268 @@
+"""
+Compare N models in one process, from a manifest.
+
+The manifest is a JSON file:
+
+    {
+      "metric": "f1",
+      "val": "data/processed/val.csv",
+      "test": "data/processed/test.csv",
+      "models": [
+        {"name": "baseline_logreg", "artifact": "models/baseline_logreg.joblib"},
+        {"name": "random_forest", "artifact": "models/rf.joblib", "threshold": "tune"},
+        {"name": "fixed_rf", "artifact": "models/rf.trees", "threshold": 0.5},
+        {"name": "rf_isotonic", "artifact": "models/rf.joblib", "calibration": "isotonic"}
+      ]
+    }
+
+Paths are relative to the working directory, like the Make targets.
+`threshold` is "tune" (the default) or a number. "tune" sweeps every distinct
+val probability (sweep_thresholds --exact) and picks the best by `metric`
+(pick_best_threshold). `calibration` ("isotonic" or "platt", default none)
+fits a post-hoc calibrator on the val probabilities (mlproj.inference.
+calibrator); val and test probabilities are calibrated before the threshold
+is tuned and the metrics are computed.
+
+For each model, a worker loads the artifact, scores val and test, sets the
+threshold, and computes the test metrics at it (eval_predictions). This
+replaces the per-model predict / sweep / pick / predict / eval chain of
+subprocesses. Models are evaluated concurrently in a process pool. One joint
+bootstrap of all models over the shared test rows then gives each model's
+intervals and the paired gaps between them. The report is
+render_compare_models_3's table.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from mlproj.data.columnar import read_table
+from mlproj.evaluation.bootstrap import DEFAULT_RESAMPLES, bootstrap_metrics, ci_payload
+from mlproj.evaluation.compare_models_3 import ModelRow, render_compare_models_3
+from mlproj.evaluation.eval_predictions import compute_metrics
+from mlproj.evaluation.pick_best_threshold import pick_best_threshold
+from mlproj.evaluation.sweep_thresholds import sweep_exact
+from mlproj.inference.calibrator import METHODS as CALIBRATION_METHODS
+from mlproj.inference.calibrator import fit_calibrator
+from mlproj.inference.predict_all import score_all
+from mlproj.inference.registry import load_model
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    name: str
+    artifact: Path
+    threshold: float | None  # None: tune on val
+    calibration: str | None = None  # post-hoc calibrator fitted on val
+
+
+@dataclass(frozen=True)
+class Manifest:
+    metric: str
+    val: Path
+    test: Path
+    models: tuple[ModelSpec, ...]
+
+
+@dataclass(frozen=True)
+class ModelResult:
+    name: str
+    threshold: float
+    tuned: bool
+    calibration: str | None
+    metrics: dict[str, float]  # test metrics at `threshold`
+    test_pred: np.ndarray
+    test_proba: np.ndarray
+
+
+def _parse_threshold(name: str, value: Any) -> float | None:
+    if value is None or value == "tune":
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f'Model {name!r}: threshold must be "tune" or a number, got {value!r}')
+    return float(value)
+
+
+def _parse_calibration(name: str, value: Any) -> str | None:
+    if value is None or value == "none":
+        return None
+    if value not in CALIBRATION_METHODS:
+        raise ValueError(
+            f"Model {name!r}: calibration must be one of {CALIBRATION_METHODS}, got {value!r}"
+        )
+    return str(value)
+
+
+def load_manifest(path: Path) -> Manifest:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    for key in ("val", "test", "models"):
+        if key not in data:
+            raise ValueError(f"Manifest {path} is missing {key!r}")
+    specs: list[ModelSpec] = []
+    for entry in data["models"]:
+        if "name" not in entry or "artifact" not in entry:
+            raise ValueError(f"Manifest models need 'name' and 'artifact': {entry}")
+        specs.append(
+            ModelSpec(
+                name=str(entry["name"]),
+                artifact=Path(entry["artifact"]),
+                threshold=_parse_threshold(entry["name"], entry.get("threshold")),
+                calibration=_parse_calibration(entry["name"], entry.get("calibration")),
+            )
+        )
+    names = [s.name for s in specs]
+    if not specs or len(set(names)) != len(names):
+        raise ValueError(f"Manifest needs at least one model and unique names: {names}")
+    return Manifest(
+        metric=str(data.get("metric", "f1")),
+        val=Path(data["val"]),
+        test=Path(data["test"]),
+        models=tuple(specs),
+    )
+
+
+@lru_cache(maxsize=4)
+def _read_split(path: Path) -> pd.DataFrame:
+    """Labeled split, parsed once per process (and shared by its models)."""
+    df = read_table(path)
+    if "target" not in df.columns:
+        raise ValueError(f"Input must contain a 'target' column: {path}")
+    return df
+
+
+def evaluate_model(spec: ModelSpec, *, metric: str, val: Path, test: Path) -> ModelResult:
+    """Score val and test with one model, set its threshold, evaluate test at it."""
+    model = load_model(spec.artifact)
+    test_df = _read_split(test)
+    test_proba = score_all({spec.name: model}, test_df)[spec.name]
+
+    threshold = spec.threshold
+    if threshold is None or spec.calibration is not None:
+        val_df = _read_split(val)
+        val_y = val_df["target"].astype(int)
+        val_proba = score_all({spec.name: model}, val_df)[spec.name]
+        if spec.calibration is not None:
+            calibrator = fit_calibrator(val_y.to_numpy(), val_proba, spec.calibration)
+            val_proba = calibrator.apply(val_proba)
+            test_proba = calibrator.apply(test_proba)
+        if threshold is None:
+            threshold = pick_best_threshold(sweep_exact(val_y, pd.Series(val_proba)), metric=metric)
+
+    y_test = test_df["target"].astype(int).to_numpy()
+    test_pred = (test_proba >= threshold).astype(int)
+    return ModelResult(
+        name=spec.name,
+        threshold=threshold,
+        tuned=spec.threshold is None,
+        calibration=spec.calibration,
+        metrics=compute_metrics(y_test, test_pred, test_proba),
+        test_pred=test_pred,
+        test_proba=test_proba,
+    )
+
+
+def _policy(result: ModelResult) -> str:
+    policy = "val-tuned" if result.tuned else "fixed"
+    if result.calibration is not None:
+        policy += f", {result.calibration}-calibrated"
+    return policy
+
+
+def evaluate_all(manifest: Manifest, *, metric: str, workers: int = 1) -> list[ModelResult]:
+    """evaluate_model for every manifest model (in manifest order), `workers` at a time."""
+    missing = [str(s.artifact) for s in manifest.models if not s.artifact.exists()]
+    if missing:
+        raise SystemExit(f"Missing model artifact(s): {missing}. Train the models first.")
+    kwargs: dict[str, Any] = {"metric": metric, "val": manifest.val, "test": manifest.test}
+    if workers <= 1 or len(manifest.models) == 1:
+        return [evaluate_model(s, **kwargs) for s in manifest.models]
+    with ProcessPoolExecutor(max_workers=min(workers, len(manifest.models))) as ex:
+        futures = [ex.submit(evaluate_model, s, **kwargs) for s in manifest.models]
+        return [f.result() for f in futures]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Tune, evaluate and compare the models of a manifest.")
+    ap.add_argument("--manifest", required=True, help="Comparison manifest JSON")
+    ap.add_argument("--out", required=True, help="Output markdown report")
+    ap.add_argument("--json-out", default=None, help="Optional JSON with thresholds/metrics/CIs")
+    ap.add_argument("--metric", default=None, help="Metric to tune and rank by (default: manifest)")
+    ap.add_argument("--workers", type=int, default=1, help="Models evaluated in parallel")
+    ap.add_argument(
+        "--bootstrap",
+        type=int,
+        default=DEFAULT_RESAMPLES,
+        help=f"Paired bootstrap resamples of the test rows (default: {DEFAULT_RESAMPLES}; 0 disables)",
+    )
+    ap.add_argument("--ci", type=float, default=0.95, help="CI level (default: 0.95)")
+    ap.add_argument("--seed", type=int, default=0, help="Bootstrap seed (default: 0)")
+    args = ap.parse_args()
+
+    manifest = load_manifest(Path(args.manifest))
+    metric = args.metric or manifest.metric
+    results = evaluate_all(manifest, metric=metric, workers=args.workers)
+
+    # One joint resample gives both the per-model intervals and the paired gaps.
+    boot = None
+    if args.bootstrap > 0:
+        boot = bootstrap_metrics(
+            _read_split(manifest.test)["target"].astype(int).to_numpy(),
+            {r.name: (r.test_pred, r.test_proba) for r in results},
+            n_resamples=args.bootstrap,
+            seed=args.seed,
+            workers=args.workers,
+        )
+    rows = [
+        ModelRow(
+            name=r.name,
+            threshold=r.threshold,
+            metrics=r.metrics,
+            ci={} if boot is None else boot.intervals(r.name, args.ci),
+            policy=_policy(r),
+        )
+        for r in results
+    ]
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    paired = boot if len(results) > 1 else None
+    out.write_text(
+        render_compare_models_3(metric, rows, boot=paired, level=args.ci), encoding="utf-8"
+    )
+    print(f"Wrote: {out}")
+
+    if args.json_out is not None:
+        payload = {
+            "manifest": args.manifest,
+            "metric": metric,
+            "models": {
+                r.name: {
+                    "threshold": r.threshold,
+                    "threshold_policy": "tune" if r.tuned else "fixed",
+                    "calibration": r.calibration,
+                    "metrics": r.metrics,
+                    **({} if boot is None else {"ci": ci_payload(boot, r.name, args.ci)}),
+                }
+                for r in results
+            },
+        }
+        json_out = Path(args.json_out)
+        json_out.parent.mkdir(parents=True, exist_ok=True)
+        json_out.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote: {json_out}")
+    for r in results:
+        value = r.metrics.get(metric, float("nan"))
+        print(f"{r.name}: threshold={r.threshold!r} ({_policy(r)}) | test {metric}={value:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,13 @@ from __future__ import annotations
 
 import argparse
 import json
-from dataclasses import dataclass
+import math
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from mlproj.evaluation.bootstrap import Bootstrap
 
 
 @dataclass(frozen=True)
@@ -12,6 +16,9 @@ class ModelRow:
     name: str
     threshold: float
     metrics: dict[str, float]
+    # Bootstrap intervals from the eval JSON ("ci"), if it has them.
+    ci: dict[str, tuple[float, float]] = field(default_factory=dict)
+    policy: str = "val-tuned"  # how the threshold was set, e.g. "fixed"
 
 
 def _read_json(path: Path) -> dict[str, Any]:
@@ -28,6 +35,15 @@ def _read_metrics(eval_path: Path) -> dict[str, float]:
     return out
 
 
+def _read_ci(eval_path: Path) -> dict[str, tuple[float, float]]:
+    ci = _read_json(eval_path).get("ci", {}).get("metrics", {})
+    nan = float("nan")
+    return {
+        str(k): (nan if lo is None else float(lo), nan if hi is None else float(hi))
+        for k, (lo, hi) in ci.items()
+    }
+
+
 def _read_threshold(path: Path) -> float:
     return float(path.read_text(encoding="utf-8").strip())
 
@@ -43,40 +59,112 @@ def _pick_winner(metric: str, rows: list[ModelRow]) -> str:
     return max(rows, key=key).name
 
 
-def render_compare_models_3(metric: str, rows: list[ModelRow]) -> str:
+def render_compare_models_3(
+    metric: str, rows: list[ModelRow], *, boot: Bootstrap | None = None, level: float = 0.95
+) -> str:
     winner = _pick_winner(metric, rows)
+    # One policy for every row goes in the headings; mixed policies get a column.
+    policies = {r.policy for r in rows}
+    shared = f" {policies.pop()}" if len(policies) == 1 else ""
 
     parts: list[str] = []
-    parts.append("# Model comparison (val-tuned thresholds)\n\n")
+    parts.append(f"# Model comparison ({shared.strip() or 'per-model'} thresholds)\n\n")
     parts.append(f"**Optimized metric (picked on val):** `{metric}`\n")
     parts.append(f"**Winner (by `{metric}` on test):** `{winner}`\n\n")
 
-    parts.append("## Test metrics at each model\x27s val-tuned threshold\n\n")
-    parts.append("| Model | Threshold | accuracy | precision | recall | f1 | roc_auc |\n")
-    parts.append("|---|---:|:---:|:---:|:---:|:---:|:---:|\n")
+    parts.append(f"## Test metrics at each model\x27s{shared} threshold\n\n")
+    policy_head, policy_rule = ("", "") if shared else (" Policy |", "---|")
+    parts.append(
+        f"| Model | Threshold |{policy_head} accuracy | precision | recall | f1 | roc_auc |\n"
+    )
+    parts.append(f"|---|---:|{policy_rule}:---:|:---:|:---:|:---:|:---:|\n")
 
     for r in rows:
-        m = r.metrics
-        parts.append(
-            "| {name} | `{thr:.3f}` | {acc:.3f} | {prec:.3f} | {rec:.3f} | {f1:.3f} | {auc:.3f} |\n".format(
-                name=r.name,
-                thr=r.threshold,
-                acc=m.get("accuracy", float("nan")),
-                prec=m.get("precision", float("nan")),
-                rec=m.get("recall", float("nan")),
-                f1=m.get("f1", float("nan")),
-                auc=m.get("roc_auc", float("nan")),
-            )
-        )
+        cells = [_cell(r, k) for k in ("accuracy", "precision", "recall", "f1", "roc_auc")]
+        policy = "" if shared else f" {r.policy} |"
+        parts.append(f"| {r.name} | `{r.threshold:.3f}` |{policy} " + " | ".join(cells) + " |\n")
+
+    if boot is not None:
+        parts.append(render_paired_differences(metric, winner, rows, boot, level=level))
 
     parts.append("\n### Notes\n")
-    parts.append("- Thresholds are tuned on **val**; this table reports metrics on **test**.\n")
+    if any(r.policy.startswith("val-tuned") for r in rows):
+        parts.append("- Thresholds are tuned on **val**; this table reports metrics on **test**.\n")
+    if any(r.policy.startswith("fixed") for r in rows):
+        parts.append("- Fixed thresholds come from the manifest and are not tuned.\n")
     parts.append(
         "- Different models can prefer very different thresholds; this shifts the precision/recall tradeoff.\n"
     )
+    if any(r.ci for r in rows):
+        parts.append("- `[low, high]`: percentile bootstrap interval over the test rows.\n")
     return "".join(parts).rstrip() + "\n"
 
 
+def _cell(row: ModelRow, key: str) -> str:
+    value = f"{row.metrics.get(key, float('nan')):.3f}"
+    if key in row.ci:
+        lo, hi = row.ci[key]
+        value += f" [{lo:.3f}, {hi:.3f}]"
+    return value
+
+
+def render_paired_differences(
+    metric: str, winner: str, rows: list[ModelRow], boot: Bootstrap, *, level: float = 0.95
+) -> str:
+    """Intervals for (model - winner) over resamples shared by all models."""
+    keys = [k for k in dict.fromkeys([metric, "roc_auc"]) if k in boot.samples[winner]]
+    best = next(r for r in rows if r.name == winner)
+    parts = [f"\n## Paired bootstrap: gap to `{winner}`\n\n"]
+    parts.append(
+        f"{level:.0%} intervals of (model - winner) over {boot.n_resamples} resamples of the "
+        "test rows shared by all models. An interval containing 0 means the gap is within "
+        "resampling noise.\n\n"
+    )
+    if not boot.paired_scores:
+        parts.append(
+            "ROC AUC / AP were resampled per model (too many joint score cells), so their gaps "
+            "ignore the correlation between models and are conservative.\n\n"
+        )
+    parts.append("| Model | " + " | ".join(f"Δ{k}" for k in keys) + " | Gap |\n")
+    parts.append("|---|" + ":---:|" * len(keys) + ":---:|\n")
+    for r in rows:
+        if r.name == winner:
+            continue
+        cells = []
+        for k in keys:
+            diff = r.metrics.get(k, float("nan")) - best.metrics.get(k, float("nan"))
+            lo, hi = boot.diff_interval(r.name, winner, k, level)
+            cells.append(f"{diff:+.3f} [{lo:+.3f}, {hi:+.3f}]")
+        verdict = "n/a"
+        if metric in keys:
+            lo, hi = boot.diff_interval(r.name, winner, metric, level)
+            verdict = "within noise" if math.isnan(lo) or lo <= 0.0 <= hi else "significant"
+        parts.append(f"| {r.name} | " + " | ".join(cells) + f" | {verdict} |\n")
+    return "".join(parts)
+
+
+def _paired_bootstrap(
+    input_path: Path, preds: dict[str, Path], *, n_resamples: int | None, seed: int, workers: int
+) -> Bootstrap:
+    # Only the paired option needs NumPy / pandas; plain renders stay light to import.
+    import numpy as np
+
+    from mlproj.evaluation.bootstrap import DEFAULT_RESAMPLES, bootstrap_metrics
+    from mlproj.evaluation.eval_predictions import load_and_align
+
+    if n_resamples is None:
+        n_resamples = DEFAULT_RESAMPLES
+    y_true: np.ndarray | None = None
+    models: dict[str, tuple[np.ndarray, np.ndarray | None]] = {}
+    for name, path in preds.items():
+        y, y_pred, y_proba, _ = load_and_align(input_path, path)
+        if y_true is not None and not np.array_equal(y, y_true):
+            raise ValueError(f"Predictions {path} are not aligned with the other models' rows")
+        y_true = y
+        models[name] = (y_pred, y_proba)
+    return bootstrap_metrics(y_true, models, n_resamples=n_resamples, seed=seed, workers=workers)
+
+
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--metric", required=True)
@@ -91,29 +179,61 @@ def main() -> None:
     ap.add_argument("--hgb-threshold-file", required=True)
 
     ap.add_argument("--out", required=True)
+
+    paired = ap.add_argument_group(
+        "paired bootstrap", "Test labels and each model's predictions, for paired gap intervals."
+    )
+    paired.add_argument("--input", default=None, help="Labeled test CSV (target column)")
+    paired.add_argument("--baseline-preds", default=None)
+    paired.add_argument("--rf-preds", default=None)
+    paired.add_argument("--hgb-preds", default=None)
+    paired.add_argument(
+        "--bootstrap", type=int, default=None, help="Bootstrap resamples (default: 10000)"
+    )
+    paired.add_argument("--ci", type=float, default=0.95)
+    paired.add_argument("--seed", type=int, default=0)
+    paired.add_argument("--workers", type=int, default=1)
     args = ap.parse_args()
+    preds_args = [args.baseline_preds, args.rf_preds, args.hgb_preds]
+    if args.input is not None and None in preds_args:
+        ap.error("--input needs --baseline-preds, --rf-preds and --hgb-preds")
 
     rows = [
         ModelRow(
             name="baseline_logreg",
             threshold=_read_threshold(Path(args.baseline_threshold_file)),
             metrics=_read_metrics(Path(args.baseline_eval)),
+            ci=_read_ci(Path(args.baseline_eval)),
         ),
         ModelRow(
             name="random_forest",
             threshold=_read_threshold(Path(args.rf_threshold_file)),
             metrics=_read_metrics(Path(args.rf_eval)),
+            ci=_read_ci(Path(args.rf_eval)),
         ),
         ModelRow(
             name="hist_gradient_boosting",
             threshold=_read_threshold(Path(args.hgb_threshold_file)),
             metrics=_read_metrics(Path(args.hgb_eval)),
+            ci=_read_ci(Path(args.hgb_eval)),
         ),
     ]
 
+    boot = None
+    if args.input is not None:
+        boot = _paired_bootstrap(
+            Path(args.input),
+            {r.name: Path(p) for r, p in zip(rows, preds_args, strict=True)},
+            n_resamples=args.bootstrap,
+            seed=args.seed,
+            workers=args.workers,
+        )
+
     out = Path(args.out)
     out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(render_compare_models_3(args.metric, rows), encoding="utf-8")
+    out.write_text(
+        render_compare_models_3(args.metric, rows, boot=boot, level=args.ci), encoding="utf-8"
+    )
     print(f"Wrote: {out}")
 
 
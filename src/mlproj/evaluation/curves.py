@@ -0,0 +1,225 @@
+"""
+Sort-once evaluation core for binary classifiers.
+
+`BinaryCurves` sorts the scores once and keeps the cumulative true / false
+positive counts at every distinct score (the table sklearn rebuilds inside
+each of `roc_auc_score`, `precision_recall_curve` and
+`average_precision_score`). Everything else is derived on demand from those
+counts: ROC AUC, the PR curve, average precision, and the threshold table,
+where confusion counts at any threshold are a binary search and every
+metric is vectorized arithmetic (O(n log n) for the sort plus O(T log n)
+for T thresholds, instead of one pass over all n predictions per threshold).
+
+Values match sklearn exactly: counts are integers, and the metric formulas,
+ROC AUC (drop_intermediate ROC + trapezoid), PR curve and AP repeat
+sklearn's arithmetic.
+
+`BinaryCurves.sweep_exact` evaluates every distinct score as a cutpoint;
+`pareto_downsample` thins such a table to the cutpoints not dominated in
+(more TP, fewer FP), which keep the optimum of every metric that improves
+with TP and worsens with FP (accuracy, precision, F1), and pins the best
+cutpoint of each threshold metric when it has to drop frontier rows too.
+`score` is the single-number scorer (any of SCORERS) shared by cross-validation,
+the hyperparameter search and permutation importance.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from mlproj.evaluation.metrics import (
+    THRESHOLD_METRICS,
+    classification_metrics,
+    metrics_from_counts,
+)
+
+SWEEP_COLUMNS = [
+    "threshold",
+    "accuracy",
+    "precision",
+    "recall",
+    "f1",
+    "roc_auc",
+    "tp",
+    "fp",
+    "tn",
+    "fn",
+]
+SCORERS = ("roc_auc", "average_precision", *THRESHOLD_METRICS)
+
+
+def _sort_descending(p: np.ndarray, pos: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Scores sorted decreasing, with their labels (order within ties is arbitrary)."""
+    if p.size and not np.signbit(p).any():
+        # Non-negative floats order like their bit patterns, which leave the top
+        # bit free: sort (bits << 1 | label) as one uint64 key instead of an argsort.
+        keys = np.sort((p.view(np.uint64) << np.uint64(1)) | pos)[::-1]
+        return (keys >> np.uint64(1)).view(np.float64), (keys & np.uint64(1)).astype(bool)
+    order = np.argsort(p)[::-1]
+    return p[order], pos[order]
+
+
+def pareto_mask(tp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+    """
+    Rows not dominated by another row with >= TP and <= FP (one strictly).
+
+    Of rows with identical counts only the first is kept.
+    """
+    tp = np.asarray(tp)
+    fp = np.asarray(fp)
+    order = np.lexsort((fp, -tp))  # TP decreasing, then FP increasing, then row order
+    fp_sorted = fp[order].astype(np.float64)
+    best_before = np.r_[np.inf, np.minimum.accumulate(fp_sorted)[:-1]]
+    keep = np.zeros(tp.shape, dtype=bool)
+    keep[order] = fp_sorted < best_before
+    return keep
+
+
+def pareto_downsample(
+    df: pd.DataFrame, max_points: int, *, metrics: tuple[str, ...] = THRESHOLD_METRICS
+) -> pd.DataFrame:
+    """
+    At most `max_points` rows of a sweep table, preferring Pareto-optimal cutpoints.
+
+    Dominated rows are dropped first. If more than `max_points` remain, the
+    best row of each of `metrics` (ties -> lowest threshold, as in
+    pick_best_threshold) is kept and the rest are spaced evenly along the
+    frontier. Rows stay in threshold order.
+    """
+    if max_points < 1:
+        raise ValueError("max_points must be >= 1")
+    front = df.loc[pareto_mask(df["tp"].to_numpy(), df["fp"].to_numpy())]
+    front = front.sort_values("threshold", kind="stable").reset_index(drop=True)
+    if len(front) <= max_points:
+        return front
+
+    best = {
+        int(front.sort_values([m, "threshold"], ascending=[False, True]).index[0])
+        for m in metrics
+        if m in front.columns
+    }
+    if len(best) >= max_points:
+        return front.loc[sorted(best)[:max_points]].reset_index(drop=True)
+    rest = np.setdiff1d(np.arange(len(front)), sorted(best))
+    spaced = rest[np.linspace(0, len(rest) - 1, max_points - len(best)).round().astype(int)]
+    return front.loc[np.union1d(spaced, sorted(best))].reset_index(drop=True)
+
+
+@dataclass(frozen=True)
+class BinaryCurves:
+    """Cumulative confusion counts of one set of scores, at each distinct score."""
+
+    scores: np.ndarray  # distinct scores, decreasing
+    tps: np.ndarray  # positives with score >= scores[i]
+    fps: np.ndarray  # negatives with score >= scores[i]
+    n_pos: int
+    n_neg: int
+
+    @classmethod
+    def from_scores(cls, y_true: Any, proba: Any) -> BinaryCurves:
+        y = np.asarray(y_true)
+        p = np.asarray(proba, dtype=np.float64)
+        if y.ndim != 1 or y.shape != p.shape:
+            raise ValueError(
+                f"y_true and proba must be 1-D of equal length: {y.shape} vs {p.shape}"
+            )
+        if np.isnan(p).any():
+            raise ValueError("proba contains NaN")
+        pos = y == 1
+        if not np.all(pos | (y == 0)):
+            raise ValueError("y_true must contain only 0/1 labels")
+
+        p, pos = _sort_descending(p + 0.0, pos)  # + 0.0 folds -0.0 into 0.0
+        tps_all = np.cumsum(pos, dtype=np.int64)
+        # Last index of every run of equal scores.
+        ends = np.r_[np.flatnonzero(np.diff(p)), p.size - 1] if p.size else np.empty(0, np.int64)
+        tps = tps_all[ends]
+        fps = ends + 1 - tps
+        n_pos = int(tps[-1]) if tps.size else 0
+        return cls(scores=p[ends], tps=tps, fps=fps, n_pos=n_pos, n_neg=p.size - n_pos)
+
+    @property
+    def n(self) -> int:
+        return self.n_pos + self.n_neg
+
+    def counts_at(self, thresholds: Any) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(tp, fp, tn, fn) for predicting positive when proba >= t, per threshold t."""
+        t = np.asarray(thresholds, dtype=np.float64)
+        # Number of distinct scores >= t (scores are decreasing, so search the negation).
+        k = np.searchsorted(-self.scores, -t, side="right")
+        tp = np.where(k > 0, self.tps[k - 1], 0)
+        fp = np.where(k > 0, self.fps[k - 1], 0)
+        return tp, fp, self.n_neg - fp, self.n_pos - tp
+
+    def roc_auc(self) -> float:
+        """Area under the ROC curve (NaN when only one class is present)."""
+        if self.n_pos == 0 or self.n_neg == 0:
+            return float("nan")
+        fps = self.fps.astype(np.float64)
+        tps = self.tps.astype(np.float64)
+        if fps.size > 2:
+            keep = np.r_[True, np.logical_or(np.diff(fps, 2), np.diff(tps, 2)), True]
+            fps, tps = fps[keep], tps[keep]
+        fpr = np.r_[0.0, fps] / fps[-1]
+        tpr = np.r_[0.0, tps] / tps[-1]
+        return float(np.trapezoid(tpr, fpr))
+
+    def pr_curve(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(precision, recall, thresholds) laid out as sklearn's precision_recall_curve."""
+        tps = self.tps.astype(np.float64)
+        precision = tps / (tps + self.fps)
+        recall = tps / tps[-1] if self.n_pos else np.ones_like(tps)
+        return np.r_[precision[::-1], 1.0], np.r_[recall[::-1], 0.0], self.scores[::-1].copy()
+
+    def average_precision(self) -> float:
+        """Step-function area under the PR curve (sklearn's average_precision_score)."""
+        precision, recall, _ = self.pr_curve()
+        return float(max(0.0, -np.sum(np.diff(recall) * precision[:-1])))
+
+    def metrics_at(self, threshold: float) -> dict[str, Any]:
+        """Sweep row at one threshold: float metrics and int confusion counts."""
+        tp, fp, tn, fn = (int(c) for c in self.counts_at(threshold))
+        return {
+            **metrics_from_counts(tp, fp, tn, fn),
+            "roc_auc": self.roc_auc(),
+            "tp": tp,
+            "fp": fp,
+            "tn": tn,
+            "fn": fn,
+        }
+
+    def sweep_exact(self) -> pd.DataFrame:
+        """Threshold metrics at every distinct score (each is a `proba >= t` cutpoint)."""
+        return self.sweep(self.scores[::-1])
+
+    def sweep(self, thresholds: Any) -> pd.DataFrame:
+        """Threshold metrics table (SWEEP_COLUMNS), one row per threshold."""
+        t = np.asarray(thresholds, dtype=np.float64)
+        tp, fp, tn, fn = self.counts_at(t)
+        return pd.DataFrame(
+            {
+                "threshold": t,
+                **metrics_from_counts(tp, fp, tn, fn),
+                "roc_auc": self.roc_auc(),
+                "tp": tp.astype(int),
+                "fp": fp.astype(int),
+                "tn": tn.astype(int),
+                "fn": fn.astype(int),
+            },
+            columns=SWEEP_COLUMNS,
+        )
+
+
+def score(y: np.ndarray, proba: np.ndarray, metric: str, threshold: float = 0.5) -> float:
+    """`metric` of P(class 1) scores (threshold metrics predict `proba >= threshold`)."""
+    if metric == "roc_auc":
+        return BinaryCurves.from_scores(y, proba).roc_auc()
+    if metric == "average_precision":
+        return BinaryCurves.from_scores(y, proba).average_precision()
+    if metric in THRESHOLD_METRICS:
+        return classification_metrics(y, (proba >= threshold).astype(int))[metric]
+    raise ValueError(f"Unknown metric {metric!r} (choose from {SCORERS})")
@@ -1,33 +1,38 @@
 from __future__ import annotations
 
 import argparse
+import itertools
 import json
+from collections.abc import Iterator
 from pathlib import Path
-from typing import Any, cast
+from typing import Any
 
 import numpy as np
 import pandas as pd
-from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+
+from mlproj.data.columnar import read_table
+from mlproj.evaluation.bootstrap import DEFAULT_RESAMPLES, bootstrap_metrics, ci_payload
+from mlproj.evaluation.curves import BinaryCurves
+from mlproj.evaluation.metrics import classification_metrics
+from mlproj.evaluation.streaming import DEFAULT_BINS, MetricAccumulator
+from mlproj.inference.wide import pred_col, proba_col, select_model_columns
 
 
 def compute_metrics(
     y_true: np.ndarray, y_pred: np.ndarray, y_proba: np.ndarray | None
 ) -> dict[str, float]:
-    metrics: dict[str, float] = {
-        "accuracy": float(accuracy_score(y_true, y_pred)),
-        "precision": float(precision_score(y_true, y_pred, zero_division=cast(Any, 0))),
-        "recall": float(recall_score(y_true, y_pred, zero_division=cast(Any, 0))),
-        "f1": float(f1_score(y_true, y_pred, zero_division=cast(Any, 0))),
-    }
+    metrics = classification_metrics(y_true, y_pred)
     if y_proba is not None and len(np.unique(y_true)) == 2:
-        metrics["roc_auc"] = float(roc_auc_score(y_true, y_proba))
+        curves = BinaryCurves.from_scores(y_true, y_proba)
+        metrics["roc_auc"] = curves.roc_auc()
+        metrics["average_precision"] = curves.average_precision()
     return metrics
 
 
 def load_and_align(
-    input_path: Path, preds_path: Path
+    input_path: Path, preds_path: Path, *, model: str | None = None
 ) -> tuple[np.ndarray, np.ndarray, np.ndarray | None, int]:
-    df_true = pd.read_csv(input_path)
+    df_true = read_table(input_path)
     if "target" not in df_true.columns:
         raise ValueError(f"Input must contain a 'target' column: {input_path}")
 
@@ -35,6 +40,8 @@ def load_and_align(
     df_true["row_id"] = np.arange(len(df_true), dtype=int)
 
     df_pred = pd.read_csv(preds_path)
+    if model is not None:
+        df_pred = select_model_columns(df_pred, model)
     if "pred" not in df_pred.columns:
         raise ValueError(f"Predictions must contain a 'pred' column: {preds_path}")
 
@@ -53,6 +60,78 @@ def load_and_align(
     return y_true, y_pred, y_proba, len(merged)
 
 
+Chunk = tuple[np.ndarray, np.ndarray, np.ndarray | None]  # (y_true, y_pred, proba or None)
+
+
+def aligned_chunks(
+    input_path: Path, preds_path: Path, *, chunksize: int, model: str | None = None
+) -> tuple[bool, Iterator[Chunk]]:
+    """
+    (scored, chunks) of labels and predictions read in lockstep.
+
+    Unlike `load_and_align`, rows are matched by position: predictions must
+    cover the input in order (a `row_id` column, if present, is checked to be
+    0, 1, 2, ...). Headers are checked up front; rows are read as the chunks
+    are consumed, so memory is bounded by `chunksize`. `scored` is whether
+    the predictions carry probabilities (otherwise proba is None).
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be >= 1")
+    if "target" not in pd.read_csv(input_path, nrows=0).columns:
+        raise ValueError(f"Input must contain a 'target' column: {input_path}")
+    header = pd.read_csv(preds_path, nrows=0)
+    proba_name, pred_name = "proba_disease", "pred"
+    if model is not None:
+        select_model_columns(header, model)  # same error as the whole-file path
+        proba_name, pred_name = proba_col(model), pred_col(model)
+    if pred_name not in header.columns:
+        raise ValueError(f"Predictions must contain a 'pred' column: {preds_path}")
+    scored = proba_name in header.columns
+    wanted = [c for c in ("row_id", proba_name, pred_name) if c in header.columns]
+
+    def chunks() -> Iterator[Chunk]:
+        truth = pd.read_csv(input_path, usecols=["target"], chunksize=chunksize)
+        preds = pd.read_csv(preds_path, usecols=wanted, chunksize=chunksize)
+        n_true = n_pred = 0
+        for t, p in itertools.zip_longest(truth, preds):
+            n_true += 0 if t is None else len(t)
+            n_pred += 0 if p is None else len(p)
+            if t is None or p is None or len(t) != len(p):
+                continue  # reported below, once both files are counted
+            if "row_id" in p.columns and not np.array_equal(
+                p["row_id"].to_numpy(), np.arange(n_pred - len(p), n_pred)
+            ):
+                raise ValueError(
+                    f"Streaming evaluation needs predictions in input order (row_id 0, 1, ...): "
+                    f"{preds_path}; evaluate without --chunksize to align by row_id."
+                )
+            yield (
+                t["target"].astype(int).to_numpy(),
+                p[pred_name].astype(int).to_numpy(),
+                p[proba_name].to_numpy() if scored else None,
+            )
+        if n_true != n_pred:
+            raise ValueError(f"Row mismatch: input rows={n_true} preds rows={n_pred}")
+
+    return scored, chunks()
+
+
+def stream_accumulate(
+    input_path: Path,
+    preds_path: Path,
+    *,
+    chunksize: int,
+    model: str | None = None,
+    bins: int = DEFAULT_BINS,
+) -> MetricAccumulator:
+    """Accumulate metrics over `aligned_chunks`; memory is bounded by `chunksize` and `bins`."""
+    scored, chunks = aligned_chunks(input_path, preds_path, chunksize=chunksize, model=model)
+    acc = MetricAccumulator.empty(bins, scored=scored)
+    for y, pred, proba in chunks:
+        acc.update(y, pred, proba)
+    return acc
+
+
 def main() -> None:
     ap = argparse.ArgumentParser(
         description="Evaluate predictions CSV against a labeled input CSV."
@@ -60,21 +139,71 @@ def main() -> None:
     ap.add_argument("--input", required=True, help="CSV with ground truth 'target' column.")
     ap.add_argument("--preds", required=True, help="Predictions CSV from predict_baseline.")
     ap.add_argument("--out", default="reports/latest_eval_baseline.json", help="Output JSON path.")
+    ap.add_argument(
+        "--model", default=None, help="Model to evaluate from a wide predict_all predictions CSV."
+    )
+    ap.add_argument(
+        "--bootstrap",
+        type=int,
+        default=DEFAULT_RESAMPLES,
+        help=f"Bootstrap resamples for metric CIs (default: {DEFAULT_RESAMPLES}; 0 disables)",
+    )
+    ap.add_argument("--ci", type=float, default=0.95, help="CI level (default: 0.95)")
+    ap.add_argument("--seed", type=int, default=0, help="Bootstrap seed (default: 0)")
+    ap.add_argument("--workers", type=int, default=1, help="Bootstrap worker processes")
+    ap.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help=(
+            "Stream both CSVs in chunks of this many rows (constant memory; predictions "
+            "must be in input order). ROC AUC / AP use a score histogram, with bounds."
+        ),
+    )
+    ap.add_argument(
+        "--bins",
+        type=int,
+        default=DEFAULT_BINS,
+        help=f"Score histogram bins with --chunksize (default: {DEFAULT_BINS})",
+    )
     args = ap.parse_args()
 
     input_path = Path(args.input)
     preds_path = Path(args.preds)
     out_path = Path(args.out)
 
-    y_true, y_pred, y_proba, n_rows = load_and_align(input_path, preds_path)
-    metrics = compute_metrics(y_true, y_pred, y_proba)
-
-    payload: dict[str, Any] = {
-        "input": str(input_path),
-        "preds": str(preds_path),
-        "n_rows": n_rows,
-        "metrics": metrics,
-    }
+    payload: dict[str, Any] = {"input": str(input_path), "preds": str(preds_path)}
+    if args.chunksize is None:
+        y_true, y_pred, y_proba, n_rows = load_and_align(input_path, preds_path, model=args.model)
+        metrics = compute_metrics(y_true, y_pred, y_proba)
+        weights = None
+    else:
+        acc = stream_accumulate(
+            input_path, preds_path, chunksize=args.chunksize, model=args.model, bins=args.bins
+        )
+        metrics = acc.metrics()
+        n_rows = acc.n
+        # The bootstrap runs on the histogram cells, each weighted by its row count.
+        y_true, pred, score_bin, weights = acc.cells()
+        y_pred, y_proba = pred, score_bin if acc.scored else None
+        payload["streaming"] = {
+            "chunksize": args.chunksize,
+            "score_bins": acc.bins if acc.scored else None,
+            "bounds": acc.bounds() if "roc_auc" in metrics else {},
+        }
+    payload["n_rows"] = n_rows
+    payload["metrics"] = metrics
+
+    if args.bootstrap > 0:
+        boot = bootstrap_metrics(
+            y_true,
+            {"model": (y_pred, y_proba)},
+            n_resamples=args.bootstrap,
+            seed=args.seed,
+            workers=args.workers,
+            weights=weights,
+        )
+        payload["ci"] = ci_payload(boot, "model", args.ci)
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
     out_path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
@@ -0,0 +1,88 @@
+"""
+Threshold metrics from confusion counts.
+
+Accuracy, precision, recall and F1 are arithmetic on (tp, fp, tn, fn). The
+counts of one prediction vector are a single np.bincount over
+2 * y_true + y_pred, and `metrics_from_counts` is vectorized over counts of
+any shape, so single evaluations, threshold sweeps and bootstrap resamples
+share the same formulas.
+
+`zero_division` follows sklearn: the value of a metric whose denominator is
+0 (precision without predicted positives, recall without actual positives,
+F1 with neither), or "warn" for 0.0 plus an `UndefinedMetricWarning`.
+"""
+
+from __future__ import annotations
+
+import warnings
+from typing import Any, Literal
+
+import numpy as np
+
+THRESHOLD_METRICS = ("accuracy", "precision", "recall", "f1")
+
+ZeroDivision = float | Literal["warn"]
+
+
+class UndefinedMetricWarning(UserWarning):
+    """A metric's denominator was 0 and it was set to 0.0 (zero_division="warn")."""
+
+
+_UNDEFINED = {
+    "precision": "Precision is ill-defined and being set to 0.0 due to no predicted samples.",
+    "recall": "Recall is ill-defined and being set to 0.0 due to no true samples.",
+    "f1": "F-score is ill-defined and being set to 0.0 due to no true nor predicted samples.",
+}
+
+
+def confusion_counts(y_true: Any, y_pred: Any) -> tuple[int, int, int, int]:
+    """(tp, fp, tn, fn) of 0/1 predictions against 0/1 labels."""
+    y = np.asarray(y_true)
+    pred = np.asarray(y_pred)
+    if y.shape != pred.shape:
+        raise ValueError(f"y_true and y_pred must align: {y.shape} vs {pred.shape}")
+    for name, values in (("y_true", y), ("y_pred", pred)):
+        if not np.all((values == 0) | (values == 1)):
+            raise ValueError(f"{name} must contain only 0/1 values")
+    tn, fp, fn, tp = np.bincount(
+        y.astype(np.int64).ravel() * 2 + pred.astype(np.int64).ravel(), minlength=4
+    ).tolist()
+    return tp, fp, tn, fn
+
+
+def _ratio(num: np.ndarray, den: np.ndarray, fill: float) -> np.ndarray:
+    out = np.full(np.broadcast(num, den).shape, fill, dtype=np.float64)
+    np.divide(num, den, out=out, where=den != 0)
+    return out
+
+
+def metrics_from_counts(
+    tp: Any, fp: Any, tn: Any, fn: Any, *, zero_division: ZeroDivision = 0.0
+) -> dict[str, Any]:
+    """
+    THRESHOLD_METRICS from confusion counts.
+
+    Scalar counts give floats; arrays give arrays of their broadcast shape.
+    Accuracy of zero rows is 0.0.
+    """
+    tp, fp, tn, fn = (np.asarray(c, dtype=np.float64) for c in (tp, fp, tn, fn))
+    fill = 0.0 if zero_division == "warn" else float(zero_division)
+    dens = {"precision": tp + fp, "recall": tp + fn, "f1": 2.0 * tp + fp + fn}
+    if zero_division == "warn":
+        for name, den in dens.items():
+            if np.any(den == 0):
+                warnings.warn(_UNDEFINED[name], UndefinedMetricWarning, stacklevel=2)
+    metrics = {
+        "accuracy": _ratio(tp + tn, tp + fp + tn + fn, 0.0),
+        "precision": _ratio(tp, dens["precision"], fill),
+        "recall": _ratio(tp, dens["recall"], fill),
+        "f1": _ratio(2.0 * tp, dens["f1"], fill),
+    }
+    return {k: float(v) if v.ndim == 0 else v for k, v in metrics.items()}
+
+
+def classification_metrics(
+    y_true: Any, y_pred: Any, *, zero_division: ZeroDivision = 0.0
+) -> dict[str, float]:
+    """THRESHOLD_METRICS of 0/1 predictions (sklearn's scorers, from one bincount)."""
+    return metrics_from_counts(*confusion_counts(y_true, y_pred), zero_division=zero_division)
@@ -0,0 +1,250 @@
+"""
+Permutation feature importance for the trained models.
+
+Importance of a feature = score on the labeled input minus the score after
+shuffling that feature's column (mean and std over `--repeats` shuffles).
+Unshuffled (baseline) scores are computed once per model.
+
+Work is split into (feature, repeat) jobs. Each process loads the models
+and the input once (pool initializer), with the features in a float64
+buffer. A job shuffles one buffer column in place (np.take into the
+column), scores every model on the buffer, and restores the column. So no
+input is re-read or copied per job, and all models see the same shuffle.
+Shuffles are seeded by (seed, feature, repeat), so results do not depend
+on `--workers`.
+
+Models are scored through their NumPy-only compiled form
+(registry.compile_model), except random forests on more than
+_FOREST_COMPILED_MAX_ROWS rows: the compiled forest gathers per (tree, row,
+level), so past a few hundred rows sklearn's own traversal is faster.
+
+Writes a CSV (one row per model and feature) and a markdown section that
+write_final_report embeds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from mlproj.data.columnar import read_table
+from mlproj.evaluation.curves import SCORERS, score
+from mlproj.inference.registry import compile_model, load_models, parse_model_specs
+
+CSV_COLUMNS = [
+    "model",
+    "feature",
+    "metric",
+    "baseline",
+    "importance_mean",
+    "importance_std",
+    "repeats",
+]
+
+# Crossover of CompiledForest vs RandomForestClassifier.predict_proba (100 trees).
+_FOREST_COMPILED_MAX_ROWS = 400
+
+# Per-process state, set once by _init (in the pool initializer, or in-process).
+_STATE: dict[str, Any] = {}
+
+
+def _buffer_scorer(
+    model: Any, columns: list[str], n_rows: int
+) -> Callable[[np.ndarray], np.ndarray]:
+    """P(class 1) of the model, given the (n_rows, len(columns)) feature buffer."""
+    names = getattr(model, "feature_names_in_", None)
+    names = columns if names is None else [str(c) for c in names]
+    missing = [c for c in names if c not in columns]
+    if missing:
+        raise ValueError(f"Missing required feature columns: {missing}")
+    idx = np.array([columns.index(c) for c in names])
+    if np.array_equal(idx, np.arange(len(columns))):
+        idx = None
+
+    large_forest = (
+        type(model).__name__ == "RandomForestClassifier" and n_rows > _FOREST_COMPILED_MAX_ROWS
+    )
+    compiled = None if large_forest else compile_model(model)
+    if compiled is not None:
+        proba = compiled.proba
+        return proba if idx is None else lambda buf: proba(buf[:, idx])
+
+    def estimator_proba(buf: np.ndarray) -> np.ndarray:
+        frame = pd.DataFrame(buf, columns=columns, copy=False)
+        return np.asarray(model.predict_proba(frame if idx is None else frame[names]))[:, 1]
+
+    return estimator_proba
+
+
+def _init(model_paths: dict[str, Path], input_path: Path, metric: str, threshold: float) -> None:
+    df = read_table(input_path)
+    if "target" not in df.columns:
+        raise ValueError(f"Input must contain a 'target' column: {input_path}")
+    features = df.drop(columns=["target"])
+    non_numeric = [c for c in features.columns if not pd.api.types.is_numeric_dtype(features[c])]
+    if non_numeric:
+        raise ValueError(f"Permutation importance needs numeric features, got: {non_numeric}")
+    original = np.asfortranarray(features.to_numpy(dtype=np.float64))
+    columns = [str(c) for c in features.columns]
+    _STATE.update(
+        scorers={
+            name: _buffer_scorer(model, columns, len(original))
+            for name, model in load_models(model_paths).items()
+        },
+        columns=columns,
+        y=df["target"].astype(int).to_numpy(),
+        original=original,
+        buffer=original.copy(order="F"),
+        metric=metric,
+        threshold=threshold,
+    )
+
+
+def _scores() -> dict[str, float]:
+    """Score of every model on the current buffer contents."""
+    buffer = _STATE["buffer"]
+    return {
+        name: score(_STATE["y"], proba(buffer), _STATE["metric"], _STATE["threshold"])
+        for name, proba in _STATE["scorers"].items()
+    }
+
+
+def _shuffled_scores(job: tuple[int, int, int]) -> dict[str, float]:
+    """Scores with feature j shuffled by the (seed, j, repeat) permutation."""
+    seed, j, repeat = job
+    original, buffer = _STATE["original"], _STATE["buffer"]
+    perm = np.random.default_rng((seed, j, repeat)).permutation(len(original))
+    np.take(original[:, j], perm, out=buffer[:, j])
+    try:
+        return _scores()
+    finally:
+        buffer[:, j] = original[:, j]
+
+
+def permutation_importance(
+    model_paths: dict[str, Path],
+    input_path: Path,
+    *,
+    metric: str = "roc_auc",
+    threshold: float = 0.5,
+    repeats: int = 10,
+    seed: int = 0,
+    workers: int = 1,
+) -> pd.DataFrame:
+    """CSV_COLUMNS table, rows grouped by model, most important feature first."""
+    if metric not in SCORERS:
+        raise ValueError(f"Unknown metric {metric!r} (choose from {SCORERS})")
+    if repeats < 1:
+        raise ValueError("repeats must be >= 1")
+    init_args = (model_paths, input_path, metric, threshold)
+    _init(*init_args)
+    baseline = _scores()
+    columns = list(_STATE["columns"])
+    jobs = [(seed, j, r) for j in range(len(columns)) for r in range(repeats)]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init, initargs=init_args) as ex:
+            chunk = max(1, len(jobs) // (4 * workers))
+            shuffled = list(ex.map(_shuffled_scores, jobs, chunksize=chunk))
+    else:
+        shuffled = [_shuffled_scores(job) for job in jobs]
+
+    rows = []
+    for name, base in baseline.items():
+        drops = base - np.array([s[name] for s in shuffled]).reshape(len(columns), repeats)
+        table = pd.DataFrame(
+            {
+                "model": name,
+                "feature": columns,
+                "metric": metric,
+                "baseline": base,
+                "importance_mean": drops.mean(axis=1),
+                "importance_std": drops.std(axis=1),
+                "repeats": repeats,
+            },
+            columns=CSV_COLUMNS,
+        )
+        rows.append(table.sort_values("importance_mean", ascending=False, kind="stable"))
+    return pd.concat(rows, ignore_index=True)
+
+
+def render_importance_md(df: pd.DataFrame, *, top: int | None = None) -> str:
+    """Markdown section: features (most important on average first) x models."""
+    metric = str(df["metric"].iloc[0])
+    repeats = int(df["repeats"].iloc[0])
+    models = list(dict.fromkeys(df["model"]))
+    mean = df.pivot(index="feature", columns="model", values="importance_mean")[models]
+    std = df.pivot(index="feature", columns="model", values="importance_std")[models]
+    order = mean.mean(axis=1).sort_values(ascending=False, kind="stable").index
+    if top is not None:
+        order = order[:top]
+
+    parts = ["## Permutation feature importance\n\n"]
+    parts.append(
+        f"Drop in test `{metric}` when one feature is shuffled (mean ± std over {repeats} "
+        "shuffles). Larger drops mean the model relies more on the feature; values near 0 "
+        "(or negative) mean it does not.\n\n"
+    )
+    parts.append("| Feature | " + " | ".join(models) + " |\n")
+    parts.append("|---|" + "---:|" * len(models) + "\n")
+    for feature in order:
+        cells = [f"{mean.at[feature, m]:+.3f} ± {std.at[feature, m]:.3f}" for m in models]
+        parts.append(f"| {feature} | " + " | ".join(cells) + " |\n")
+    baselines = df.drop_duplicates("model").set_index("model")["baseline"]
+    parts.append(
+        "\nBaseline " + ", ".join(f"`{m}` {metric} = {baselines[m]:.3f}" for m in models) + ".\n"
+    )
+    return "".join(parts)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Permutation feature importance per model.")
+    ap.add_argument("--input", default="data/processed/test.csv", help="Labeled CSV to score")
+    ap.add_argument(
+        "--model",
+        action="append",
+        metavar="NAME=PATH",
+        help="Model to explain (repeatable). Default: baseline, rf and hgb artifacts under models/.",
+    )
+    ap.add_argument("--metric", default="roc_auc", choices=SCORERS)
+    ap.add_argument("--threshold", type=float, default=0.5, help="For threshold metrics")
+    ap.add_argument("--repeats", type=int, default=10, help="Shuffles per feature")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=1, help="Processes for (feature, repeat) jobs")
+    ap.add_argument("--top", type=int, default=None, help="Features shown in the markdown")
+    ap.add_argument("--out-csv", default="reports/permutation_importance.csv")
+    ap.add_argument("--out-md", default="reports/permutation_importance.md")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    df = permutation_importance(
+        parse_model_specs(args.model),
+        Path(args.input),
+        metric=args.metric,
+        threshold=args.threshold,
+        repeats=args.repeats,
+        seed=args.seed,
+        workers=args.workers,
+    )
+    elapsed = time.perf_counter() - t0
+
+    for path, text in (
+        (Path(args.out_csv), df.to_csv(index=False)),
+        (Path(args.out_md), render_importance_md(df, top=args.top)),
+    ):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        print(f"Wrote: {path}")
+    n_jobs = df["feature"].nunique() * args.repeats
+    print(f"{n_jobs} (feature, repeat) jobs | workers={args.workers} | {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,11 @@ def pick_best_threshold(df: pd.DataFrame, metric: str = "f1") -> float:
     return float(best["threshold"])
 
 
+def format_threshold(thr: float) -> str:
+    # Grid thresholds print as before; exact cutpoints (sweep --exact) need every digit.
+    return f"{thr:.3f}" if round(thr, 3) == thr else repr(thr)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--csv", required=True, help="Path to threshold sweep CSV")
@@ -24,11 +29,10 @@ def main() -> None:
     args = parser.parse_args()
 
     csv_path = Path(args.csv)
-    df = pd.read_csv(csv_path)
+    df = pd.read_csv(csv_path, float_precision="round_trip")
 
     thr = pick_best_threshold(df, metric=args.metric)
-    # keep consistent formatting
-    print(f"{thr:.3f}")
+    print(format_threshold(thr))
 
 
 if __name__ == "__main__":
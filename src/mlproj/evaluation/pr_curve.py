@@ -4,7 +4,10 @@ import argparse
 from pathlib import Path
 
 import pandas as pd
-from sklearn.metrics import average_precision_score, precision_recall_curve
+
+from mlproj.data.columnar import read_table
+from mlproj.evaluation.curves import BinaryCurves
+from mlproj.inference.wide import select_model_columns
 
 
 def _align_input_and_preds(
@@ -30,11 +33,11 @@ def _align_input_and_preds(
 
 
 def compute_pr_curve(y_true: pd.Series, proba: pd.Series) -> tuple[pd.DataFrame, float]:
-    precision, recall, thresholds = precision_recall_curve(y_true, proba)
+    curves = BinaryCurves.from_scores(y_true, proba)
+    precision, recall, thresholds = curves.pr_curve()
     thr = list(thresholds) + [float("nan")]  # pad to same length as precision/recall
     df = pd.DataFrame({"precision": precision, "recall": recall, "threshold": thr})
-    ap = float(average_precision_score(y_true, proba))
-    return df, ap
+    return df, curves.average_precision()
 
 
 def render_pr_summary(ap: float) -> str:
@@ -47,10 +50,13 @@ def main() -> None:
     parser.add_argument("--preds", required=True)
     parser.add_argument("--out-csv", required=True)
     parser.add_argument("--out-md", required=True)
+    parser.add_argument("--model", default=None, help="Model column set in a wide predict_all CSV")
     args = parser.parse_args()
 
-    input_df = pd.read_csv(args.input)
+    input_df = read_table(args.input)
     preds_df = pd.read_csv(args.preds)
+    if args.model is not None:
+        preds_df = select_model_columns(preds_df, args.model)
 
     y_true, proba = _align_input_and_preds(input_df, preds_df)
     curve_df, ap_score = compute_pr_curve(y_true, proba)
@@ -0,0 +1,174 @@
+"""
+Constant-memory, mergeable metric accumulator for streamed predictions.
+
+`MetricAccumulator` keeps one int64 table, counts[label, pred, score bin],
+where score bins split [0, 1] into `bins` equal-width intervals. Updating it
+with a chunk of (label, pred, proba) is one bincount, so any number of rows
+is summarized in 4 * bins counters, and two accumulators over disjoint rows
+(file shards, workers) merge by adding their tables.
+
+From the table:
+
+- accuracy / precision / recall / F1 come from the summed confusion counts
+  and are exact (they only depend on `pred`);
+- ROC AUC and AP are computed as if scores within a bin were tied, i.e.
+  exactly what sklearn returns for the binned scores. The ordering inside a
+  bin is the only unknown, so bounds follow from its extreme cases: each
+  (positive, negative) pair sharing a bin moves the AUC by at most
+  1 / (2 P N), and AP lies between "negatives first" and "positives first"
+  within every bin (summed in closed form with harmonic numbers).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from mlproj.evaluation.metrics import metrics_from_counts
+
+DEFAULT_BINS = 1 << 16
+_EULER_GAMMA = 0.5772156649015329
+_SMALL = 32
+_HARMONIC = np.r_[0.0, np.cumsum(1.0 / np.arange(1, _SMALL + 1))]
+
+
+def _harmonic(x: np.ndarray) -> np.ndarray:
+    """H(x) = 1 + 1/2 + ... + 1/x for integer x >= 0 (asymptotic series from _SMALL on)."""
+    x = x.astype(np.float64)
+    small = x < _SMALL
+    big = np.where(small, _SMALL, x)
+    inv2 = 1.0 / (big * big)
+    series = (
+        np.log(big) + _EULER_GAMMA + 0.5 / big - inv2 * (1 / 12 - inv2 * (1 / 120 - inv2 / 252))
+    )
+    return np.where(small, _HARMONIC[np.where(small, x, 0).astype(np.int64)], series)
+
+
+def _harmonic_diff(a: np.ndarray, k: np.ndarray) -> np.ndarray:
+    """H(a + k) - H(a), without the cancellation of subtracting two large H values."""
+    a_f = a.astype(np.float64)
+    b_f = a_f + k
+    safe_a = np.maximum(a_f, 1.0)
+    inv_a2, inv_b2 = 1.0 / (safe_a * safe_a), 1.0 / (b_f * b_f + (b_f == 0))
+    asymptotic = (
+        np.log1p(k / safe_a)
+        + 0.5 * (1.0 / np.maximum(b_f, 1.0) - 1.0 / safe_a)
+        - (inv_b2 - inv_a2) / 12.0
+        + (inv_b2 * inv_b2 - inv_a2 * inv_a2) / 120.0
+    )
+    return np.where(a < _SMALL, _harmonic(a + k) - _harmonic(a), asymptotic)
+
+
+def _check_binary(name: str, values: np.ndarray) -> None:
+    if not np.all((values == 0) | (values == 1)):
+        raise ValueError(f"{name} must contain only 0/1 values")
+
+
+@dataclass
+class MetricAccumulator:
+    """Row counts by (label, pred, score bin); see the module docstring."""
+
+    counts: np.ndarray  # (2, 2, bins) int64: [label, pred, bin]
+    scored: bool  # False: predictions without probabilities (one dummy bin)
+
+    @classmethod
+    def empty(cls, bins: int = DEFAULT_BINS, *, scored: bool = True) -> MetricAccumulator:
+        if bins < 1:
+            raise ValueError("bins must be >= 1")
+        return cls(counts=np.zeros((2, 2, bins if scored else 1), dtype=np.int64), scored=scored)
+
+    @property
+    def bins(self) -> int:
+        return self.counts.shape[2]
+
+    @property
+    def n(self) -> int:
+        return int(self.counts.sum())
+
+    def update(self, y_true: Any, y_pred: Any, proba: Any = None) -> None:
+        """Add one chunk of aligned labels, predictions and (if scored) probabilities."""
+        y = np.asarray(y_true)
+        pred = np.asarray(y_pred)
+        if y.ndim != 1 or pred.shape != y.shape:
+            raise ValueError(
+                f"y_true and y_pred must be 1-D of equal length: {y.shape} vs {pred.shape}"
+            )
+        _check_binary("y_true", y)
+        _check_binary("y_pred", pred)
+        cell = (y.astype(np.int64) * 2 + pred.astype(np.int64)) * self.bins
+        if self.scored:
+            if proba is None:
+                raise ValueError("proba is required for a scored accumulator")
+            p = np.asarray(proba, dtype=np.float64)
+            if p.shape != y.shape:
+                raise ValueError(f"proba must align with y_true: {p.shape} vs {y.shape}")
+            if not np.all((p >= 0.0) & (p <= 1.0)):
+                raise ValueError("proba must lie in [0, 1] (and not be NaN)")
+            cell += np.minimum((p * self.bins).astype(np.int64), self.bins - 1)
+        self.counts += np.bincount(cell, minlength=self.counts.size).reshape(self.counts.shape)
+
+    def merge(self, other: MetricAccumulator) -> MetricAccumulator:
+        """Add `other` (disjoint rows, same binning) into this accumulator; returns self."""
+        if other.scored != self.scored or other.counts.shape != self.counts.shape:
+            raise ValueError("Can only merge accumulators with the same binning")
+        self.counts += other.counts
+        return self
+
+    def confusion(self) -> tuple[int, int, int, int]:
+        """(tp, fp, tn, fn) of the `pred` column."""
+        (tn, fp), (fn, tp) = self.counts.sum(axis=2).tolist()
+        return tp, fp, tn, fn
+
+    def cells(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Non-empty (label, pred, score bin, rows) cells, e.g. as bootstrap weights."""
+        label, pred, score_bin = np.nonzero(self.counts)
+        return label, pred, score_bin, self.counts[label, pred, score_bin]
+
+    def _by_bin(self) -> tuple[np.ndarray, np.ndarray]:
+        """Positives and negatives per bin, in decreasing score order."""
+        per_label = self.counts.sum(axis=1)[:, ::-1].astype(np.float64)
+        return per_label[1], per_label[0]
+
+    def roc_auc(self) -> tuple[float, float]:
+        """(AUC with scores tied within bins, max |error| vs the unbinned AUC)."""
+        pos, neg = self._by_bin()
+        pairs = pos.sum() * neg.sum()
+        if not self.scored or pairs == 0:
+            return float("nan"), float("nan")
+        tps = np.cumsum(pos)
+        auc = float((neg * (tps - 0.5 * pos)).sum() / pairs)
+        return auc, float((pos * neg).sum() / (2.0 * pairs))
+
+    def average_precision(self) -> tuple[float, float, float]:
+        """(AP with scores tied within bins, lower bound, upper bound) for the unbinned AP."""
+        pos, neg = self._by_bin()
+        n_pos = pos.sum()
+        if not self.scored or n_pos == 0:
+            return float("nan"), float("nan"), float("nan")
+        tps, fps = np.cumsum(pos), np.cumsum(neg)
+        ap = float((pos * tps / np.maximum(tps + fps, 1.0)).sum() / n_pos)
+        # Positives of a bin seen after A TP and B FP above it, plus 0..q of its own
+        # negatives: sum_j (A + j) / (A + B + f + j) = p - (B + f) * (H(A+B+f+p) - H(A+B+f)).
+        above = (tps - pos) + (fps - neg)
+        best = pos - (fps - neg) * _harmonic_diff(above, pos)
+        worst = pos - fps * _harmonic_diff(above + neg, pos)
+        return ap, float(worst.sum() / n_pos), float(best.sum() / n_pos)
+
+    def metrics(self) -> dict[str, float]:
+        """Exact threshold metrics, plus binned ROC AUC / AP when both classes are present."""
+        tp, fp, tn, fn = self.confusion()
+        metrics = metrics_from_counts(tp, fp, tn, fn)
+        if self.scored and 0 < tp + fn < tp + fp + tn + fn:
+            metrics["roc_auc"] = self.roc_auc()[0]
+            metrics["average_precision"] = self.average_precision()[0]
+        return metrics
+
+    def bounds(self) -> dict[str, list[float]]:
+        """[lo, hi] range of the unbinned ROC AUC and AP, given only the histogram."""
+        if not self.scored:
+            return {}
+        auc, err = self.roc_auc()
+        _, ap_lo, ap_hi = self.average_precision()
+        return {"roc_auc": [auc - err, auc + err], "average_precision": [ap_lo, ap_hi]}
@@ -1,17 +1,12 @@
 import argparse
 from pathlib import Path
-from typing import Any, cast
 
 import numpy as np
 import pandas as pd
-from sklearn.metrics import (
-    accuracy_score,
-    confusion_matrix,
-    f1_score,
-    precision_score,
-    recall_score,
-    roc_auc_score,
-)
+
+from mlproj.data.columnar import read_table
+from mlproj.evaluation.curves import BinaryCurves, pareto_downsample
+from mlproj.inference.wide import select_model_columns
 
 
 def _align_input_and_preds(
@@ -39,46 +34,18 @@ def sweep_thresholds(
     y_true: pd.Series, proba: pd.Series, t_min: float, t_max: float, t_step: float
 ) -> pd.DataFrame:
     thresholds = np.arange(t_min, t_max + 1e-12, t_step)
+    return BinaryCurves.from_scores(y_true, proba).sweep(thresholds)
 
-    # AUC does not depend on threshold (uses probabilities)
-    roc_auc = float(roc_auc_score(y_true, proba))
-
-    rows: list[dict[str, float | int]] = []
-    for t in thresholds:
-        pred = (proba >= float(t)).astype(int)
-
-        tn, fp, fn, tp = confusion_matrix(y_true, pred, labels=[0, 1]).ravel()
-
-        rows.append(
-            {
-                "threshold": float(t),
-                "accuracy": float(accuracy_score(y_true, pred)),
-                "precision": float(precision_score(y_true, pred, zero_division=cast(Any, 0))),
-                "recall": float(recall_score(y_true, pred, zero_division=cast(Any, 0))),
-                "f1": float(f1_score(y_true, pred, zero_division=cast(Any, 0))),
-                "roc_auc": roc_auc,
-                "tp": int(tp),
-                "fp": int(fp),
-                "tn": int(tn),
-                "fn": int(fn),
-            }
-        )
 
-    return pd.DataFrame(
-        rows,
-        columns=[
-            "threshold",
-            "accuracy",
-            "precision",
-            "recall",
-            "f1",
-            "roc_auc",
-            "tp",
-            "fp",
-            "tn",
-            "fn",
-        ],
-    )
+def sweep_exact(y_true: pd.Series, proba: pd.Series, max_points: int | None = None) -> pd.DataFrame:
+    """
+    Metrics at every distinct predicted probability, optionally thinned to the
+    Pareto-relevant cutpoints (see curves.pareto_downsample).
+    """
+    df = BinaryCurves.from_scores(y_true, proba).sweep_exact()
+    if max_points is not None:
+        df = pareto_downsample(df, max_points)
+    return df
 
 
 def main() -> None:
@@ -86,25 +53,47 @@ def main() -> None:
     ap.add_argument("--input", required=True, help="CSV with ground truth target.")
     ap.add_argument("--preds", required=True, help="Predictions CSV from inference.")
     ap.add_argument("--out", required=True, help="Output CSV path.")
+    ap.add_argument(
+        "--model", default=None, help="Model to sweep from a wide predict_all predictions CSV."
+    )
     ap.add_argument("--t-min", type=float, default=0.05)
     ap.add_argument("--t-max", type=float, default=0.95)
     ap.add_argument("--t-step", type=float, default=0.05)
+    ap.add_argument(
+        "--exact",
+        action="store_true",
+        help="Use every distinct predicted probability as a threshold (ignores --t-*).",
+    )
+    ap.add_argument(
+        "--max-points",
+        type=int,
+        default=None,
+        help="With --exact: keep at most this many rows, preferring Pareto-optimal cutpoints.",
+    )
     args = ap.parse_args()
+    if args.max_points is not None and not args.exact:
+        ap.error("--max-points requires --exact")
 
     input_path = Path(args.input)
     preds_path = Path(args.preds)
     out_path = Path(args.out)
 
-    input_df = pd.read_csv(input_path)
-    preds_df = pd.read_csv(preds_path)
+    input_df = read_table(input_path)
+    # Exact cutpoints are the probabilities themselves: parse them without rounding error.
+    preds_df = pd.read_csv(preds_path, float_precision="round_trip")
+    if args.model is not None:
+        preds_df = select_model_columns(preds_df, args.model)
 
     y_true, proba = _align_input_and_preds(input_df, preds_df)
-    df = sweep_thresholds(
-        y_true=y_true, proba=proba, t_min=args.t_min, t_max=args.t_max, t_step=args.t_step
-    )
+    if args.exact:
+        df = sweep_exact(y_true=y_true, proba=proba, max_points=args.max_points)
+    else:
+        df = sweep_thresholds(
+            y_true=y_true, proba=proba, t_min=args.t_min, t_max=args.t_max, t_step=args.t_step
+        )
+        df["threshold"] = df["threshold"].round(3)
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    df["threshold"] = df["threshold"].round(3)
     df.to_csv(out_path, index=False)
     best_f1 = df.sort_values(["f1", "threshold"], ascending=[False, True]).iloc[0]
     best_recall = df.sort_values(["recall", "threshold"], ascending=[False, True]).iloc[0]
@@ -40,6 +40,7 @@ def render_final_report(
     pr_baseline_md: str | None = None,
     pr_rf_md: str | None = None,
     pr_hgb_md: str | None = None,
+    importance_md: str | None = None,
 ) -> str:
     parts: list[str] = []
     parts.append("# Final report\n\nThis file aggregates the project outputs into one place.\n")
@@ -68,6 +69,10 @@ def render_final_report(
             )
         parts.append("\n".join(pr_parts).strip() + "\n")
 
+    # Already a "## Permutation feature importance" section (permutation_importance --out-md)
+    if importance_md is not None:
+        parts.append(importance_md.strip() + "\n")
+
     md = "\n\n".join(parts).strip() + "\n"
 
     # Normalize headings: remove accidental leading whitespace before markdown headings
@@ -91,6 +96,7 @@ def main() -> None:
     ap.add_argument("--pr-baseline-md", required=False)
     ap.add_argument("--pr-rf-md", required=False)
     ap.add_argument("--pr-hgb-md", required=False)
+    ap.add_argument("--importance-md", required=False)
     args = ap.parse_args()
 
     compare_md = Path(args.compare_report).read_text(encoding="utf-8")
@@ -105,6 +111,9 @@ def main() -> None:
     )
     pr_rf_md = Path(args.pr_rf_md).read_text(encoding="utf-8") if args.pr_rf_md else None
     pr_hgb_md = Path(args.pr_hgb_md).read_text(encoding="utf-8") if args.pr_hgb_md else None
+    importance_md = (
+        Path(args.importance_md).read_text(encoding="utf-8") if args.importance_md else None
+    )
 
     out = Path(args.out)
     out.parent.mkdir(parents=True, exist_ok=True)
@@ -119,6 +128,7 @@ def main() -> None:
             pr_baseline_md=pr_baseline_md,
             pr_rf_md=pr_rf_md,
             pr_hgb_md=pr_hgb_md,
+            importance_md=importance_md,
         ),
         encoding="utf-8",
     )
@@ -9,7 +9,7 @@ from typing import Any
 
 import pandas as pd
 
-from mlproj.evaluation.pick_best_threshold import pick_best_threshold
+from mlproj.evaluation.pick_best_threshold import format_threshold, pick_best_threshold
 
 
 def _best_row(df: pd.DataFrame, metric: str) -> dict[str, Any]:
@@ -28,7 +28,7 @@ def render_val_tuning_report(
     lines.append("# Val-tuned threshold report (baseline)")
     lines.append("")
     lines.append(f"**Optimized metric (on val):** `{metric}`")
-    lines.append(f"**Chosen threshold:** `{best_threshold:.3f}`")
+    lines.append(f"**Chosen threshold:** `{format_threshold(best_threshold)}`")
     lines.append("")
     lines.append("## Best row on val")
     lines.append("")
@@ -56,7 +56,7 @@ def main() -> None:
     ap.add_argument("--out", required=True)
     args = ap.parse_args()
 
-    df = pd.read_csv(Path(args.sweep_csv))
+    df = pd.read_csv(Path(args.sweep_csv), float_precision="round_trip")
     best_thr = float(Path(args.threshold_file).read_text(encoding="utf-8").strip())
     val_best = _best_row(df, args.metric)
 
@@ -0,0 +1,74 @@
+"""
+Single-file container for named NumPy arrays that can be memory-mapped.
+
+Layout: 8-byte magic, little-endian uint64 header length, UTF-8 JSON header
+({"meta": {...}, "arrays": {name: {"dtype", "shape", "offset"}}}), then each
+array's raw C-order bytes at a 64-byte aligned offset relative to the end of
+the header. Unlike `.npz`, the whole file can be memory-mapped once and every
+array viewed in place, without reading or copying it.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+MAGIC = b"MLPJARR1"
+_ALIGN = 64
+
+
+def _aligned(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def save_arrays(path: Path, arrays: dict[str, np.ndarray], meta: dict[str, Any]) -> None:
+    contiguous = {name: np.ascontiguousarray(a) for name, a in arrays.items()}
+
+    spec: dict[str, dict[str, Any]] = {}
+    pos = 0
+    for name, a in contiguous.items():
+        spec[name] = {"dtype": a.dtype.str, "shape": list(a.shape), "offset": pos}
+        pos += _aligned(a.nbytes)
+    header = json.dumps({"meta": meta, "arrays": spec}, sort_keys=True).encode("utf-8")
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for name, a in contiguous.items():
+            f.seek(data_start + spec[name]["offset"])
+            f.write(a.tobytes())
+        f.truncate(data_start + pos)
+
+
+def _read_header(path: Path) -> tuple[dict[str, Any], int]:
+    with path.open("rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not an mlproj array file: {path}")
+        (n,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(n).decode("utf-8"))
+    return header, _aligned(len(MAGIC) + 8 + n)
+
+
+def read_meta(path: Path) -> dict[str, Any]:
+    return _read_header(path)[0]["meta"]
+
+
+def load_arrays(path: Path, *, mmap: bool = True) -> tuple[dict[str, np.ndarray], dict[str, Any]]:
+    """Return ({name: array}, meta). With mmap=True arrays are read-only views of the file."""
+    header, data_start = _read_header(path)
+    buf = np.memmap(path, dtype=np.uint8, mode="r") if mmap else np.fromfile(path, dtype=np.uint8)
+    arrays: dict[str, np.ndarray] = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        start = data_start + spec["offset"]
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        arrays[name] = buf[start : start + nbytes].view(dtype).reshape(shape)
+    return arrays, header["meta"]
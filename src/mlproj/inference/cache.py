@@ -0,0 +1,345 @@
+"""
+Content-addressed prediction cache for repeated feature rows.
+
+Entries are keyed on (model artifact sha256, column names, row features).
+Rows are canonicalized (float64, -0.0 -> 0.0, one NaN bit pattern) so equal
+feature vectors always share a key. The column names are part of the key, so
+a frame whose columns are permuted or renamed misses, and the model sees it
+(and rejects it) instead of getting another layout's scores. Two tiers:
+
+- memory: a bounded LRU of {row bytes: proba} for one model;
+- disk (optional): a SQLite table keyed on (model sha256, 16-byte BLAKE2b of
+  the row), evicting least recently used entries once the live data exceeds
+  a size bound. It persists across runs and is shared between models.
+
+`PredictionCache.score` looks every row up, scores only the distinct rows
+that missed both tiers, stores them, and keeps hit / miss / timing counters
+from which the time saved is estimated.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+DISK_FILENAME = "predictions.sqlite"
+DEFAULT_ENTRIES = 100_000
+DEFAULT_MAX_MB = 256.0
+# SQLite's default host-parameter limit is 999 on older builds.
+_SQL_BATCH = 400
+
+
+def artifact_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def row_keys(x: np.ndarray, columns: list[str] | None = None) -> list[bytes]:
+    """
+    One bytes key per row of a 2-D feature matrix (canonical float64 encoding),
+    prefixed with a digest of `columns` when given.
+    """
+    arr = np.asarray(x, dtype=np.float64) + 0.0  # -0.0 + 0.0 == +0.0
+    arr = np.ascontiguousarray(np.where(np.isnan(arr), np.nan, arr))
+    if arr.ndim != 2:
+        raise ValueError("Expected a 2-D feature matrix")
+    rows = arr.view(np.dtype((np.void, arr.shape[1] * arr.itemsize))).reshape(-1)
+    if columns is None:
+        return rows.tolist()
+    prefix = hashlib.blake2b("\0".join(columns).encode(), digest_size=8).digest()
+    return [prefix + row for row in rows.tolist()]
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    scored_rows: int = 0
+    score_seconds: float = 0.0
+    lookup_seconds: float = 0.0
+    # Per-row scoring cost measured by earlier runs (disk tier), for runs that score nothing.
+    prior_seconds_per_row: float | None = None
+
+    @property
+    def seconds_per_row(self) -> float | None:
+        if self.scored_rows:
+            return self.score_seconds / self.scored_rows
+        return self.prior_seconds_per_row
+
+    @property
+    def lookups(self) -> int:
+        return self.memory_hits + self.disk_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.memory_hits + self.disk_hits) / self.lookups if self.lookups else 0.0
+
+    @property
+    def saved_seconds(self) -> float:
+        """Hits x measured per-row scoring cost, minus the time spent on cache lookups."""
+        per_row = self.seconds_per_row or 0.0
+        return (self.memory_hits + self.disk_hits) * per_row - self.lookup_seconds
+
+    def summary(self) -> str:
+        return (
+            f"Cache: hit_rate={self.hit_rate:.1%} (memory={self.memory_hits} "
+            f"disk={self.disk_hits} miss={self.misses}) | scored={self.scored_rows} rows "
+            f"in {self.score_seconds:.3f}s | est. saved={self.saved_seconds:.3f}s"
+        )
+
+
+class DiskTier:
+    """SQLite-backed {(model sha256, row digest): proba} store with LRU size-based eviction."""
+
+    def __init__(self, path: Path, *, max_bytes: int) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS predictions ("
+            " model TEXT NOT NULL, row BLOB NOT NULL, proba REAL NOT NULL, used INTEGER NOT NULL,"
+            " PRIMARY KEY (model, row)) WITHOUT ROWID"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS predictions_used ON predictions (used)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS models (model TEXT PRIMARY KEY, seconds_per_row REAL)"
+        )
+        self._db.commit()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def live_bytes(self) -> int:
+        (page_size,) = self._db.execute("PRAGMA page_size").fetchone()
+        (pages,) = self._db.execute("PRAGMA page_count").fetchone()
+        (free,) = self._db.execute("PRAGMA freelist_count").fetchone()
+        return (pages - free) * page_size
+
+    def get_cost(self, model: str) -> float | None:
+        row = self._db.execute(
+            "SELECT seconds_per_row FROM models WHERE model = ?", (model,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def put_cost(self, model: str, seconds_per_row: float) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO models (model, seconds_per_row) VALUES (?, ?)",
+            (model, seconds_per_row),
+        )
+        self._db.commit()
+
+    def get_many(self, model: str, digests: list[bytes]) -> dict[bytes, float]:
+        found: dict[bytes, float] = {}
+        for i in range(0, len(digests), _SQL_BATCH):
+            part = digests[i : i + _SQL_BATCH]
+            marks = ",".join("?" * len(part))
+            rows = self._db.execute(
+                f"SELECT row, proba FROM predictions WHERE model = ? AND row IN ({marks})",
+                [model, *part],
+            ).fetchall()
+            found.update(rows)
+        if found:
+            now = time.time_ns()
+            self._db.executemany(
+                "UPDATE predictions SET used = ? WHERE model = ? AND row = ?",
+                [(now, model, d) for d in found],
+            )
+            self._db.commit()
+        return found
+
+    def put_many(self, model: str, items: list[tuple[bytes, float]]) -> None:
+        now = time.time_ns()
+        self._db.executemany(
+            "INSERT OR REPLACE INTO predictions (model, row, proba, used) VALUES (?, ?, ?, ?)",
+            [(model, d, p, now) for d, p in items],
+        )
+        self._db.commit()
+        self._evict()
+
+    def _evict(self) -> None:
+        while self.live_bytes() > self.max_bytes:
+            (n,) = self._db.execute("SELECT COUNT(*) FROM predictions").fetchone()
+            if n == 0:
+                return
+            # Drop the least recently used quarter, then re-measure. A batch shares one `used`
+            # value, so the delete is bounded by count, not by a `used` cutoff.
+            self._db.execute(
+                "DELETE FROM predictions WHERE (model, row) IN "
+                "(SELECT model, row FROM predictions ORDER BY used LIMIT ?)",
+                (max(1, n // 4),),
+            )
+            self._db.commit()
+
+
+class PredictionCache:
+    """Two-tier cache of one model's P(class 1) per feature row."""
+
+    def __init__(
+        self,
+        model_sha256: str,
+        *,
+        max_entries: int = DEFAULT_ENTRIES,
+        disk: DiskTier | None = None,
+    ) -> None:
+        if max_entries < 0:
+            raise ValueError("max_entries must be >= 0")
+        self.model_sha256 = model_sha256
+        self.max_entries = max_entries
+        self.disk = disk
+        self.stats = CacheStats()
+        if disk is not None:
+            self.stats.prior_seconds_per_row = disk.get_cost(model_sha256)
+        self._memory: OrderedDict[bytes, float] = OrderedDict()
+
+    def close(self) -> None:
+        if self.disk is None:
+            return
+        if self.stats.scored_rows:
+            self.disk.put_cost(self.model_sha256, self.stats.score_seconds / self.stats.scored_rows)
+        self.disk.close()
+
+    def _remember(self, key: bytes, proba: float) -> None:
+        if self.max_entries == 0:
+            return
+        self._memory[key] = proba
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def score(
+        self,
+        x: np.ndarray,
+        score_rows: Callable[[np.ndarray], Any],
+        columns: list[str] | None = None,
+    ) -> np.ndarray:
+        """
+        P(class 1) for every row of `x` (the matrix the model sees, with `columns`).
+
+        `score_rows(idx)` must score rows `idx` of this batch; it is called at
+        most once, with the first occurrence of every distinct missed row.
+        """
+        t0 = time.perf_counter()
+        keys = row_keys(x, columns)
+        out = np.empty(len(keys), dtype=np.float64)
+
+        pending: dict[bytes, list[int]] = {}
+        for i, key in enumerate(keys):
+            proba = self._memory.get(key)
+            if proba is None:
+                pending.setdefault(key, []).append(i)
+            else:
+                self._memory.move_to_end(key)
+                out[i] = proba
+                self.stats.memory_hits += 1
+
+        if pending and self.disk is not None:
+            digests = {hashlib.blake2b(k, digest_size=16).digest(): k for k in pending}
+            for digest, proba in self.disk.get_many(self.model_sha256, list(digests)).items():
+                key = digests[digest]
+                idx = pending.pop(key)
+                out[idx] = proba
+                self.stats.disk_hits += len(idx)
+                self._remember(key, proba)
+        self.stats.lookup_seconds += time.perf_counter() - t0
+
+        if not pending:
+            return out
+
+        first = np.fromiter((idx[0] for idx in pending.values()), dtype=np.int64)
+        t1 = time.perf_counter()
+        scored = np.asarray(score_rows(first), dtype=np.float64)
+        self.stats.score_seconds += time.perf_counter() - t1
+        self.stats.scored_rows += len(first)
+
+        t2 = time.perf_counter()
+        new: list[tuple[bytes, float]] = []
+        for (key, idx), proba in zip(pending.items(), scored.tolist(), strict=True):
+            out[idx] = proba
+            self.stats.misses += len(idx)
+            self._remember(key, proba)
+            new.append((hashlib.blake2b(key, digest_size=16).digest(), proba))
+        if self.disk is not None:
+            self.disk.put_many(self.model_sha256, new)
+        self.stats.lookup_seconds += time.perf_counter() - t2
+        return out
+
+    def wrap(self, score_frame: Callable[[Any], Any]) -> Callable[[Any], np.ndarray]:
+        """Cache a DataFrame -> proba scorer; keys come from the frame's columns and values."""
+
+        def cached(frame: Any) -> np.ndarray:
+            return self.score(
+                frame.to_numpy(dtype=np.float64),
+                lambda idx: score_frame(frame.iloc[idx]),
+                [str(c) for c in frame.columns],
+            )
+
+        return cached
+
+
+def add_cache_args(ap: Any) -> None:
+    ap.add_argument(
+        "--cache",
+        action="store_true",
+        help="Enable the in-memory prediction cache (implied by the other --cache-* options)",
+    )
+    ap.add_argument(
+        "--cache-entries",
+        type=int,
+        default=None,
+        help=f"In-memory LRU size of the prediction cache (default: {DEFAULT_ENTRIES})",
+    )
+    ap.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Also persist the prediction cache in this directory (SQLite tier)",
+    )
+    ap.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=None,
+        help=f"Size bound of the on-disk prediction cache (default: {DEFAULT_MAX_MB:g})",
+    )
+
+
+def cache_options(args: Any) -> list[str]:
+    """The --cache* options given on the command line."""
+    given = {
+        "--cache": args.cache,
+        "--cache-entries": args.cache_entries is not None,
+        "--cache-dir": args.cache_dir is not None,
+        "--cache-max-mb": args.cache_max_mb is not None,
+    }
+    return [flag for flag, on in given.items() if on]
+
+
+def check_cache_args(ap: Any, args: Any, *, workers: int = 1) -> None:
+    """Reject cache options that would be ignored (ap.error exits)."""
+    options = cache_options(args)
+    if workers > 1 and options:
+        ap.error(f"{', '.join(options)} not supported with --workers")
+    if args.cache_max_mb is not None and args.cache_dir is None:
+        ap.error("--cache-max-mb requires --cache-dir")
+
+
+def cache_from_args(args: Any, model_path: Path) -> PredictionCache | None:
+    """Memory-only cache for --cache / --cache-entries; --cache-dir adds the disk tier."""
+    if not cache_options(args):
+        return None
+    disk = None
+    if args.cache_dir is not None:
+        max_mb = DEFAULT_MAX_MB if args.cache_max_mb is None else args.cache_max_mb
+        disk = DiskTier(Path(args.cache_dir) / DISK_FILENAME, max_bytes=int(max_mb * 2**20))
+    entries = DEFAULT_ENTRIES if args.cache_entries is None else args.cache_entries
+    return PredictionCache(artifact_sha256(model_path), max_entries=entries, disk=disk)
@@ -0,0 +1,189 @@
+"""
+Post-hoc probability calibration, fitted on val predictions and applied without sklearn.
+
+- isotonic: the breakpoints of sklearn's IsotonicRegression (increasing,
+  clipped to [0, 1]) are stored as arrays `x` and `y`. Applying them is a
+  binary search plus linear interpolation per row (np.interp), which is
+  exactly IsotonicRegression.predict.
+- platt: q = sigmoid(a * logit(p) + b), fitted by Newton's method on the
+  log-loss with Platt's smoothed targets. Only (a, b) are stored. The
+  closed form, evaluated as 1 / (1 + e^-b ((1 - p) / p)^a), is exact and
+  faster than interpolating a tabulated curve. p is clipped to
+  [_EPS, 1 - _EPS].
+
+Artifacts are `arrayfile` containers (`.calib`).
+
+Usage:
+  python -m mlproj.inference.calibrator --input data/processed/val.csv \\
+      --preds reports/predictions_val.csv --method isotonic --out models/baseline_isotonic.calib
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from mlproj.inference.arrayfile import load_arrays, save_arrays
+
+KIND = "calibrator"
+FORMAT_VERSION = 1
+METHODS = ("isotonic", "platt")
+
+_EPS = 1e-12
+
+
+@dataclass(frozen=True)
+class Calibrator:
+    method: str
+    x: np.ndarray  # isotonic: increasing breakpoints in [0, 1] (platt: empty)
+    y: np.ndarray  # isotonic: calibrated probability at each breakpoint (platt: empty)
+    a: float = 1.0  # platt: slope on logit(p)
+    b: float = 0.0  # platt: intercept
+    n_fit: int = 0
+
+    def apply(self, proba: Any) -> np.ndarray:
+        """Calibrated probabilities for an array of P(class 1) scores."""
+        p = np.asarray(proba, dtype=np.float64)
+        if self.method == "isotonic":
+            return np.interp(p, self.x, self.y)
+        p = np.clip(p, _EPS, 1.0 - _EPS)
+        with np.errstate(over="ignore"):  # inf odds -> probability 0
+            return 1.0 / (1.0 + np.exp(-self.b) * ((1.0 - p) / p) ** self.a)
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return np.exp(-np.logaddexp(0.0, -z))
+
+
+def _logit(p: np.ndarray) -> np.ndarray:
+    p = np.clip(p, _EPS, 1.0 - _EPS)
+    return np.log(p) - np.log1p(-p)
+
+
+def _check(y_true: Any, proba: Any) -> tuple[np.ndarray, np.ndarray]:
+    y = np.asarray(y_true)
+    p = np.asarray(proba, dtype=np.float64)
+    if y.ndim != 1 or p.shape != y.shape or len(y) == 0:
+        raise ValueError(
+            f"y_true and proba must be non-empty 1-D of equal length: {y.shape} vs {p.shape}"
+        )
+    if not np.all((y == 0) | (y == 1)):
+        raise ValueError("y_true must contain only 0/1 values")
+    if not np.all((p >= 0.0) & (p <= 1.0)):
+        raise ValueError("proba must lie in [0, 1] (and not be NaN)")
+    return y.astype(np.float64), p
+
+
+def fit_platt_params(y_true: Any, proba: Any, *, max_iter: int = 100) -> tuple[float, float]:
+    """(a, b) of q = sigmoid(a * logit(p) + b) minimizing log-loss on Platt's targets."""
+    y, p = _check(y_true, proba)
+    f = _logit(p)
+    n_pos = y.sum()
+    n_neg = len(y) - n_pos
+    target = np.where(y == 1.0, (n_pos + 1.0) / (n_pos + 2.0), 1.0 / (n_neg + 2.0))
+
+    def loss(a: float, b: float) -> float:
+        z = a * f + b
+        return float((np.logaddexp(0.0, z) - target * z).sum())
+
+    a, b = 1.0, 0.0  # identity: already calibrated log-odds
+    current = loss(a, b)
+    for _ in range(max_iter):
+        q = _sigmoid(a * f + b)
+        r, w = q - target, q * (1.0 - q)
+        grad = np.array([(r * f).sum(), r.sum()])
+        hess = np.array([[(w * f * f).sum(), (w * f).sum()], [(w * f).sum(), w.sum()]])
+        step = np.linalg.solve(hess + 1e-12 * np.eye(2), grad)
+        scale, new = 1.0, current
+        while scale > 1e-10:  # backtrack until the loss does not increase
+            new = loss(a - scale * step[0], b - scale * step[1])
+            if new <= current:
+                break
+            scale /= 2.0
+        a, b, current = a - scale * step[0], b - scale * step[1], new
+        if np.abs(scale * step).max() < 1e-10:
+            break
+    return float(a), float(b)
+
+
+def fit_calibrator(y_true: Any, proba: Any, method: str = "isotonic") -> Calibrator:
+    """Fit a Calibrator of `method` (METHODS) on labeled P(class 1) scores."""
+    y, p = _check(y_true, proba)
+    empty = np.empty(0, dtype=np.float64)
+    if method == "isotonic":
+        from sklearn.isotonic import IsotonicRegression
+
+        iso = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds="clip").fit(p, y)
+        x = np.asarray(iso.X_thresholds_, dtype=np.float64)
+        values = np.asarray(iso.y_thresholds_, dtype=np.float64)
+        return Calibrator(method=method, x=x, y=values, n_fit=len(y))
+    if method == "platt":
+        a, b = fit_platt_params(y, p)
+        return Calibrator(method=method, x=empty, y=empty, a=a, b=b, n_fit=len(y))
+    raise ValueError(f"Unknown calibration method {method!r} (choose from {METHODS})")
+
+
+def save_calibrator(cal: Calibrator, path: Path) -> None:
+    save_arrays(
+        path,
+        {"x": cal.x, "y": cal.y},
+        {
+            "kind": KIND,
+            "format_version": FORMAT_VERSION,
+            "method": cal.method,
+            "a": cal.a,
+            "b": cal.b,
+            "n_fit": cal.n_fit,
+        },
+    )
+
+
+def load_calibrator(path: Path) -> Calibrator:
+    arrays, meta = load_arrays(path, mmap=False)
+    if meta.get("kind") != KIND or meta.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Not a calibrator (v{FORMAT_VERSION}): {path}")
+    return Calibrator(
+        method=str(meta["method"]),
+        x=arrays["x"],
+        y=arrays["y"],
+        a=float(meta["a"]),
+        b=float(meta["b"]),
+        n_fit=int(meta["n_fit"]),
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Fit a post-hoc calibrator on val predictions.")
+    ap.add_argument("--input", required=True, help="Labeled CSV the predictions were made on")
+    ap.add_argument(
+        "--preds", required=True, help="Predictions CSV (proba_disease), in input order"
+    )
+    ap.add_argument("--method", default="isotonic", choices=METHODS)
+    ap.add_argument("--out", required=True, help="Output .calib artifact")
+    args = ap.parse_args()
+
+    import pandas as pd
+
+    from mlproj.data.columnar import read_table
+
+    y = read_table(args.input, columns=["target"])["target"].to_numpy()
+    proba = pd.read_csv(args.preds, usecols=["proba_disease"])["proba_disease"].to_numpy()
+    if len(y) != len(proba):
+        raise ValueError(f"Row mismatch: input rows={len(y)} preds rows={len(proba)}")
+
+    cal = fit_calibrator(y, proba, args.method)
+    out = Path(args.out)
+    save_calibrator(cal, out)
+    print(f"Fitted {cal.method} calibrator on {len(y)} rows: {args.preds}")
+    if cal.method == "platt":
+        print(f"Wrote calibrator: {out} | a={cal.a:.4f} b={cal.b:.4f}")
+    else:
+        print(f"Wrote calibrator: {out} | breakpoints={len(cal.x)}")
+
+
+if __name__ == "__main__":
+    main()
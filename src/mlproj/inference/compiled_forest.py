@@ -0,0 +1,222 @@
+"""
+Compile a fitted RandomForestClassifier into flat, memory-mappable node arrays.
+
+Every tree's nodes are packed into shared contiguous arrays (feature,
+threshold, missing-go-left, interleaved left/right children, leaf value) with
+global child indices. Leaves point to themselves, so a batch is scored by
+stepping all trees forward `max_depth` times with vectorized NumPy gathers. The arrays are
+stored in one `arrayfile` container (`.trees`) that loads by memory-mapping
+instead of unpickling hundreds of tree objects.
+
+Probabilities are bit-identical to `predict_proba` with trees summed in order
+(n_jobs=1): inputs are compared as float32 like sklearn's tree code, leaf
+values are normalized the same way and tree outputs are added in tree order.
+
+Usage:
+  python -m mlproj.inference.compiled_forest --model models/rf.joblib --out models/rf.trees
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from mlproj.inference.arrayfile import load_arrays, save_arrays
+
+KIND = "random_forest"
+FORMAT_VERSION = 1
+# (trees x rows) cells per traversal block: small enough that the per-level
+# temporaries stay in cache.
+_BLOCK_CELLS = 1 << 16
+
+
+def traverse_trees(
+    x: np.ndarray,
+    *,
+    feature: np.ndarray,
+    threshold: np.ndarray,
+    missing_left: np.ndarray,
+    children: np.ndarray,
+    roots: np.ndarray,
+    depth: int,
+) -> np.ndarray:
+    """
+    Return the (n_trees, n_rows) leaf index reached by every row in every tree.
+
+    `children[2 * i]` / `children[2 * i + 1]` are node i's left / right child.
+    Leaves must point to themselves so extra steps are no-ops. Rows go left
+    when `x <= threshold`; NaN goes left iff `missing_left`.
+    """
+    n_rows, n_features = x.shape
+    flat = x.reshape(-1)
+    row_base = (np.arange(n_rows, dtype=np.int64) * n_features)[None, :]
+    node = np.repeat(roots.astype(np.int64)[:, None], n_rows, axis=1)
+    has_nan = bool(np.isnan(flat).any())
+    for _ in range(depth):
+        xv = flat[row_base + feature[node]]
+        go_right = xv > threshold[node]
+        if has_nan:
+            go_right = np.where(np.isnan(xv), ~missing_left[node], go_right)
+        node = children[2 * node + go_right]
+    return node
+
+
+@dataclass(frozen=True)
+class CompiledForest:
+    feature_names: tuple[str, ...]
+    feature: np.ndarray
+    threshold: np.ndarray
+    missing_left: np.ndarray
+    children: np.ndarray
+    value: np.ndarray
+    roots: np.ndarray
+    max_depth: int
+
+    @property
+    def feature_names_in_(self) -> np.ndarray:
+        return np.asarray(self.feature_names, dtype=object)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def proba(self, x: Any) -> np.ndarray:
+        """P(class 1) for an (n, n_features) array-like in `feature_names` order."""
+        # sklearn trees compare float32 inputs against float64 thresholds.
+        arr = np.ascontiguousarray(x, dtype=np.float32)
+        if arr.ndim == 1:
+            arr = arr.reshape(1, -1)
+        if arr.shape[1] != len(self.feature_names):
+            raise ValueError(f"Expected {len(self.feature_names)} features, got {arr.shape[1]}")
+
+        out = np.empty(len(arr), dtype=np.float64)
+        block = max(1, _BLOCK_CELLS // max(1, self.n_trees))
+        for start in range(0, len(arr), block):
+            leaves = traverse_trees(
+                arr[start : start + block],
+                feature=self.feature,
+                threshold=self.threshold,
+                missing_left=self.missing_left,
+                children=self.children,
+                roots=self.roots,
+                depth=self.max_depth,
+            )
+            leaf_value = self.value[leaves]
+            acc = np.zeros(leaves.shape[1], dtype=np.float64)
+            for t in range(self.n_trees):
+                acc += leaf_value[t]
+            out[start : start + block] = acc / self.n_trees
+        return out
+
+    def predict_proba(self, x: Any) -> np.ndarray:
+        p = self.proba(x)
+        return np.column_stack([1.0 - p, p])
+
+
+def compile_forest(clf: Any) -> CompiledForest:
+    """Pack a fitted binary RandomForestClassifier into a CompiledForest."""
+    estimators = getattr(clf, "estimators_", None)
+    if not estimators:
+        raise ValueError("Expected a fitted RandomForestClassifier")
+    if len(clf.classes_) != 2:
+        raise ValueError("Only binary classifiers can be compiled")
+
+    features, thresholds, missing, children, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for est in estimators:
+        tree = est.tree_
+        n = tree.node_count
+        idx = np.arange(offset, offset + n, dtype=np.int64)
+        is_leaf = tree.children_left == -1
+
+        # Same normalization as DecisionTreeClassifier.predict_proba.
+        v = np.asarray(tree.value[:, 0, :], dtype=np.float64)
+        norm = v.sum(axis=1)
+        norm[norm == 0.0] = 1.0
+
+        features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+        thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+        missing.append(
+            np.asarray(getattr(tree, "missing_go_to_left", np.zeros(n)), dtype=bool) & ~is_leaf
+        )
+        pairs = np.empty((n, 2), dtype=np.int32)
+        pairs[:, 0] = np.where(is_leaf, idx, tree.children_left + offset)
+        pairs[:, 1] = np.where(is_leaf, idx, tree.children_right + offset)
+        children.append(pairs.reshape(-1))
+        values.append(v[:, 1] / norm)
+        roots.append(offset)
+        max_depth = max(max_depth, int(tree.max_depth))
+        offset += n
+
+    names = getattr(clf, "feature_names_in_", None)
+    if names is None:
+        names = [f"x{i}" for i in range(clf.n_features_in_)]
+    return CompiledForest(
+        feature_names=tuple(str(c) for c in names),
+        feature=np.concatenate(features),
+        threshold=np.concatenate(thresholds).astype(np.float64),
+        missing_left=np.concatenate(missing),
+        children=np.concatenate(children),
+        value=np.concatenate(values),
+        roots=np.asarray(roots, dtype=np.int32),
+        max_depth=max_depth,
+    )
+
+
+def save_compiled_forest(model: CompiledForest, path: Path) -> None:
+    save_arrays(
+        path,
+        {
+            "feature": model.feature,
+            "threshold": model.threshold,
+            "missing_left": model.missing_left,
+            "children": model.children,
+            "value": model.value,
+            "roots": model.roots,
+        },
+        {
+            "kind": KIND,
+            "format_version": FORMAT_VERSION,
+            "feature_names": list(model.feature_names),
+            "max_depth": model.max_depth,
+        },
+    )
+
+
+def load_compiled_forest(path: Path, *, mmap: bool = True) -> CompiledForest:
+    arrays, meta = load_arrays(path, mmap=mmap)
+    if meta.get("kind") != KIND or meta.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Not a compiled random forest (v{FORMAT_VERSION}): {path}")
+    return CompiledForest(
+        feature_names=tuple(meta["feature_names"]),
+        max_depth=int(meta["max_depth"]),
+        **arrays,
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Compile a RandomForest joblib into a .trees file.")
+    ap.add_argument("--model", default="models/rf.joblib")
+    ap.add_argument("--out", default="models/rf.trees")
+    args = ap.parse_args()
+
+    import joblib
+
+    compiled = compile_forest(joblib.load(args.model))
+    out = Path(args.out)
+    save_compiled_forest(compiled, out)
+
+    print(f"Loaded model: {args.model}")
+    print(
+        f"Wrote compiled forest: {out} | trees={compiled.n_trees} "
+        f"nodes={len(compiled.feature)} max_depth={compiled.max_depth}"
+    )
+
+
+if __name__ == "__main__":
+    main()
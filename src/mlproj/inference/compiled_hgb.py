@@ -0,0 +1,328 @@
+"""
+Compile a fitted HistGradientBoostingClassifier into flat arrays for fast loading.
+
+The export holds, in one memory-mappable `arrayfile` container (`.trees`):
+
+- every iteration's predictor as flat node arrays in the `compiled_forest`
+  layout (feature / numeric threshold / missing-go-left / interleaved
+  children / leaf value, leaves pointing to themselves);
+- each feature's training bin edges, so raw values map to the same uint8
+  bin codes sklearn bins with;
+- a precomputed lookup over (feature, bin code): for every tree, the bitmask
+  of leaves still reachable given that one feature's bin. AND-ing the masks
+  of a row's features leaves the exit leaf as the lowest set bit (leaves are
+  numbered left to right), so a row is scored with one gather per feature
+  instead of one per tree level.
+
+`decision_function` scores raw features through the bin lookup by default;
+`method="nodes"` walks the node arrays with numeric thresholds instead. Both
+reach the same leaves and sum leaf values in iteration order on top of the
+baseline, so raw scores are bit-identical to sklearn's. The sigmoid is
+NumPy's rather than scipy's `expit` (keeping scipy out of the cold start),
+so probabilities can differ from `predict_proba` by one ulp.
+
+Numeric features only: models with categorical features are rejected.
+
+Usage:
+  python -m mlproj.inference.compiled_hgb --model models/hgb.joblib --out models/hgb.trees
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+
+from mlproj.inference.arrayfile import load_arrays, save_arrays
+from mlproj.inference.compiled_forest import traverse_trees
+
+KIND = "hist_gradient_boosting"
+FORMAT_VERSION = 1
+N_CODES = 256
+# (trees x rows) cells per scoring block: keeps the per-block mask and leaf
+# value temporaries in cache.
+_BLOCK_CELLS = 1 << 17
+_MASK_DTYPES = (np.uint8, np.uint16, np.uint32, np.uint64)
+
+
+@dataclass(frozen=True)
+class CompiledHGB:
+    feature_names: tuple[str, ...]
+    feature: np.ndarray
+    threshold: np.ndarray
+    missing_left: np.ndarray
+    children: np.ndarray
+    value: np.ndarray
+    roots: np.ndarray
+    bin_edges: np.ndarray
+    bin_offsets: np.ndarray
+    leaf_masks: np.ndarray
+    leaf_values: np.ndarray
+    baseline: float
+    missing_bin: int
+    max_depth: int
+
+    @property
+    def feature_names_in_(self) -> np.ndarray:
+        return np.asarray(self.feature_names, dtype=object)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def _check(self, x: Any) -> np.ndarray:
+        arr = np.ascontiguousarray(x, dtype=np.float64)
+        if arr.ndim == 1:
+            arr = arr.reshape(1, -1)
+        if arr.shape[1] != len(self.feature_names):
+            raise ValueError(f"Expected {len(self.feature_names)} features, got {arr.shape[1]}")
+        return arr
+
+    def bin_features(self, x: Any) -> np.ndarray:
+        """Map raw features to the uint8 bin codes used at training time (NaN -> missing_bin)."""
+        arr = self._check(x)
+        out = np.empty(arr.shape, dtype=np.uint8)
+        for j in range(arr.shape[1]):
+            edges = self.bin_edges[self.bin_offsets[j] : self.bin_offsets[j + 1]]
+            col = arr[:, j]
+            codes = np.searchsorted(edges, col, side="left")
+            out[:, j] = np.where(np.isnan(col), self.missing_bin, codes)
+        return out
+
+    def _lookup(self, codes: np.ndarray) -> np.ndarray:
+        n_trees, max_leaves = self.leaf_values.shape
+        flat_values = self.leaf_values.reshape(-1)
+        tree_base = np.arange(n_trees, dtype=np.int64) * max_leaves
+        one = self.leaf_masks.dtype.type(1)
+
+        out = np.empty(len(codes), dtype=np.float64)
+        block = max(1, _BLOCK_CELLS // max(1, n_trees))
+        for start in range(0, len(codes), block):
+            rows = codes[start : start + block]
+            reachable = self.leaf_masks[0][rows[:, 0]]
+            for j in range(1, rows.shape[1]):
+                reachable &= self.leaf_masks[j][rows[:, j]]
+            # Lowest set bit -> its index (exact: powers of two are exact in float32).
+            lowest = reachable & (~reachable + one)
+            leaf = np.frexp(lowest.astype(np.float32))[1] - 1
+            # Column 0 holds the baseline; cumsum adds trees sequentially, in order.
+            terms = np.empty((len(rows), n_trees + 1), dtype=np.float64)
+            terms[:, 0] = self.baseline
+            terms[:, 1:] = flat_values[tree_base + leaf]
+            out[start : start + block] = np.cumsum(terms, axis=1)[:, -1]
+        return out
+
+    def _walk_nodes(self, arr: np.ndarray) -> np.ndarray:
+        out = np.empty(len(arr), dtype=np.float64)
+        block = max(1, (_BLOCK_CELLS >> 1) // max(1, self.n_trees))
+        for start in range(0, len(arr), block):
+            leaves = traverse_trees(
+                arr[start : start + block],
+                feature=self.feature,
+                threshold=self.threshold,
+                missing_left=self.missing_left,
+                children=self.children,
+                roots=self.roots,
+                depth=self.max_depth,
+            )
+            leaf_value = self.value[leaves]
+            acc = np.full(leaves.shape[1], self.baseline, dtype=np.float64)
+            for t in range(self.n_trees):
+                acc += leaf_value[t]
+            out[start : start + block] = acc
+        return out
+
+    def decision_function(
+        self, x: Any, *, method: Literal["lookup", "nodes"] = "lookup"
+    ) -> np.ndarray:
+        """Raw (log-odds) scores for an (n, n_features) array-like in `feature_names` order."""
+        if method == "nodes" or self.leaf_masks.size == 0:
+            return self._walk_nodes(self._check(x))
+        if method != "lookup":
+            raise ValueError(f"Unknown method: {method!r}")
+        return self._lookup(self.bin_features(x))
+
+    def proba(self, x: Any) -> np.ndarray:
+        """P(class 1) for an (n, n_features) array-like in `feature_names` order."""
+        return 1.0 / (1.0 + np.exp(-self.decision_function(x)))
+
+    def predict_proba(self, x: Any) -> np.ndarray:
+        p = self.proba(x)
+        return np.column_stack([1.0 - p, p])
+
+
+def _number_leaves(tree: np.ndarray) -> tuple[dict[int, int], dict[int, int]]:
+    """Number a predictor's leaves left to right; return ({leaf: k}, {split: left-subtree mask})."""
+    preorder: list[int] = []
+    stack = [0]
+    while stack:
+        i = stack.pop()
+        preorder.append(i)
+        if not tree["is_leaf"][i]:
+            stack.extend([int(tree["right"][i]), int(tree["left"][i])])
+
+    leaf_index = {i: k for k, i in enumerate(i for i in preorder if tree["is_leaf"][i])}
+    subtree: dict[int, int] = {}
+    left_leaves: dict[int, int] = {}
+    # Children follow their parent in preorder, so reversing it visits them first.
+    for i in reversed(preorder):
+        if tree["is_leaf"][i]:
+            subtree[i] = 1 << leaf_index[i]
+        else:
+            left_leaves[i] = subtree[int(tree["left"][i])]
+            subtree[i] = left_leaves[i] | subtree[int(tree["right"][i])]
+    return leaf_index, left_leaves
+
+
+def _leaf_tables(
+    nodes: list[np.ndarray], n_features: int, missing_bin: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Build the (n_features, N_CODES, n_trees) reachable-leaf masks and (n_trees, max_leaves) values.
+
+    Returns empty tables when a tree has more leaves than the widest mask holds.
+    """
+    n_leaves = [int(n["is_leaf"].sum()) for n in nodes]
+    max_leaves = max(n_leaves)
+    dtype = next((d for d in _MASK_DTYPES if np.iinfo(d).bits >= max_leaves), None)
+    if dtype is None:
+        return np.zeros((0, N_CODES, 0), dtype=np.uint64), np.zeros((0, 0), dtype=np.float64)
+
+    all_leaves = np.iinfo(dtype).max
+    masks = np.full((n_features, N_CODES, len(nodes)), all_leaves, dtype=dtype)
+    values = np.zeros((len(nodes), max_leaves), dtype=np.float64)
+    codes = np.arange(N_CODES)
+    for t, tree in enumerate(nodes):
+        leaf_index, left_leaves = _number_leaves(tree)
+        for i, k in leaf_index.items():
+            values[t, k] = tree["value"][i]
+        for i, left in left_leaves.items():
+            go_right = codes > int(tree["bin_threshold"][i])
+            go_right[missing_bin] = not tree["missing_go_to_left"][i]
+            # Going right makes every leaf of the left subtree unreachable.
+            masks[int(tree["feature_idx"][i]), go_right, t] &= dtype(all_leaves & ~left)
+    return masks, values
+
+
+def compile_hgb(clf: Any) -> CompiledHGB:
+    """Pack a fitted binary HistGradientBoostingClassifier into a CompiledHGB."""
+    predictors = getattr(clf, "_predictors", None)
+    if not predictors:
+        raise ValueError("Expected a fitted HistGradientBoostingClassifier")
+    if clf.n_trees_per_iteration_ != 1:
+        raise ValueError("Only binary classifiers can be compiled")
+    if clf.is_categorical_ is not None and np.any(clf.is_categorical_):
+        raise ValueError("Models with categorical features cannot be compiled")
+
+    tree_nodes = [p.nodes for (p,) in predictors]
+    features, thresholds, missing, children, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for nodes in tree_nodes:
+        n = len(nodes)
+        idx = np.arange(offset, offset + n, dtype=np.int64)
+        is_leaf = nodes["is_leaf"].astype(bool)
+
+        features.append(np.where(is_leaf, 0, nodes["feature_idx"]).astype(np.int32))
+        thresholds.append(np.where(is_leaf, 0.0, nodes["num_threshold"]))
+        missing.append(nodes["missing_go_to_left"].astype(bool) & ~is_leaf)
+        pairs = np.empty((n, 2), dtype=np.int32)
+        pairs[:, 0] = np.where(is_leaf, idx, nodes["left"].astype(np.int64) + offset)
+        pairs[:, 1] = np.where(is_leaf, idx, nodes["right"].astype(np.int64) + offset)
+        children.append(pairs.reshape(-1))
+        values.append(np.where(is_leaf, nodes["value"], 0.0))
+        roots.append(offset)
+        max_depth = max(max_depth, int(nodes["depth"].max()))
+        offset += n
+
+    mapper = clf._bin_mapper
+    missing_bin = int(mapper.missing_values_bin_idx_)
+    edges = [np.asarray(e, dtype=np.float64) for e in mapper.bin_thresholds_]
+    leaf_masks, leaf_values = _leaf_tables(tree_nodes, len(edges), missing_bin)
+    names = getattr(clf, "feature_names_in_", None)
+    if names is None:
+        names = [f"x{i}" for i in range(clf.n_features_in_)]
+    return CompiledHGB(
+        feature_names=tuple(str(c) for c in names),
+        feature=np.concatenate(features),
+        threshold=np.concatenate(thresholds).astype(np.float64),
+        missing_left=np.concatenate(missing),
+        children=np.concatenate(children),
+        value=np.concatenate(values).astype(np.float64),
+        roots=np.asarray(roots, dtype=np.int32),
+        bin_edges=np.concatenate(edges),
+        bin_offsets=np.cumsum([0] + [len(e) for e in edges]).astype(np.int64),
+        leaf_masks=leaf_masks,
+        leaf_values=leaf_values,
+        baseline=float(np.asarray(clf._baseline_prediction).reshape(-1)[0]),
+        missing_bin=missing_bin,
+        max_depth=max_depth,
+    )
+
+
+def save_compiled_hgb(model: CompiledHGB, path: Path) -> None:
+    save_arrays(
+        path,
+        {
+            "feature": model.feature,
+            "threshold": model.threshold,
+            "missing_left": model.missing_left,
+            "children": model.children,
+            "value": model.value,
+            "roots": model.roots,
+            "bin_edges": model.bin_edges,
+            "bin_offsets": model.bin_offsets,
+            "leaf_masks": model.leaf_masks,
+            "leaf_values": model.leaf_values,
+        },
+        {
+            "kind": KIND,
+            "format_version": FORMAT_VERSION,
+            "feature_names": list(model.feature_names),
+            # JSON floats round-trip exactly (shortest repr).
+            "baseline": model.baseline,
+            "missing_bin": model.missing_bin,
+            "max_depth": model.max_depth,
+        },
+    )
+
+
+def load_compiled_hgb(path: Path, *, mmap: bool = True) -> CompiledHGB:
+    arrays, meta = load_arrays(path, mmap=mmap)
+    if meta.get("kind") != KIND or meta.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Not a compiled HistGradientBoosting model (v{FORMAT_VERSION}): {path}")
+    return CompiledHGB(
+        feature_names=tuple(meta["feature_names"]),
+        baseline=float(meta["baseline"]),
+        missing_bin=int(meta["missing_bin"]),
+        max_depth=int(meta["max_depth"]),
+        **arrays,
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(
+        description="Compile a HistGradientBoosting joblib into a .trees file."
+    )
+    ap.add_argument("--model", default="models/hgb.joblib")
+    ap.add_argument("--out", default="models/hgb.trees")
+    args = ap.parse_args()
+
+    import joblib
+
+    compiled = compile_hgb(joblib.load(args.model))
+    out = Path(args.out)
+    save_compiled_hgb(compiled, out)
+
+    print(f"Loaded model: {args.model}")
+    print(
+        f"Wrote compiled HGB: {out} | trees={compiled.n_trees} "
+        f"nodes={len(compiled.feature)} max_depth={compiled.max_depth}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Compile the baseline logistic pipeline into a NumPy-only scorer.
+
+`train_baseline.build_pipeline` is ColumnTransformer -> SimpleImputer(median)
+-> StandardScaler -> LogisticRegression. At inference time that is a NaN fill,
+an affine transform and a sigmoid, so the imputer medians, scaler mean/scale
+and coefficients fold into one weight vector and bias:
+
+    z = fill_nan(x, medians) @ (coef / scale) + (intercept - mean @ (coef / scale))
+
+The folded model is stored as a small `.npz` and scored with NumPy alone (this
+module must not import sklearn at module level). `CompiledLinearModel` exposes
+`feature_names_in_` and `predict_proba`, so it drops into `predict_baseline`.
+
+Usage:
+  python -m mlproj.inference.compiled_linear --model models/baseline_logreg.joblib \
+      --out models/baseline_logreg.npz
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class CompiledLinearModel:
+    feature_names: tuple[str, ...]
+    fill: np.ndarray
+    weights: np.ndarray
+    bias: float
+
+    @property
+    def feature_names_in_(self) -> np.ndarray:
+        return np.asarray(self.feature_names, dtype=object)
+
+    def proba(self, x: Any) -> np.ndarray:
+        """P(class 1) for an (n, n_features) array-like in `feature_names` order."""
+        arr = np.asarray(x, dtype=np.float64)
+        if arr.ndim == 1:
+            arr = arr.reshape(1, -1)
+        if arr.shape[1] != len(self.feature_names):
+            raise ValueError(f"Expected {len(self.feature_names)} features, got {arr.shape[1]}")
+        mask = np.isnan(arr)
+        if mask.any():
+            arr = np.where(mask, self.fill, arr)
+        z = arr @ self.weights + self.bias
+        # sigmoid(z) = exp(-log(1 + exp(-z))), without overflow for large |z|.
+        return np.exp(-np.logaddexp(0.0, -z))
+
+    def predict_proba(self, x: Any) -> np.ndarray:
+        p = self.proba(x)
+        return np.column_stack([1.0 - p, p])
+
+
+def compile_pipeline(pipe: Any) -> CompiledLinearModel:
+    """Fold a fitted `train_baseline.build_pipeline` pipeline into a CompiledLinearModel."""
+    try:
+        pre = pipe.named_steps["pre"]
+        clf = pipe.named_steps["clf"]
+    except (AttributeError, KeyError) as e:
+        raise ValueError("Expected a Pipeline with 'pre' and 'clf' steps") from e
+
+    fitted = [t for t in pre.transformers_ if t[0] != "remainder"]
+    if len(fitted) != 1 or pre.remainder != "drop":
+        raise ValueError("Expected a single numeric ColumnTransformer branch with remainder='drop'")
+    _, num, columns = fitted[0]
+    imputer = num.named_steps["imputer"]
+    scaler = num.named_steps["scaler"]
+
+    if imputer.strategy != "median" or imputer.add_indicator:
+        raise ValueError("Only a median SimpleImputer without indicators can be compiled")
+    coef = np.asarray(clf.coef_, dtype=np.float64)
+    if coef.shape[0] != 1:
+        raise ValueError("Only binary LogisticRegression can be compiled")
+
+    fill = np.asarray(imputer.statistics_, dtype=np.float64)
+    if np.isnan(fill).any():
+        raise ValueError("Imputer has all-NaN training columns; cannot compile")
+
+    n = len(columns)
+    mean = np.asarray(scaler.mean_, dtype=np.float64) if scaler.with_mean else np.zeros(n)
+    scale = np.asarray(scaler.scale_, dtype=np.float64) if scaler.with_std else np.ones(n)
+
+    weights = coef[0] / scale
+    bias = float(np.asarray(clf.intercept_, dtype=np.float64)[0] - mean @ weights)
+    return CompiledLinearModel(
+        feature_names=tuple(str(c) for c in columns),
+        fill=fill,
+        weights=weights,
+        bias=bias,
+    )
+
+
+def save_compiled_linear(model: CompiledLinearModel, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as f:
+        np.savez(
+            f,
+            format_version=np.int64(FORMAT_VERSION),
+            feature_names=np.asarray(model.feature_names, dtype=str),
+            fill=model.fill,
+            weights=model.weights,
+            bias=np.float64(model.bias),
+        )
+
+
+def load_compiled_linear(path: Path) -> CompiledLinearModel:
+    with np.load(path, allow_pickle=False) as z:
+        version = int(z["format_version"])
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled model version {version} in {path}")
+        names: Sequence[object] = z["feature_names"].tolist()
+        return CompiledLinearModel(
+            feature_names=tuple(str(n) for n in names),
+            fill=z["fill"],
+            weights=z["weights"],
+            bias=float(z["bias"]),
+        )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Compile the baseline pipeline to a NumPy .npz.")
+    ap.add_argument("--model", default="models/baseline_logreg.joblib")
+    ap.add_argument("--out", default="models/baseline_logreg.npz")
+    args = ap.parse_args()
+
+    import joblib
+
+    compiled = compile_pipeline(joblib.load(args.model))
+    out = Path(args.out)
+    save_compiled_linear(compiled, out)
+
+    print(f"Loaded model: {args.model}")
+    print(f"Wrote compiled model: {out} | features={len(compiled.feature_names)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Score every registered model against one parsed input and write one wide file.
+
+The input CSV is parsed once into one feature frame that every model scores
+(optionally in parallel threads; sklearn's tree and linear kernels release
+the GIL). Output columns are `row_id`, then `proba_<model>` and
+`pred_<model>` for every model, in registry order. Probabilities match the
+per-model predictors' `proba_disease` exactly.
+
+Downstream CLIs (eval_predictions, sweep_thresholds, pr_curve) read one
+model out of the wide file with `--model <model>`.
+
+Usage:
+  python -m mlproj.inference.predict_all --input data/processed/val.csv \
+      --out reports/predictions_all_val.csv [--model NAME=PATH ...] [--threads 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from mlproj.data.columnar import read_table
+from mlproj.inference.registry import load_models, parse_model_specs
+from mlproj.inference.wide import pred_col, proba_col
+
+
+def score_all(
+    models: dict[str, Any], df: pd.DataFrame, *, threads: int = 1
+) -> dict[str, np.ndarray]:
+    """
+    P(class 1) per model over one parsed input.
+
+    The feature frame is built once; models with the same `feature_names_in_`
+    share one column selection of it.
+    """
+    features = df.drop(columns=["target"]) if "target" in df.columns else df
+    views: dict[tuple[str, ...], pd.DataFrame] = {}
+    inputs: dict[str, pd.DataFrame] = {}
+    for name, model in models.items():
+        names = getattr(model, "feature_names_in_", None)
+        if names is None:
+            inputs[name] = features
+            continue
+        key = tuple(str(c) for c in names)
+        if key not in views:
+            missing = [c for c in key if c not in features.columns]
+            if missing:
+                raise ValueError(f"Missing required feature columns: {missing}")
+            views[key] = features[list(key)]
+        inputs[name] = views[key]
+
+    def score(name: str) -> np.ndarray:
+        return np.asarray(models[name].predict_proba(inputs[name]))[:, 1]
+
+    if threads <= 1:
+        return {name: score(name) for name in models}
+    with ThreadPoolExecutor(max_workers=threads) as ex:
+        return dict(zip(models, ex.map(score, models), strict=True))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Score all models on one input into a wide CSV.")
+    ap.add_argument("--input", required=True, help="CSV with features (may include target column)")
+    ap.add_argument("--out", required=True, help="Output wide predictions CSV")
+    ap.add_argument(
+        "--model",
+        action="append",
+        metavar="NAME=PATH",
+        help="Model to score (repeatable). Default: baseline, rf and hgb artifacts under models/.",
+    )
+    ap.add_argument("--threshold", type=float, default=0.5, help="Decision threshold for pred_*")
+    ap.add_argument("--threads", type=int, default=1, help="Score models in parallel threads")
+    args = ap.parse_args()
+
+    paths = parse_model_specs(args.model)
+    models = load_models(paths)
+    df = read_table(args.input)
+    probas = score_all(models, df, threads=args.threads)
+
+    columns: dict[str, Any] = {"row_id": np.arange(len(df), dtype=int)}
+    for name, proba in probas.items():
+        columns[proba_col(name)] = proba
+        columns[pred_col(name)] = (proba >= args.threshold).astype(int)
+    out_path = Path(args.out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(columns).to_csv(out_path, index=False)
+
+    for name, p in paths.items():
+        print(f"Loaded model: {name} <- {p}")
+    print(f"Input: {args.input} | rows={len(df)} | models={len(models)}")
+    print(f"Wrote predictions: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,15 @@ from collections.abc import Sequence
 from pathlib import Path
 from typing import cast
 
-import joblib
+import numpy as np
 import pandas as pd
 
+from mlproj.data.columnar import read_table
+from mlproj.inference.cache import add_cache_args, cache_from_args, check_cache_args
+from mlproj.inference.calibrator import load_calibrator
+from mlproj.inference.registry import load_model
+from mlproj.inference.streaming import stream_predictions
+
 
 def _expected_features(model: object) -> list[str] | None:
     feats = getattr(model, "feature_names_in_", None)
@@ -38,36 +44,88 @@ def prepare_features(model: object, df: pd.DataFrame) -> pd.DataFrame:
 
 def main() -> None:
     ap = argparse.ArgumentParser(description="Run baseline model inference on a CSV.")
-    ap.add_argument("--model", default="models/baseline_logreg.joblib")
+    ap.add_argument(
+        "--model",
+        default="models/baseline_logreg.joblib",
+        help="joblib pipeline, or a .npz from mlproj.inference.compiled_linear",
+    )
     ap.add_argument("--input", default="data/processed/test.csv")
     ap.add_argument("--out", default="reports/predictions_baseline.csv")
     ap.add_argument("--threshold", type=float, default=0.5)
+    ap.add_argument(
+        "--chunksize",
+        type=int,
+        default=0,
+        help="Stream the input in chunks of this many rows (0 = load the whole file)",
+    )
+    ap.add_argument(
+        "--calibrator",
+        default=None,
+        help="Post-hoc calibrator (.calib from mlproj.inference.calibrator) applied to the scores",
+    )
+    add_cache_args(ap)
     args = ap.parse_args()
+    check_cache_args(ap, args)
 
     model_path = Path(args.model)
-    model = joblib.load(model_path)
-
-    df = pd.read_csv(args.input)
-    x = prepare_features(model, df)
-
-    proba = model.predict_proba(x)[:, 1]
-    pred = (proba >= args.threshold).astype(int)
-
-    out = pd.DataFrame(
-        {
-            "row_id": x.index.astype(int),
-            "proba_disease": proba,
-            "pred": pred,
-        }
-    )
-
-    out_path = Path(args.out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out.to_csv(out_path, index=False)
-
-    print(f"Loaded model: {model_path}")
-    print(f"Input: {args.input} | rows={len(x)}")
-    print(f"Wrote predictions: {out_path}")
+    model = load_model(model_path)
+    cache = cache_from_args(args, model_path)
+    try:
+        calibrator = load_calibrator(Path(args.calibrator)) if args.calibrator else None
+
+        def score(x: pd.DataFrame) -> np.ndarray:
+            return np.asarray(model.predict_proba(x))[:, 1]
+
+        # The cache holds raw model scores; calibration is applied on top.
+        score_raw = cache.wrap(score) if cache is not None else score
+
+        def score_frame(x: pd.DataFrame) -> np.ndarray:
+            proba = score_raw(x)
+            return proba if calibrator is None else calibrator.apply(proba)
+
+        if args.chunksize > 0:
+            out_path = Path(args.out)
+            n_rows = stream_predictions(
+                Path(args.input),
+                out_path,
+                score=lambda chunk: score_frame(prepare_features(model, chunk)),
+                threshold=args.threshold,
+                chunksize=args.chunksize,
+                with_row_id=True,
+            )
+            print(f"Loaded model: {model_path}")
+            print(f"Input: {args.input} | rows={n_rows} | chunksize={args.chunksize}")
+            print(f"Wrote predictions: {out_path}")
+            if cache is not None:
+                print(cache.stats.summary())
+            return
+
+        df = read_table(args.input)
+        x = prepare_features(model, df)
+
+        proba = score_frame(x)
+        pred = (proba >= args.threshold).astype(int)
+
+        out = pd.DataFrame(
+            {
+                "row_id": x.index.astype(int),
+                "proba_disease": proba,
+                "pred": pred,
+            }
+        )
+
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out.to_csv(out_path, index=False)
+
+        print(f"Loaded model: {model_path}")
+        print(f"Input: {args.input} | rows={len(x)}")
+        print(f"Wrote predictions: {out_path}")
+        if cache is not None:
+            print(cache.stats.summary())
+    finally:
+        if cache is not None:
+            cache.close()
 
 
 if __name__ == "__main__":
@@ -3,34 +3,122 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
-import joblib
+import numpy as np
 import pandas as pd
 
+from mlproj.data.columnar import read_table
+from mlproj.inference.cache import add_cache_args, cache_from_args, check_cache_args
+from mlproj.inference.calibrator import load_calibrator
+from mlproj.inference.sharded import load_ordered_model, predict_sharded
+from mlproj.inference.streaming import stream_predictions
+
+
+def _features(df: pd.DataFrame) -> pd.DataFrame:
+    return df.drop(columns=["target"]) if "target" in df.columns else df
+
 
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", required=True, help="CSV with features (may include target column)")
     ap.add_argument("--out", required=True, help="Output predictions CSV")
-    ap.add_argument("--model", default="models/hgb.joblib", help="Path to HGB model joblib")
+    ap.add_argument(
+        "--model", default="models/hgb.joblib", help="Path to HGB model joblib (or compiled .trees)"
+    )
     ap.add_argument(
         "--threshold", type=float, default=0.5, help="Decision threshold (default: 0.5)"
     )
+    ap.add_argument(
+        "--chunksize",
+        type=int,
+        default=0,
+        help="Stream the input in chunks of this many rows (0 = load the whole file)",
+    )
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Score byte-range shards of the input in this many processes (default: 1)",
+    )
+    ap.add_argument(
+        "--calibrator",
+        default=None,
+        help="Post-hoc calibrator (.calib from mlproj.inference.calibrator) applied to the scores",
+    )
+    add_cache_args(ap)
     args = ap.parse_args()
+    if args.workers > 1 and args.chunksize > 0:
+        ap.error("--workers and --chunksize are mutually exclusive")
+    check_cache_args(ap, args, workers=args.workers)
+
+    if args.workers > 1:
+        n_rows = predict_sharded(
+            Path(args.input),
+            Path(args.out),
+            model_path=Path(args.model),
+            threshold=args.threshold,
+            workers=args.workers,
+            calibrator_path=Path(args.calibrator) if args.calibrator else None,
+        )
+        print(f"Loaded model: {args.model}")
+        print(f"Input: {args.input} | rows={n_rows} | workers={args.workers}")
+        print(f"Wrote predictions: {args.out}")
+        return
+
+    from threadpoolctl import threadpool_limits
+
+    # Score like a shard worker (one thread, trees summed in order), so the output
+    # is byte-identical with and without --workers.
+    clf = load_ordered_model(Path(args.model))
+    cache = cache_from_args(args, Path(args.model))
+    limits = threadpool_limits(limits=1)
+    try:
+        calibrator = load_calibrator(Path(args.calibrator)) if args.calibrator else None
+
+        def score(x: pd.DataFrame) -> np.ndarray:
+            return np.asarray(clf.predict_proba(x))[:, 1]
+
+        # The cache holds raw model scores; calibration is applied on top.
+        score_raw = cache.wrap(score) if cache is not None else score
+
+        def score_frame(x: pd.DataFrame) -> np.ndarray:
+            proba = score_raw(x)
+            return proba if calibrator is None else calibrator.apply(proba)
+
+        if args.chunksize > 0:
+            n_rows = stream_predictions(
+                Path(args.input),
+                Path(args.out),
+                score=lambda chunk: score_frame(_features(chunk)),
+                threshold=args.threshold,
+                chunksize=args.chunksize,
+                with_row_id=False,
+            )
+            print(f"Loaded model: {args.model}")
+            print(f"Input: {args.input} | rows={n_rows} | chunksize={args.chunksize}")
+            print(f"Wrote predictions: {args.out}")
+            if cache is not None:
+                print(cache.stats.summary())
+            return
 
-    df = pd.read_csv(Path(args.input))
-    x = df.drop(columns=["target"]) if "target" in df.columns else df
+        df = read_table(args.input)
+        x = _features(df)
 
-    clf = joblib.load(Path(args.model))
-    prob = [float(p[1]) for p in clf.predict_proba(x)]
-    pred = [1 if p >= args.threshold else 0 for p in prob]
+        prob = score_frame(x)
+        pred = (prob >= args.threshold).astype(int)
 
-    out_df = pd.DataFrame({"proba_disease": prob, "pred": pred})
-    Path(args.out).parent.mkdir(parents=True, exist_ok=True)
-    out_df.to_csv(Path(args.out), index=False)
+        out_df = pd.DataFrame({"proba_disease": prob, "pred": pred})
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        out_df.to_csv(Path(args.out), index=False)
 
-    print(f"Loaded model: {args.model}")
-    print(f"Input: {args.input} | rows={len(df)}")
-    print(f"Wrote predictions: {args.out}")
+        print(f"Loaded model: {args.model}")
+        print(f"Input: {args.input} | rows={len(df)}")
+        print(f"Wrote predictions: {args.out}")
+        if cache is not None:
+            print(cache.stats.summary())
+    finally:
+        limits.restore_original_limits()
+        if cache is not None:
+            cache.close()
 
 
 if __name__ == "__main__":
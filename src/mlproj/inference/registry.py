@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from mlproj.inference.arrayfile import read_meta
+from mlproj.inference.compiled_forest import compile_forest, load_compiled_forest
+from mlproj.inference.compiled_hgb import KIND as HGB_KIND
+from mlproj.inference.compiled_hgb import compile_hgb, load_compiled_hgb
+from mlproj.inference.compiled_linear import compile_pipeline, load_compiled_linear
+
+# Artifacts written by the Make targets (train-baseline / train-rf / train-hgb).
+DEFAULT_MODELS: dict[str, Path] = {
+    "baseline": Path("models/baseline_logreg.joblib"),
+    "rf": Path("models/rf.joblib"),
+    "hgb": Path("models/hgb.joblib"),
+}
+
+
+def parse_model_specs(specs: list[str] | None) -> dict[str, Path]:
+    """
+    Parse `name=path` CLI specs into an ordered {name: path} mapping.
+
+    No specs means "use DEFAULT_MODELS".
+    """
+    if not specs:
+        return dict(DEFAULT_MODELS)
+
+    out: dict[str, Path] = {}
+    for spec in specs:
+        name, sep, path = spec.partition("=")
+        if not sep or not name or not path:
+            raise ValueError(f"Expected model spec of the form name=path, got: {spec!r}")
+        if name in out:
+            raise ValueError(f"Duplicate model name: {name}")
+        out[name] = Path(path)
+    return out
+
+
+def load_model(path: Path) -> Any:
+    """Load a joblib artifact, or a compiled NumPy model by its file suffix."""
+    if path.suffix == ".npz":
+        return load_compiled_linear(path)
+    if path.suffix == ".trees":
+        if read_meta(path).get("kind") == HGB_KIND:
+            return load_compiled_hgb(path)
+        return load_compiled_forest(path)
+    # joblib (and, on unpickling, sklearn) is only needed for non-compiled artifacts.
+    import joblib
+
+    return joblib.load(path)
+
+
+# Estimator class name -> compiler (by name, so sklearn is never imported here).
+_COMPILERS = {
+    "Pipeline": compile_pipeline,
+    "RandomForestClassifier": compile_forest,
+    "HistGradientBoostingClassifier": compile_hgb,
+}
+
+
+def compile_model(model: Any) -> Any | None:
+    """
+    Return the NumPy-only equivalent of a fitted sklearn model, or None if it has none.
+
+    Compiled models (anything with `proba`) are returned unchanged.
+    """
+    if hasattr(model, "proba"):
+        return model
+    compiler = _COMPILERS.get(type(model).__name__)
+    if compiler is None:
+        return None
+    try:
+        return compiler(model)
+    except (ValueError, KeyError):  # KeyError: a pipeline step the compiler expects is missing
+        return None
+
+
+def load_models(paths: dict[str, Path]) -> dict[str, Any]:
+    missing = [str(p) for p in paths.values() if not p.exists()]
+    if missing:
+        raise SystemExit(f"Missing model artifact(s): {missing}. Train the models first.")
+    return {name: load_model(p) for name, p in paths.items()}
@@ -0,0 +1,280 @@
+"""
+Local HTTP scoring service with resident models and request micro-batching.
+
+Every model artifact is loaded once at startup. Concurrent requests for the
+same model are gathered into small batches (up to --max-batch records, waiting
+at most --max-wait-ms for stragglers) and scored with one `RecordScorer` call
+(no DataFrame; sklearn models are compiled to their NumPy form at startup).
+
+Endpoints:
+  POST /predict/<model>   {"record": {...}} or {"records": [{...}, ...]}, optional "threshold"
+  GET  /stats             per-model p50/p99 latency, throughput and mean batch size
+  GET  /health
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import numpy as np
+
+from mlproj.inference.records import RecordScorer
+from mlproj.inference.registry import load_models, parse_model_specs
+
+
+class LatencyStats:
+    """Thread-safe request latency / throughput counters over a bounded window."""
+
+    def __init__(self, window: int = 10_000) -> None:
+        self._lock = threading.Lock()
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._first: float | None = None
+        self._last: float | None = None
+        self.requests = 0
+        self.records = 0
+        self.batches = 0
+        self.batched_records = 0
+
+    def record_request(self, latency_s: float, n_records: int) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            self._latencies.append(latency_s)
+            self.requests += 1
+            self.records += n_records
+            if self._first is None:
+                self._first = now - latency_s
+            self._last = now
+
+    def record_batch(self, n_records: int) -> None:
+        with self._lock:
+            self.batches += 1
+            self.batched_records += n_records
+
+    def snapshot(self) -> dict[str, float | int]:
+        with self._lock:
+            lat = np.fromiter(self._latencies, dtype=float)
+            elapsed = (self._last - self._first) if self._first is not None and self._last else 0.0
+            out: dict[str, float | int] = {
+                "requests": self.requests,
+                "records": self.records,
+                "batches": self.batches,
+                "mean_batch_size": self.batched_records / self.batches if self.batches else 0.0,
+                "p50_ms": float(np.percentile(lat, 50) * 1e3) if lat.size else 0.0,
+                "p99_ms": float(np.percentile(lat, 99) * 1e3) if lat.size else 0.0,
+                "throughput_rps": self.requests / elapsed if elapsed > 0 else 0.0,
+            }
+        return out
+
+
+@dataclass
+class _Job:
+    records: list[dict[str, Any]]
+    future: Future[np.ndarray] = field(default_factory=Future)
+
+
+class MicroBatcher:
+    """Gather concurrent scoring jobs for one model into batched scoring calls."""
+
+    def __init__(self, model: Any, *, max_batch: int = 64, max_wait_ms: float = 2.0) -> None:
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1")
+        self.model = model
+        self.scorer = RecordScorer(model)
+        self.max_batch = max_batch
+        self.max_wait_s = max_wait_ms / 1e3
+        self.stats = LatencyStats()
+        self._queue: queue.Queue[_Job | None] = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, records: list[dict[str, Any]]) -> Future[np.ndarray]:
+        job = _Job(records)
+        self._queue.put(job)
+        return job.future
+
+    def score(self, records: list[dict[str, Any]]) -> np.ndarray:
+        t0 = time.perf_counter()
+        proba = self.submit(records).result()
+        self.stats.record_request(time.perf_counter() - t0, len(records))
+        return proba
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            batch = [job]
+            n = len(job.records)
+            deadline = time.perf_counter() + self.max_wait_s
+            stop = False
+            while n < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    nxt = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+                n += len(nxt.records)
+            self._score_batch(batch)
+            if stop:
+                return
+
+    def _predict(self, records: list[dict[str, Any]]) -> np.ndarray:
+        return self.scorer.score(records)
+
+    def _score_batch(self, batch: list[_Job]) -> None:
+        records = [r for job in batch for r in job.records]
+        try:
+            proba = self._predict(records)
+        except Exception:
+            # One malformed request must not fail its batch-mates: retry individually.
+            for job in batch:
+                try:
+                    job.future.set_result(self._predict(job.records))
+                except Exception as e:
+                    job.future.set_exception(e)
+                self.stats.record_batch(len(job.records))
+            return
+
+        self.stats.record_batch(len(records))
+        start = 0
+        for job in batch:
+            stop = start + len(job.records)
+            job.future.set_result(proba[start:stop])
+            start = stop
+
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        models: Mapping[str, Any],
+        *,
+        max_batch: int = 64,
+        max_wait_ms: float = 2.0,
+    ) -> None:
+        self.batchers = {
+            name: MicroBatcher(model, max_batch=max_batch, max_wait_ms=max_wait_ms)
+            for name, model in models.items()
+        }
+        super().__init__(address, _Handler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        for b in self.batchers.values():
+            b.close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: ScoringServer  # pyright: ignore[reportIncompatibleVariableOverride]
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        # Per-request access logs would dominate output under load.
+        return
+
+    def _send_json(self, status: int, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "models": list(self.server.batchers)})
+        elif self.path == "/stats":
+            stats = {name: b.stats.snapshot() for name, b in self.server.batchers.items()}
+            self._send_json(200, stats)
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self) -> None:
+        prefix = "/predict/"
+        if not self.path.startswith(prefix):
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        name = self.path[len(prefix) :]
+        batcher = self.server.batchers.get(name)
+        if batcher is None:
+            self._send_json(404, {"error": f"Unknown model: {name}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("Body must be a JSON object")
+            single = "record" in payload
+            records = [payload["record"]] if single else payload.get("records")
+            if not isinstance(records, list) or not records:
+                raise ValueError('Body must contain "record" (object) or "records" (list)')
+            threshold = float(payload.get("threshold", 0.5))
+            proba = batcher.score(records)
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        pred = (proba >= threshold).astype(int)
+        if single:
+            out = {"model": name, "proba_disease": float(proba[0]), "pred": int(pred[0])}
+        else:
+            out = {"model": name, "proba_disease": proba.tolist(), "pred": pred.tolist()}
+        self._send_json(200, out)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Serve resident models over HTTP with micro-batching.")
+    ap.add_argument(
+        "--model",
+        action="append",
+        metavar="NAME=PATH",
+        help="Model to serve (repeatable). Default: baseline, rf and hgb artifacts under models/.",
+    )
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--max-batch", type=int, default=64)
+    ap.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = ap.parse_args()
+
+    paths = parse_model_specs(args.model)
+    models = load_models(paths)
+
+    server = ScoringServer(
+        (args.host, args.port), models, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms
+    )
+    host, port = server.server_address[:2]
+    for name, p in paths.items():
+        print(f"Loaded model: {name} <- {p}")
+    print(f"Serving on http://{host!s}:{port} (POST /predict/<model>, GET /stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Multi-process batch inference over byte-range shards of a CSV.
+
+The input is cut into newline-aligned byte ranges (so workers never need to
+parse the whole file), each worker process loads the model once, and shard
+outputs are written back in input order. Assumes one record per line, which
+holds for the processed numeric splits (no quoted embedded newlines).
+"""
+
+from __future__ import annotations
+
+import io
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from mlproj.inference.calibrator import load_calibrator
+from mlproj.inference.registry import load_model
+
+_WORKER: dict[str, Any] = {}
+
+
+def shard_byte_ranges(path: Path, n_shards: int) -> tuple[bytes, list[tuple[int, int]]]:
+    """
+    Return the header line and up to `n_shards` newline-aligned (start, end) data ranges.
+
+    Ranges are contiguous, non-empty and cover every data byte exactly once.
+    """
+    if n_shards < 1:
+        raise ValueError("n_shards must be >= 1")
+
+    size = path.stat().st_size
+    with path.open("rb") as f:
+        header = f.readline()
+        data_start = f.tell()
+        bounds = [data_start]
+        for i in range(1, n_shards):
+            target = data_start + (size - data_start) * i // n_shards
+            if target <= bounds[-1]:
+                continue
+            # Step back one byte so a target that already sits on a line start stays there.
+            f.seek(target - 1)
+            f.readline()
+            bound = min(f.tell(), size)
+            if bound > bounds[-1]:
+                bounds.append(bound)
+        if size > bounds[-1]:
+            bounds.append(size)
+
+    return header, list(zip(bounds[:-1], bounds[1:], strict=True))
+
+
+def load_ordered_model(model_path: Path) -> Any:
+    """
+    Load a model that scores on one thread (n_jobs=1), so tree sums accumulate in order.
+
+    Shard workers and the single-process predictors both score through this, under
+    threadpool_limits(limits=1), which keeps their outputs byte-identical.
+    """
+    model = load_model(model_path)
+    if hasattr(model, "n_jobs"):
+        model.n_jobs = 1
+    return model
+
+
+def _init_worker(model_path: str, calibrator_path: str | None = None) -> None:
+    # Parallelism comes from the process pool: keep each worker single-threaded so
+    # N workers don't oversubscribe cores.
+    from threadpoolctl import threadpool_limits
+
+    threadpool_limits(limits=1)
+    _WORKER["model"] = load_ordered_model(Path(model_path))
+    _WORKER["calibrator"] = load_calibrator(Path(calibrator_path)) if calibrator_path else None
+
+
+def _score_shard(task: tuple[str, bytes, int, int, float, bool]) -> tuple[str, int]:
+    path, header, start, end, threshold, with_header = task
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    df = pd.read_csv(io.BytesIO(header + data))
+    x = df.drop(columns=["target"]) if "target" in df.columns else df
+    proba = np.asarray(_WORKER["model"].predict_proba(x))[:, 1]
+    if _WORKER["calibrator"] is not None:
+        proba = _WORKER["calibrator"].apply(proba)
+    out = pd.DataFrame({"proba_disease": proba, "pred": (proba >= threshold).astype(int)})
+    return out.to_csv(index=False, header=with_header), len(out)
+
+
+def predict_sharded(
+    input_path: Path,
+    out_path: Path,
+    *,
+    model_path: Path,
+    threshold: float,
+    workers: int,
+    shards_per_worker: int = 4,
+    calibrator_path: Path | None = None,
+) -> int:
+    """
+    Score `input_path` across `workers` processes and write `proba_disease,pred` rows in order.
+
+    Output bytes match the single-process predictors: both score through
+    load_ordered_model on one thread, whatever n_jobs the model was saved with.
+    `calibrator_path` (a `.calib` artifact) is applied to the scores before
+    thresholding. Returns the number of rows scored.
+    """
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+
+    header, ranges = shard_byte_ranges(input_path, workers * shards_per_worker)
+    tasks = [
+        (str(input_path), header, start, end, threshold, i == 0)
+        for i, (start, end) in enumerate(ranges)
+    ]
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    n_rows = 0
+    with (
+        out_path.open("w", encoding="utf-8", newline="") as f,
+        ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(str(model_path), None if calibrator_path is None else str(calibrator_path)),
+        ) as ex,
+    ):
+        for text, n in ex.map(_score_shard, tasks):
+            f.write(text)
+            n_rows += n
+        if not tasks:
+            f.write("proba_disease,pred\n")
+
+    return n_rows
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+def stream_predictions(
+    input_path: Path,
+    out_path: Path,
+    *,
+    score: Callable[[pd.DataFrame], np.ndarray],
+    threshold: float,
+    chunksize: int,
+    with_row_id: bool,
+) -> int:
+    """
+    Score a CSV chunk by chunk and append each chunk's predictions to `out_path`.
+
+    Only one input chunk and its output are held in memory at a time, so peak
+    memory depends on `chunksize`, not on the file size. `row_id` (when written)
+    is the global 0-based row position in the input, exactly as in the
+    whole-file path. Returns the number of rows scored.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be >= 1")
+
+    columns = (["row_id"] if with_row_id else []) + ["proba_disease", "pred"]
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    n_rows = 0
+    with out_path.open("w", encoding="utf-8", newline="") as f:
+        for chunk in pd.read_csv(input_path, chunksize=chunksize):
+            proba = np.asarray(score(chunk), dtype=float)
+            data: dict[str, np.ndarray] = {}
+            if with_row_id:
+                data["row_id"] = np.arange(n_rows, n_rows + len(chunk), dtype=int)
+            data["proba_disease"] = proba
+            data["pred"] = (proba >= threshold).astype(int)
+            pd.DataFrame(data, columns=columns).to_csv(f, header=n_rows == 0, index=False)
+            n_rows += len(chunk)
+
+        if n_rows == 0:
+            f.write(",".join(columns) + "\n")
+
+    return n_rows
@@ -0,0 +1,33 @@
+"""
+Column layout of the wide predictions file (one `proba_<model>` / `pred_<model>`
+pair per model, as predict_all and cross_validate write it).
+
+Kept free of model-loading imports so the evaluation CLIs can read the file
+without pulling in the registry.
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+
+
+def proba_col(name: str) -> str:
+    return f"proba_{name}"
+
+
+def pred_col(name: str) -> str:
+    return f"pred_{name}"
+
+
+def select_model_columns(preds: pd.DataFrame, name: str) -> pd.DataFrame:
+    """
+    View one model of a wide predictions frame in the single-model layout.
+
+    Returns `row_id` (if present), `proba_disease` and `pred` (if present).
+    """
+    if proba_col(name) not in preds.columns:
+        models = [c.removeprefix("proba_") for c in preds.columns if c.startswith("proba_")]
+        raise ValueError(f"No predictions for model {name!r} (have: {models})")
+    renames = {proba_col(name): "proba_disease", pred_col(name): "pred"}
+    cols = [c for c in ("row_id", proba_col(name), pred_col(name)) if c in preds.columns]
+    return preds[cols].rename(columns=renames)
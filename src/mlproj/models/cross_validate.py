@@ -0,0 +1,262 @@
+"""
+Repeated stratified k-fold cross-validation of the baseline, RF and HGB model families.
+
+A single 70/15/15 split of ~300 rows is a noisy basis for model selection.
+This engine scores every hyperparameter candidate in a grid file on
+`--repeats` x `--splits` stratified folds of the dev set. The dev set is
+train + val; test stays held out. For each candidate it reports the mean and
+std of `--metric` over the folds. Estimators come from the trainers
+(train_baseline.build_pipeline, train_rf.build_model, train_hgb.build_model),
+with the candidate's parameters set on top.
+
+Work is split into (model, fold) jobs over `--workers` processes. Each
+process loads the dev set and builds the folds once (pool initializer). A job
+fits every candidate of its model on its fold. The baseline's imputer and
+scaler do not depend on the candidate, so they are fitted once per fold and
+only the logistic regression is refit. This gives the same numbers as
+refitting the whole pipeline. Folds are seeded, so results do not depend on
+`--workers`.
+
+The out-of-fold probabilities of each model's best candidate are averaged
+over repeats, since each row is held out once per repeat. They are written
+as a wide predictions CSV (`proba_<model>`) that also carries `target`, so
+the threshold tools can read the same file as both input and predictions:
+
+  python -m mlproj.evaluation.sweep_thresholds --input reports/cv_oof.csv \\
+      --preds reports/cv_oof.csv --model rf --out reports/cv_rf_sweep.csv --exact
+
+Usage:
+  python -m mlproj.models.cross_validate --grid configs/cv_grid.json --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from mlproj.data.columnar import read_table
+from mlproj.evaluation.curves import SCORERS, score
+from mlproj.inference.wide import pred_col, proba_col
+
+MODELS = ("baseline", "rf", "hgb")
+CSV_COLUMNS = ["model", "candidate", "params", "metric", "mean", "std", "folds", "rank"]
+
+# Per-process state, set once by load_state (in the pool initializer, or in-process).
+_STATE: dict[str, Any] = {}
+
+
+def make_estimator(model: str, params: dict[str, Any], x: pd.DataFrame, *, n_jobs: int = -1) -> Any:
+    """
+    Unfitted estimator of `model` as its trainer builds it, with `params` set on top.
+
+    `n_jobs` is the random forest's worker count (1 when folds run in parallel).
+    """
+    if model == "baseline":
+        from mlproj.models.train_baseline import build_pipeline
+
+        return build_pipeline(x).set_params(**{f"clf__{k}": v for k, v in params.items()})
+    if model == "rf":
+        from mlproj.models.train_rf import build_model as build_rf
+
+        return build_rf(n_jobs=n_jobs).set_params(**params)
+    if model == "hgb":
+        from mlproj.models.train_hgb import build_model as build_hgb
+
+        return build_hgb().set_params(**params)
+    raise ValueError(f"Unknown model {model!r} (choose from {MODELS})")
+
+
+def load_grid(path: Path) -> dict[str, list[dict[str, Any]]]:
+    """Candidates per model: the cartesian product of each model's {param: [values]}."""
+    from sklearn.model_selection import ParameterGrid
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    unknown = [m for m in data if m not in MODELS]
+    if unknown or not data:
+        raise ValueError(f"Grid {path} must map models in {MODELS} to parameter lists: {unknown}")
+    return {model: list(ParameterGrid(params)) for model, params in data.items()}
+
+
+def load_state(
+    data_paths: list[Path],
+    grid: dict[str, list[dict[str, Any]]],
+    metric: str,
+    n_splits: int,
+    n_repeats: int,
+    seed: int,
+    threads: int | None,
+) -> None:
+    """Load the dev set and build the folds for this process (`threads`: native pool cap)."""
+    from sklearn.model_selection import RepeatedStratifiedKFold
+
+    df = pd.concat([read_table(p) for p in data_paths], ignore_index=True)
+    if "target" not in df.columns:
+        raise ValueError(f"Dev splits must contain a 'target' column: {data_paths}")
+    x = df.drop(columns=["target"])
+    y = df["target"].astype(int).to_numpy()
+    cv = RepeatedStratifiedKFold(n_splits=n_splits, n_repeats=n_repeats, random_state=seed)
+    _STATE.update(
+        x=x,
+        y=y,
+        folds=list(cv.split(x, y)),
+        grid=grid,
+        metric=metric,
+        threads=threads,
+        n_jobs=-1 if threads is None else threads,
+    )
+
+
+def _fit_fold(job: tuple[str, int]) -> tuple[list[float], list[np.ndarray]]:
+    """Score and held-out probabilities of every candidate of `model` on fold k."""
+    from threadpoolctl import threadpool_limits
+
+    model, k = job
+    x, y = _STATE["x"], _STATE["y"]
+    train_idx, test_idx = _STATE["folds"][k]
+    x_train, x_test = x.iloc[train_idx], x.iloc[test_idx]
+    candidates = _STATE["grid"][model]
+
+    with threadpool_limits(limits=_STATE["threads"]):
+        if model == "baseline":  # one imputer + scaler fit per fold, shared by the candidates
+            pre = make_estimator(model, {}, x).named_steps["pre"]
+            x_train, x_test = pre.fit_transform(x_train), pre.transform(x_test)
+            estimators = [make_estimator(model, p, x).named_steps["clf"] for p in candidates]
+        else:
+            estimators = [make_estimator(model, p, x, n_jobs=_STATE["n_jobs"]) for p in candidates]
+        probas = [
+            np.asarray(est.fit(x_train, y[train_idx]).predict_proba(x_test))[:, 1]
+            for est in estimators
+        ]
+    scores = [score(y[test_idx], p, _STATE["metric"]) for p in probas]
+    return scores, probas
+
+
+def score_candidate(model: str, params: dict[str, Any]) -> float:
+    """Mean score over the loaded folds of one candidate (after load_state)."""
+    from threadpoolctl import threadpool_limits
+
+    x, y = _STATE["x"], _STATE["y"]
+    scores = []
+    with threadpool_limits(limits=_STATE["threads"]):
+        for train_idx, test_idx in _STATE["folds"]:
+            est = make_estimator(model, params, x, n_jobs=_STATE["n_jobs"])
+            est.fit(x.iloc[train_idx], y[train_idx])
+            proba = np.asarray(est.predict_proba(x.iloc[test_idx]))[:, 1]
+            scores.append(score(y[test_idx], proba, _STATE["metric"]))
+    return float(np.mean(scores))
+
+
+def cross_validate(
+    grid: dict[str, list[dict[str, Any]]],
+    data_paths: list[Path],
+    *,
+    metric: str = "roc_auc",
+    n_splits: int = 5,
+    n_repeats: int = 3,
+    seed: int = 42,
+    workers: int = 1,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    (results, oof): CSV_COLUMNS per (model, candidate), and the wide out-of-fold
+    predictions of each model's best candidate (row_id, target, proba_*, pred_*).
+    """
+    if metric not in SCORERS:
+        raise ValueError(f"Unknown metric {metric!r} (choose from {SCORERS})")
+    init_args = (data_paths, grid, metric, n_splits, n_repeats, seed, 1 if workers > 1 else None)
+    load_state(*init_args)
+    folds, y = _STATE["folds"], _STATE["y"]
+    jobs = [(model, k) for model in grid for k in range(len(folds))]
+
+    if workers > 1:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=load_state, initargs=init_args
+        ) as ex:
+            done = list(ex.map(_fit_fold, jobs))
+    else:
+        done = [_fit_fold(job) for job in jobs]
+
+    rows: list[pd.DataFrame] = []
+    oof = pd.DataFrame({"row_id": np.arange(len(y)), "target": y})
+    for model, candidates in grid.items():
+        scores = np.empty((len(candidates), len(folds)))
+        held_out = np.zeros((len(candidates), len(y)))
+        for (m, k), (fold_scores, probas) in zip(jobs, done, strict=True):
+            if m == model:
+                scores[:, k] = fold_scores
+                for c, proba in enumerate(probas):
+                    held_out[c, folds[k][1]] += proba
+        table = pd.DataFrame(
+            {
+                "model": model,
+                "candidate": np.arange(len(candidates)),
+                "params": [json.dumps(p, sort_keys=True) for p in candidates],
+                "metric": metric,
+                "mean": scores.mean(axis=1),
+                "std": scores.std(axis=1),
+                "folds": len(folds),
+            }
+        )
+        table["rank"] = table["mean"].rank(ascending=False, method="min").astype(int)
+        rows.append(table[CSV_COLUMNS])
+        best = int(np.argmax(scores.mean(axis=1)))
+        oof[proba_col(model)] = held_out[best] / n_repeats
+        oof[pred_col(model)] = (oof[proba_col(model)] >= 0.5).astype(int)
+    return pd.concat(rows, ignore_index=True), oof
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Repeated stratified k-fold CV of every model family.")
+    ap.add_argument(
+        "--grid", default="configs/cv_grid.json", help="JSON {model: {param: [values]}}"
+    )
+    ap.add_argument(
+        "--data",
+        action="append",
+        help="Labeled dev CSV (repeatable). Default: data/processed/train.csv and val.csv.",
+    )
+    ap.add_argument("--models", nargs="+", choices=MODELS, help="Subset of the grid's models")
+    ap.add_argument("--metric", default="roc_auc", choices=SCORERS)
+    ap.add_argument("--splits", type=int, default=5, help="Folds per repeat")
+    ap.add_argument("--repeats", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--workers", type=int, default=1, help="Processes for (model, fold) jobs")
+    ap.add_argument("--out-csv", default="reports/cv_results.csv")
+    ap.add_argument("--out-oof", default="reports/cv_oof.csv")
+    args = ap.parse_args()
+
+    grid = load_grid(Path(args.grid))
+    if args.models:
+        grid = {m: grid[m] for m in args.models if m in grid}
+    data = [Path(p) for p in args.data or ["data/processed/train.csv", "data/processed/val.csv"]]
+
+    t0 = time.perf_counter()
+    results, oof = cross_validate(
+        grid,
+        data,
+        metric=args.metric,
+        n_splits=args.splits,
+        n_repeats=args.repeats,
+        seed=args.seed,
+        workers=args.workers,
+    )
+    elapsed = time.perf_counter() - t0
+
+    for path, frame in ((Path(args.out_csv), results), (Path(args.out_oof), oof)):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        frame.to_csv(path, index=False)
+        print(f"Wrote: {path}")
+    for row in results[results["rank"] == 1].drop_duplicates("model").itertuples(index=False):
+        print(f"{row.model}: best {row.params} | {args.metric} {row.mean:.4f} ± {row.std:.4f}")
+    n_fits = sum(len(c) for c in grid.values()) * args.splits * args.repeats
+    print(f"{n_fits} fits on {len(oof)} rows | workers={args.workers} | {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""
+Budgeted hyperparameter search for RF and HGB by successive halving.
+
+Candidates are the grid of a search-space file (configs/search_space.json,
+{model: {param: [values]}}). `--candidates N` samples N of them per model.
+The halved resource is the number of trees for RF (n_estimators) and of
+boosting iterations for HGB (max_iter). Rung i scores each model's survivors
+with max_resource * eta^(i - last) of it, using k-fold CV on train + val
+(mlproj.models.cross_validate). The best 1/eta move up a rung, until the
+finalists are scored at the full resource. So most of the grid is only ever
+fitted with a few trees or iterations. HGB starts at 50 iterations: after
+only a few, slow learning rates look worse than they end up, so the early
+rungs would drop the configs that win at 400.
+
+Evaluations run in a process pool; each worker loads the dev set and the
+folds once. The search runs under `--budget-s` of wall clock. When the
+budget runs out, pending evaluations are cancelled and running ones finish.
+Each model's winner then comes from the highest rung in which every survivor
+was scored, and is marked incomplete unless that rung is the last one. Every
+finished evaluation is appended to a JSONL checkpoint, and a re-run with
+the same settings resumes from it without re-fitting anything.
+
+Writes a leaderboard CSV with every evaluation, and the winning config per
+model as JSON. `train_rf --params` and `train_hgb --params` train with it,
+at their own number of trees / iterations, and refuse incomplete winners.
+
+Usage:
+  python -m mlproj.models.search --space configs/search_space.json --workers 4 --budget-s 600
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from mlproj.evaluation.curves import SCORERS
+
+# Halved resource per model: (estimator parameter, first rung's amount, full amount as in
+# the trainer).
+RESOURCES = {"rf": ("n_estimators", 5, 400), "hgb": ("max_iter", 50, 400)}
+CSV_COLUMNS = ["model", "rung", "resource", "score", "seconds", "params"]
+
+Job = tuple[str, dict[str, Any]]  # (model, params including the resource)
+
+
+def load_best_params(path: Path, model: str) -> dict[str, Any]:
+    """
+    `model`'s winning parameters from a search's winning-config JSON, without
+    the halved resource (the trainer's own n_estimators / max_iter applies).
+    Raises ValueError if the search ran out of budget before finishing.
+    """
+    best = json.loads(path.read_text(encoding="utf-8"))
+    if model not in best:
+        raise ValueError(f"No {model!r} winner in {path} (have: {sorted(best)})")
+    if not best[model].get("complete", False):
+        raise ValueError(
+            f"The {model!r} winner in {path} was not scored at the full resource (the search "
+            "ran out of budget); re-run the search, which resumes from its checkpoint"
+        )
+    params = dict(best[model]["params"])
+    params.pop(RESOURCES[model][0], None)
+    return params
+
+
+def rung_resources(
+    n_candidates: int, *, eta: int, max_resource: int, min_resource: int = 1
+) -> list[int]:
+    """Increasing resource per rung, ending at max_resource, enough to halve n down to 1."""
+    n_rungs = 1
+    while eta ** (n_rungs - 1) < n_candidates:
+        n_rungs += 1
+    return sorted(
+        {max(min_resource, round(max_resource / eta**k)) for k in range(n_rungs - 1, -1, -1)}
+    )
+
+
+def _key(model: str, params: dict[str, Any]) -> str:
+    return json.dumps([model, params], sort_keys=True)
+
+
+def load_candidates(space_path: Path, n: int | None, seed: int) -> dict[str, list[dict[str, Any]]]:
+    """Grid points per model of a search-space file (a seeded sample of `n` if given)."""
+    from sklearn.model_selection import ParameterGrid
+
+    space = json.loads(space_path.read_text(encoding="utf-8"))
+    unknown = [m for m in space if m not in RESOURCES]
+    if unknown or not space:
+        raise ValueError(f"Search space {space_path} must map models in {sorted(RESOURCES)}")
+    out = {}
+    rng = np.random.default_rng(seed)
+    for model, params in space.items():
+        resource = RESOURCES[model][0]
+        if resource in params:
+            raise ValueError(f"{model}: {resource!r} is the halved resource, not a search param")
+        grid = list(ParameterGrid(params))
+        if n is not None and n < len(grid):
+            grid = [grid[i] for i in sorted(rng.choice(len(grid), size=n, replace=False))]
+        out[model] = grid
+    return out
+
+
+def _evaluate(job: Job) -> tuple[float, float]:
+    from mlproj.models.cross_validate import score_candidate
+
+    t0 = time.perf_counter()
+    value = score_candidate(*job)
+    return value, time.perf_counter() - t0
+
+
+class Checkpoint:
+    """Finished evaluations, appended to a JSONL file whose first line is the search signature."""
+
+    def __init__(self, path: Path, signature: dict[str, Any]) -> None:
+        self.path = path
+        self.done: dict[str, tuple[float, float]] = {}
+        if path.exists() and path.stat().st_size:
+            lines = path.read_text(encoding="utf-8").splitlines()
+            if json.loads(lines[0]).get("signature") != signature:
+                raise ValueError(
+                    f"Checkpoint {path} belongs to a different search; delete it or pass "
+                    "another --checkpoint"
+                )
+            for line in lines[1:]:
+                if line.strip():  # a torn last line (killed mid-write) is re-evaluated
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.done[_key(rec["model"], rec["params"])] = (rec["score"], rec["seconds"])
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps({"signature": signature}) + "\n", encoding="utf-8")
+
+    def add(self, job: Job, value: float, seconds: float) -> None:
+        model, params = job
+        self.done[_key(model, params)] = (value, seconds)
+        rec = {"model": model, "params": params, "score": value, "seconds": seconds}
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(rec) + "\n")
+
+
+def _run_jobs(
+    jobs: list[Job],
+    ex: ProcessPoolExecutor | None,
+    deadline: float,
+    on_result: Callable[[Job, float, float], None],
+) -> bool:
+    """Evaluate `jobs` until done or past `deadline`; returns False if the budget ran out."""
+    if ex is None:
+        for job in jobs:
+            if time.monotonic() >= deadline:
+                return False
+            on_result(job, *_evaluate(job))
+        return True
+    futures: dict[Future[tuple[float, float]], Job] = {ex.submit(_evaluate, j): j for j in jobs}
+    pending = set(futures)
+    while pending:
+        left = None if math.isinf(deadline) else max(0.0, deadline - time.monotonic())
+        finished, pending = wait(pending, timeout=left, return_when=FIRST_COMPLETED)
+        for f in finished:
+            on_result(futures[f], *f.result())
+        if not finished:  # budget spent: drop queued jobs, keep the running ones' results
+            for f in pending:
+                f.cancel()
+            for f in wait(pending).done:
+                if not f.cancelled():
+                    on_result(futures[f], *f.result())
+            return False
+    return True
+
+
+def successive_halving(
+    candidates: dict[str, list[dict[str, Any]]],
+    data_paths: list[Path],
+    checkpoint: Path,
+    *,
+    eta: int = 3,
+    min_resource: int | None = None,
+    metric: str = "roc_auc",
+    n_splits: int = 3,
+    seed: int = 42,
+    workers: int = 1,
+    budget_s: float = math.inf,
+) -> tuple[pd.DataFrame, dict[str, dict[str, Any]]]:
+    """
+    (leaderboard, winners): every evaluation (CSV_COLUMNS) and the best config per model.
+
+    `min_resource` overrides every model's first-rung amount (RESOURCES).
+    """
+    from mlproj.models.cross_validate import load_state
+
+    if metric not in SCORERS:
+        raise ValueError(f"Unknown metric {metric!r} (choose from {SCORERS})")
+    deadline = time.monotonic() + budget_s
+    resources = {
+        m: rung_resources(
+            len(c),
+            eta=eta,
+            max_resource=RESOURCES[m][2],
+            min_resource=RESOURCES[m][1] if min_resource is None else min_resource,
+        )
+        for m, c in candidates.items()
+    }
+    signature = {
+        "candidates": candidates,
+        "resources": resources,
+        "eta": eta,
+        "metric": metric,
+        "splits": n_splits,
+        "seed": seed,
+        "data": [str(p) for p in data_paths],
+    }
+    ckpt = Checkpoint(checkpoint, signature)
+    init_args = (data_paths, {}, metric, n_splits, 1, seed, 1 if workers > 1 else None)
+    survivors = {m: list(c) for m, c in candidates.items()}
+    rows: list[dict[str, Any]] = []
+    full_rung: dict[str, int] = {}  # highest rung in which every survivor was scored
+
+    def with_resource(model: str, params: dict[str, Any], rung: int) -> dict[str, Any]:
+        return {**params, RESOURCES[model][0]: resources[model][rung]}
+
+    ex = None
+    if workers > 1:
+        ex = ProcessPoolExecutor(max_workers=workers, initializer=load_state, initargs=init_args)
+    else:
+        load_state(*init_args)
+    try:
+        for rung in range(max(len(r) for r in resources.values())):
+            active = [m for m in survivors if rung < len(resources[m])]
+            jobs = [(m, with_resource(m, p, rung)) for m in active for p in survivors[m]]
+            todo = [j for j in jobs if _key(*j) not in ckpt.done]
+            in_budget = _run_jobs(todo, ex, deadline, ckpt.add)
+            for model, params in jobs:
+                if _key(model, params) in ckpt.done:
+                    value, seconds = ckpt.done[_key(model, params)]
+                    rows.append(
+                        {
+                            "model": model,
+                            "rung": rung,
+                            "resource": resources[model][rung],
+                            "score": value,
+                            "seconds": seconds,
+                            "params": json.dumps(params, sort_keys=True),
+                        }
+                    )
+            for model in active:
+                keys = [_key(model, with_resource(model, p, rung)) for p in survivors[model]]
+                if all(k in ckpt.done for k in keys):
+                    full_rung[model] = rung
+            if not in_budget:
+                break
+            for model in active:  # promote the best 1/eta (stable on ties)
+                scored = sorted(
+                    survivors[model],
+                    key=lambda p, m=model: -ckpt.done[_key(m, with_resource(m, p, rung))][0],
+                )
+                survivors[model] = scored[: max(1, math.ceil(len(scored) / eta))]
+    finally:
+        if ex is not None:
+            ex.shutdown(cancel_futures=True)
+
+    board = pd.DataFrame(rows, columns=CSV_COLUMNS)
+    board = board.sort_values(
+        ["model", "rung", "score"], ascending=[True, False, False], kind="stable"
+    )
+    winners: dict[str, dict[str, Any]] = {}
+    for model, group in board.groupby("model", sort=False):
+        # Best of the highest fully scored rung; a partly scored rung only ranks its finishers.
+        rung = full_rung.get(str(model), int(group["rung"].min()))
+        top = group[group["rung"] == rung].iloc[0]
+        winners[str(model)] = {
+            "params": json.loads(top["params"]),
+            "score": float(top["score"]),
+            "metric": metric,
+            "resource": int(top["resource"]),
+            "complete": rung == len(resources[str(model)]) - 1 and str(model) in full_rung,
+        }
+    return board.reset_index(drop=True), winners
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Successive-halving search for RF and HGB.")
+    ap.add_argument("--space", default="configs/search_space.json")
+    ap.add_argument(
+        "--data",
+        action="append",
+        help="Labeled dev CSV (repeatable). Default: data/processed/train.csv and val.csv.",
+    )
+    ap.add_argument("--models", nargs="+", choices=sorted(RESOURCES), help="Subset of the space")
+    ap.add_argument("--candidates", type=int, default=None, help="Sample N grid points per model")
+    ap.add_argument("--eta", type=int, default=3, help="Keep the best 1/eta per rung")
+    ap.add_argument(
+        "--min-resource", type=int, default=None, help="First rung's trees / iterations"
+    )
+    ap.add_argument("--metric", default="roc_auc", choices=SCORERS)
+    ap.add_argument("--splits", type=int, default=3, help="CV folds per evaluation")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--budget-s", type=float, default=math.inf, help="Wall-clock budget")
+    ap.add_argument("--checkpoint", default="reports/search_checkpoint.jsonl")
+    ap.add_argument("--out-csv", default="reports/search_leaderboard.csv")
+    ap.add_argument("--out-best", default="reports/search_best.json")
+    args = ap.parse_args()
+
+    candidates = load_candidates(Path(args.space), args.candidates, args.seed)
+    if args.models:
+        candidates = {m: candidates[m] for m in args.models if m in candidates}
+    data = [Path(p) for p in args.data or ["data/processed/train.csv", "data/processed/val.csv"]]
+
+    t0 = time.perf_counter()
+    board, winners = successive_halving(
+        candidates,
+        data,
+        Path(args.checkpoint),
+        eta=args.eta,
+        min_resource=args.min_resource,
+        metric=args.metric,
+        n_splits=args.splits,
+        seed=args.seed,
+        workers=args.workers,
+        budget_s=args.budget_s,
+    )
+    elapsed = time.perf_counter() - t0
+
+    out_csv, out_best = Path(args.out_csv), Path(args.out_best)
+    out_csv.parent.mkdir(parents=True, exist_ok=True)
+    out_best.parent.mkdir(parents=True, exist_ok=True)
+    board.to_csv(out_csv, index=False)
+    out_best.write_text(json.dumps(winners, indent=2) + "\n", encoding="utf-8")
+    print(f"Wrote: {out_csv}")
+    print(f"Wrote: {out_best}")
+    for model, w in winners.items():
+        note = "" if w["complete"] else " (budget ran out before the full resource)"
+        print(
+            f"{model}: {json.dumps(w['params'], sort_keys=True)} | {args.metric} {w['score']:.4f}{note}"
+        )
+    print(f"{len(board)} evaluations | workers={args.workers} | {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Train the baseline, RF and HGB models concurrently from one load of the splits.
+
+Writes the same artifacts and reports as `train_baseline`, `train_rf` and
+`train_hgb`, the three processes the Make chain runs one after another.
+Those processes each parse train/val/test. Here the parent reads each split
+once through the columnar cache (mlproj.data.columnar), which builds it if
+needed. Each worker then memory-maps the cached columns. The data sit once
+in the OS page cache, shared by every process, and nothing is re-parsed or
+pickled across.
+
+Each model trains in its own process with a CPU budget (cpu_budgets):
+- RF runs with n_jobs=<budget>;
+- threadpoolctl caps every worker's native thread pools at its budget
+  (OpenMP for HGB, BLAS for the logistic regression).
+So the concurrent fits share `--cpus` cores. Without the caps, RF's
+n_jobs=-1 and HGB's OpenMP would each claim the whole machine.
+
+Usage:
+  python -m mlproj.models.train_all --cpus 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from mlproj.data.columnar import read_table
+
+MODELS = ("baseline", "rf", "hgb")
+SPLITS = ("train", "val", "test")
+
+
+def cpu_budgets(cpus: int, models: tuple[str, ...] = MODELS) -> dict[str, int]:
+    """Cores per model: 1 for the baseline (a small lbfgs fit), the rest split over the others."""
+    budgets = {"baseline": 1} if "baseline" in models else {}
+    heavy = [m for m in models if m != "baseline"]
+    rest = max(1, cpus - len(budgets))
+    for i, name in enumerate(heavy):
+        budgets[name] = max(1, rest // len(heavy) + (i < rest % len(heavy)))
+    return {m: budgets[m] for m in models}
+
+
+def _load_splits(data_dir: Path) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    paths = [data_dir / f"{s}.csv" for s in SPLITS]
+    for p in paths:
+        if not p.exists():
+            raise SystemExit(f"Missing split file: {p}. Run `make pipeline` first.")
+    # Read-only maps of the cached columns: the fits convert or copy what they write to.
+    train, val, test = (read_table(p, readonly=True) for p in paths)
+    return train, val, test
+
+
+def _train(name: str, cpus: int, data_dir: Path, rf_model_out: Path, rf_report_out: Path) -> float:
+    """Fit model `name` within `cpus` cores; returns its wall time in seconds."""
+    from threadpoolctl import threadpool_limits
+
+    from mlproj.models.train_baseline import train_baseline
+    from mlproj.models.train_hgb import train_hgb
+    from mlproj.models.train_rf import train_rf
+
+    splits = _load_splits(data_dir)  # maps the cache the parent built
+    t0 = time.perf_counter()
+    with threadpool_limits(limits=cpus):
+        if name == "baseline":
+            train_baseline(*splits)
+        elif name == "rf":
+            train_rf(*splits, model_out=rf_model_out, report_out=rf_report_out, n_jobs=cpus)
+        elif name == "hgb":
+            train_hgb(
+                model_out=Path("models/hgb.joblib"),
+                report_out=Path("reports/hgb_metrics.md"),
+                splits=splits,
+            )
+        else:
+            raise ValueError(f"Unknown model {name!r} (choose from {MODELS})")
+    return time.perf_counter() - t0
+
+
+def train_all(
+    *,
+    models: tuple[str, ...] = MODELS,
+    cpus: int | None = None,
+    workers: int | None = None,
+    data_dir: Path = Path("data/processed"),
+    rf_model_out: Path = Path("models/rf.joblib"),
+    rf_report_out: Path = Path("reports/rf_metrics.md"),
+) -> dict[str, float]:
+    """Train `models` (at most `workers` at a time); returns per-model fit seconds."""
+    unknown = [m for m in models if m not in MODELS]
+    if unknown:
+        raise ValueError(f"Unknown models {unknown} (choose from {MODELS})")
+    cpus = cpus or os.cpu_count() or 1
+    workers = workers or min(len(models), cpus)
+    budgets = cpu_budgets(cpus, models)
+    _load_splits(data_dir)  # parse each split at most once, before the workers map it
+
+    args = (data_dir, rf_model_out, rf_report_out)
+    if workers <= 1:
+        return {m: _train(m, budgets[m], *args) for m in models}
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futures = {m: ex.submit(_train, m, budgets[m], *args) for m in models}
+        return {m: f.result() for m, f in futures.items()}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Train baseline, RF and HGB concurrently.")
+    ap.add_argument("--models", nargs="+", default=list(MODELS), choices=MODELS)
+    ap.add_argument("--cpus", type=int, default=None, help="Core budget (default: all cores)")
+    ap.add_argument(
+        "--workers", type=int, default=None, help="Concurrent fits (default: min(models, cpus))"
+    )
+    ap.add_argument("--data-dir", default="data/processed")
+    ap.add_argument("--rf-model-out", default="models/rf.joblib")
+    ap.add_argument("--rf-report-out", default="reports/rf_metrics.md")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    fit_s = train_all(
+        models=tuple(args.models),
+        cpus=args.cpus,
+        workers=args.workers,
+        data_dir=Path(args.data_dir),
+        rf_model_out=Path(args.rf_model_out),
+        rf_report_out=Path(args.rf_report_out),
+    )
+    elapsed = time.perf_counter() - t0
+    budgets = cpu_budgets(args.cpus or os.cpu_count() or 1, tuple(args.models))
+    for name, seconds in fit_s.items():
+        print(f"{name}: {seconds:.2f} s on {budgets[name]} core(s)")
+    print(f"Trained {len(fit_s)} models in {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
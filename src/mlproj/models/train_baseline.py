@@ -25,18 +25,14 @@ import pandas as pd
 from sklearn.compose import ColumnTransformer
 from sklearn.impute import SimpleImputer
 from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import (
-    accuracy_score,
-    classification_report,
-    confusion_matrix,
-    f1_score,
-    precision_score,
-    recall_score,
-    roc_auc_score,
-)
+from sklearn.metrics import classification_report, confusion_matrix
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 
+from mlproj.data.columnar import read_table
+from mlproj.evaluation.curves import BinaryCurves
+from mlproj.evaluation.metrics import classification_metrics
+
 DATA_DIR = Path("data/processed")
 REPORTS_DIR = Path("reports")
 MODELS_DIR = Path("models")
@@ -68,7 +64,7 @@ def load_split(name: str) -> pd.DataFrame:
     p = DATA_DIR / f"{name}.csv"
     if not p.exists():
         raise SystemExit(f"Missing split file: {p}. Run `make pipeline` first.")
-    return pd.read_csv(p)
+    return read_table(p)
 
 
 def build_pipeline(X: pd.DataFrame) -> Pipeline:
@@ -102,22 +98,13 @@ def eval_split(pipe: Pipeline, X: pd.DataFrame, y: pd.Series, name: str) -> dict
 
     # Probability-based metrics
     proba = pipe.predict_proba(X)[:, 1]
-    auc = roc_auc_score(y, proba)
-
-    return {
-        "accuracy": float(accuracy_score(y, y_pred)),
-        "precision": float(precision_score(y, y_pred, zero_division="warn")),
-        "recall": float(recall_score(y, y_pred, zero_division="warn")),
-        "f1": float(f1_score(y, y_pred, zero_division="warn")),
-        "roc_auc": float(auc),
-    }
+    auc = BinaryCurves.from_scores(y, proba).roc_auc()
 
+    return {**classification_metrics(y, y_pred, zero_division="warn"), "roc_auc": float(auc)}
 
-def main() -> None:
-    train = load_split("train")
-    val = load_split("val")
-    test = load_split("test")
 
+def train_baseline(train: pd.DataFrame, val: pd.DataFrame, test: pd.DataFrame) -> None:
+    """Fit on train, evaluate on val/test and write the artifacts listed above."""
     if "target" not in train.columns:
         raise SystemExit("Expected `target` column not found in train split.")
 
@@ -239,5 +226,9 @@ def main() -> None:
     print("TEST metrics:", test_metrics)
 
 
+def main() -> None:
+    train_baseline(load_split("train"), load_split("val"), load_split("test"))
+
+
 if __name__ == "__main__":
     main()
@@ -1,17 +1,32 @@
 from __future__ import annotations
 
+import argparse
 import json
 from pathlib import Path
+from typing import Any
 
 import joblib
 import numpy as np
 import pandas as pd
 from sklearn.ensemble import HistGradientBoostingClassifier
-from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
 
+from mlproj.data.columnar import read_table
+from mlproj.evaluation.curves import BinaryCurves
+from mlproj.models.search import load_best_params
 
-def _load_split(split: str) -> tuple[pd.DataFrame, np.ndarray]:
-    df = pd.read_csv(f"data/processed/{split}.csv")
+
+def _load_split(split: str) -> pd.DataFrame:
+    return read_table(f"data/processed/{split}.csv")
+
+
+def _classification_metrics(
+    y_true: np.ndarray, y_prob: np.ndarray, threshold: float
+) -> dict[str, float]:
+    m = BinaryCurves.from_scores(y_true, y_prob).metrics_at(threshold)
+    return {k: m[k] for k in ("accuracy", "precision", "recall", "f1", "roc_auc")}
+
+
+def _xy(df: pd.DataFrame) -> tuple[pd.DataFrame, np.ndarray]:
     if "target" not in df.columns:
         raise ValueError('Expected a target column named "target" in processed splits.')
     y = df["target"].astype(int).to_numpy()
@@ -19,30 +34,32 @@ def _load_split(split: str) -> tuple[pd.DataFrame, np.ndarray]:
     return X, y
 
 
-def _classification_metrics(
-    y_true: np.ndarray, y_prob: np.ndarray, threshold: float
-) -> dict[str, float]:
-    y_pred = (y_prob >= threshold).astype(int)
-    return {
-        "accuracy": float(accuracy_score(y_true, y_pred)),
-        "precision": float(precision_score(y_true, y_pred, zero_division=0)),  # pyright: ignore[reportArgumentType]
-        "recall": float(recall_score(y_true, y_pred, zero_division=0)),  # pyright: ignore[reportArgumentType]
-        "f1": float(f1_score(y_true, y_pred, zero_division=0)),  # pyright: ignore[reportArgumentType]
-        "roc_auc": float(roc_auc_score(y_true, y_prob)),
-    }
-
-
-def train_hgb(*, model_out: Path, report_out: Path, random_state: int = 42) -> None:
-    X_train, y_train = _load_split("train")
-    X_val, y_val = _load_split("val")
-    X_test, y_test = _load_split("test")
-
-    model = HistGradientBoostingClassifier(
+def build_model(*, random_state: int = 42) -> HistGradientBoostingClassifier:
+    return HistGradientBoostingClassifier(
         random_state=random_state,
         learning_rate=0.05,
         max_depth=None,
         max_iter=400,
     )
+
+
+def train_hgb(
+    *,
+    model_out: Path,
+    report_out: Path,
+    random_state: int = 42,
+    splits: tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame] | None = None,
+    params: dict[str, Any] | None = None,
+) -> None:
+    """
+    Fit on train, evaluate on val/test. `splits` = already-loaded (train, val, test);
+    `params` (e.g. a search winner) override the model's hyperparameters.
+    """
+    if splits is None:
+        splits = (_load_split("train"), _load_split("val"), _load_split("test"))
+    (X_train, y_train), (X_val, y_val), (X_test, y_test) = (_xy(df) for df in splits)
+
+    model = build_model(random_state=random_state).set_params(**(params or {}))
     model.fit(X_train, y_train)
 
     val_probs = model.predict_proba(X_val)[:, 1]
@@ -76,7 +93,16 @@ def train_hgb(*, model_out: Path, report_out: Path, random_state: int = 42) -> N
 
 
 def main() -> None:
-    train_hgb(model_out=Path("models/hgb.joblib"), report_out=Path("reports/hgb_metrics.md"))
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "--params", default=None, help="Winning-config JSON of mlproj.models.search (overrides)"
+    )
+    args = ap.parse_args()
+    train_hgb(
+        model_out=Path("models/hgb.joblib"),
+        report_out=Path("reports/hgb_metrics.md"),
+        params=load_best_params(Path(args.params), "hgb") if args.params else None,
+    )
 
 
 if __name__ == "__main__":
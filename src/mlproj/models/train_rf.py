@@ -1,26 +1,49 @@
+"""
+Train the RandomForest and evaluate it on val/test.
+
+`--grow K` adds K trees to an existing artifact instead of refitting it
+(warm start). The old trees are kept, and only the new ones are fitted on
+train. New trees get the seeds a from-scratch fit with the same
+random_state would give them, so growing 400 -> 500 trees gives the same
+forest as training 500. The train split must be the one the artifact was
+fitted on.
+
+`--oob-curve PATH` writes the out-of-bag metrics of the first n trees for
+n = step, 2 * step, ...: each training row is scored by the trees whose
+bootstrap sample left it out. It also measures the marginal predict_proba
+latency of one more tree. The report then shows where more trees stop
+improving OOB ROC AUC, and what each extra tree costs at inference.
+
+Usage:
+  python -m mlproj.models.train_rf --model-out models/rf.joblib
+  python -m mlproj.models.train_rf --model-out models/rf.joblib --grow 100 \\
+      --oob-curve reports/rf_oob_curve.csv
+"""
+
 from __future__ import annotations
 
 import argparse
+import copy
+import time
+from numbers import Integral
 from pathlib import Path
 from typing import Any
 
 import joblib
+import numpy as np
 import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import (
-    accuracy_score,
-    confusion_matrix,
-    f1_score,
-    precision_score,
-    recall_score,
-    roc_auc_score,
-)
 
-ZERO_DIV: Any = 0
+from mlproj.data.columnar import read_table
+from mlproj.evaluation.curves import BinaryCurves
+from mlproj.models.search import load_best_params
 
 
 def _load_xy(csv_path: Path) -> tuple[pd.DataFrame, pd.Series]:
-    df = pd.read_csv(csv_path)
+    return _xy(read_table(csv_path))
+
+
+def _xy(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.Series]:
     if "target" not in df.columns:
         raise ValueError("Expected a target column in processed dataset")
     x = df.drop(columns=["target"])
@@ -29,22 +52,8 @@ def _load_xy(csv_path: Path) -> tuple[pd.DataFrame, pd.Series]:
 
 
 def _metrics(y_true: pd.Series, y_prob: list[float], threshold: float = 0.5) -> dict[str, Any]:
-    y_pred = [1 if p >= threshold else 0 for p in y_prob]
-
-    tn, fp, fn, tp = confusion_matrix(y_true, y_pred, labels=[0, 1]).ravel()
-
-    out: dict[str, Any] = {
-        "accuracy": float(accuracy_score(y_true, y_pred)),
-        "precision": float(precision_score(y_true, y_pred, zero_division=ZERO_DIV)),
-        "recall": float(recall_score(y_true, y_pred, zero_division=ZERO_DIV)),
-        "f1": float(f1_score(y_true, y_pred, zero_division=ZERO_DIV)),
-        "roc_auc": float(roc_auc_score(y_true, y_prob)),
-        "tp": int(tp),
-        "fp": int(fp),
-        "tn": int(tn),
-        "fn": int(fn),
-    }
-    return out
+    # accuracy, precision, recall, f1 (zero_division=0), roc_auc, tp, fp, tn, fn
+    return BinaryCurves.from_scores(y_true, y_prob).metrics_at(threshold)
 
 
 def _render_report_md(val_metrics: dict[str, Any], test_metrics: dict[str, Any]) -> str:
@@ -64,35 +73,179 @@ def _render_report_md(val_metrics: dict[str, Any], test_metrics: dict[str, Any])
     return "\n".join(lines)
 
 
-def main() -> None:
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--train", default="data/processed/train.csv")
-    ap.add_argument("--val", default="data/processed/val.csv")
-    ap.add_argument("--test", default="data/processed/test.csv")
-    ap.add_argument("--model-out", default="models/rf_clf.joblib")
-    ap.add_argument("--report-out", default="reports/rf_metrics.md")
-    ap.add_argument("--n-estimators", type=int, default=400)
-    ap.add_argument("--max-depth", type=int, default=0, help="0 means None")
-    ap.add_argument("--random-state", type=int, default=42)
-    args = ap.parse_args()
+def _bootstrap_size(n_samples: int, max_samples: int | float | None) -> int:
+    # sklearn's _get_n_samples_bootstrap without sample weights (a float truncates).
+    if max_samples is None:
+        return n_samples
+    if isinstance(max_samples, Integral):
+        return int(max_samples)
+    return max(int(max_samples * n_samples), 1)
 
-    train_path = Path(args.train)
-    val_path = Path(args.val)
-    test_path = Path(args.test)
 
-    x_train, y_train = _load_xy(train_path)
-    x_val, y_val = _load_xy(val_path)
-    x_test, y_test = _load_xy(test_path)
+def oob_curve(
+    clf: RandomForestClassifier, x: pd.DataFrame, y: Any, *, step: int = 10
+) -> pd.DataFrame:
+    """
+    OOB accuracy / F1 / ROC AUC of the first n trees, every `step` trees (and at the end).
 
-    max_depth = None if args.max_depth == 0 else args.max_depth
+    `x`, `y`: the training data the forest was fitted on. Each tree's bootstrap
+    sample is redrawn from its seed as sklearn does (RandomState(seed).randint,
+    no sample weights); rows a tree never saw are scored by it. Rows not yet
+    out-of-bag for any tree are left out (`oob_rows`).
+    """
+    if not clf.bootstrap:
+        raise ValueError("An OOB curve needs a forest fitted with bootstrap=True")
+    features = np.ascontiguousarray(x.to_numpy(dtype=np.float32))
+    labels = np.asarray(y).astype(int)
+    n = len(features)
+    n_bootstrap = _bootstrap_size(n, clf.max_samples)
+    proba_sum = np.zeros(n)
+    votes = np.zeros(n, dtype=np.int64)
+    rows = []
+    for i, tree in enumerate(clf.estimators_, start=1):
+        drawn = np.random.RandomState(tree.random_state).randint(0, n, n_bootstrap)
+        oob = np.flatnonzero(np.bincount(drawn, minlength=n) == 0)
+        proba_sum[oob] += tree.predict_proba(features[oob], check_input=False)[:, 1]
+        votes[oob] += 1
+        if i % step == 0 or i == len(clf.estimators_):
+            seen = votes > 0
+            m = BinaryCurves.from_scores(labels[seen], proba_sum[seen] / votes[seen]).metrics_at(
+                0.5
+            )
+            rows.append(
+                {
+                    "n_trees": i,
+                    "oob_rows": int(seen.sum()),
+                    "accuracy": m["accuracy"],
+                    "f1": m["f1"],
+                    "roc_auc": m["roc_auc"],
+                }
+            )
+    return pd.DataFrame(rows)
 
-    clf = RandomForestClassifier(
-        n_estimators=args.n_estimators,
+
+def tree_latency(
+    clf: RandomForestClassifier, x: pd.DataFrame, *, points: int = 4, repeats: int = 5
+) -> tuple[float, float]:
+    """
+    (seconds per extra tree, seconds for the whole forest) of single-threaded
+    predict_proba on `x`: a linear fit of the best-of-`repeats` latency of the
+    first n trees, at `points` tree counts up to the full forest.
+    """
+    n = len(clf.estimators_)
+    counts = sorted({max(1, round(n * (i + 1) / points)) for i in range(points)})
+    sub = copy.copy(clf)
+    sub.n_jobs = 1
+    latencies = []
+    for m in counts:
+        sub.estimators_ = clf.estimators_[:m]
+        sub.n_estimators = m
+        best = np.inf
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            sub.predict_proba(x)
+            best = min(best, time.perf_counter() - t0)
+        latencies.append(best)
+    if len(counts) == 1:
+        return latencies[0] / counts[0], latencies[0]
+    slope = float(np.polyfit(counts, latencies, 1)[0])
+    return slope, latencies[-1]
+
+
+def _render_trees_md(
+    *,
+    n_trees: int,
+    added: int,
+    fit_s: float,
+    latency: dict[str, tuple[float, float]],
+    curve: pd.DataFrame | None,
+    tol: float = 0.001,
+) -> str:
+    lines = ["## Trees", ""]
+    lines.append(f"- **trees**: {n_trees} ({added} fitted this run in {fit_s:.2f} s, ")
+    lines[-1] += f"{added / fit_s:.1f} trees/s)" if fit_s > 0 else "n/a trees/s)"
+    for label, (per_tree, full) in latency.items():
+        lines.append(
+            f"- **predict_proba latency, {label}**: {full * 1e3:.2f} ms for the forest, "
+            f"+{per_tree * 1e6:.1f} µs per extra tree (1 thread)"
+        )
+    if curve is not None and len(curve):
+        final = float(curve["roc_auc"].iloc[-1])
+        # Start of the final stretch inside the band, after the curve last left it.
+        outside = np.flatnonzero(np.abs(curve["roc_auc"].to_numpy() - final) > tol)
+        plateau = int(curve["n_trees"].iloc[outside[-1] + 1 if len(outside) else 0])
+        lines.append(
+            f"- **OOB ROC AUC**: {final:.4f} at {n_trees} trees; within {tol} of that from "
+            f"{plateau} trees on"
+        )
+    lines.append("")
+    return "\n".join(lines)
+
+
+def build_model(
+    *,
+    n_estimators: int = 400,
+    max_depth: int | None = None,
+    random_state: int = 42,
+    n_jobs: int = -1,
+) -> RandomForestClassifier:
+    return RandomForestClassifier(
+        n_estimators=n_estimators,
         max_depth=max_depth,
-        random_state=args.random_state,
-        n_jobs=-1,
+        random_state=random_state,
+        n_jobs=n_jobs,
     )
+
+
+def train_rf(
+    train: pd.DataFrame,
+    val: pd.DataFrame,
+    test: pd.DataFrame,
+    *,
+    model_out: Path,
+    report_out: Path,
+    n_estimators: int = 400,
+    max_depth: int | None = None,
+    random_state: int = 42,
+    n_jobs: int = -1,
+    params: dict[str, Any] | None = None,
+    base: RandomForestClassifier | None = None,
+    grow: int = 0,
+    oob_curve_out: Path | None = None,
+    curve_step: int = 10,
+) -> None:
+    """
+    Fit on train with `n_jobs` workers, evaluate on val/test, write model and report.
+
+    `params` (e.g. a search winner) override the forest's hyperparameters.
+    With `base`, `grow` trees are added to that fitted forest instead (warm
+    start; its hyperparameters are kept) and the report gets a trees section.
+    `oob_curve_out` writes oob_curve() there and adds the latency per tree.
+    """
+    x_train, y_train = _xy(train)
+    x_val, y_val = _xy(val)
+    x_test, y_test = _xy(test)
+
+    if base is not None:
+        trained_on = [str(c) for c in getattr(base, "feature_names_in_", [])]
+        if trained_on != [str(c) for c in x_train.columns]:
+            raise ValueError(f"Artifact was fitted on other features: {trained_on}")
+        clf = base
+        before = len(clf.estimators_)
+        clf.set_params(warm_start=True, n_estimators=before + grow, n_jobs=n_jobs)
+    else:
+        clf = build_model(
+            n_estimators=n_estimators,
+            max_depth=max_depth,
+            random_state=random_state,
+            n_jobs=n_jobs,
+        )
+        clf.set_params(**(params or {}))
+        before = 0
+    t0 = time.perf_counter()
     clf.fit(x_train, y_train)
+    fit_s = time.perf_counter() - t0
+    clf.set_params(warm_start=False)
 
     val_prob = [float(p[1]) for p in clf.predict_proba(x_val)]
     test_prob = [float(p[1]) for p in clf.predict_proba(x_test)]
@@ -103,15 +256,83 @@ def main() -> None:
     Path("models").mkdir(parents=True, exist_ok=True)
     Path("reports").mkdir(parents=True, exist_ok=True)
 
-    joblib.dump(clf, Path(args.model_out))
-    Path(args.report_out).write_text(_render_report_md(val_metrics, test_metrics), encoding="utf-8")
+    report = _render_report_md(val_metrics, test_metrics)
+    added = len(clf.estimators_) - before
+    if base is not None or oob_curve_out is not None:
+        curve, latency = None, {}
+        if oob_curve_out is not None:
+            curve = oob_curve(clf, x_train, y_train, step=curve_step)
+            oob_curve_out.parent.mkdir(parents=True, exist_ok=True)
+            curve.to_csv(oob_curve_out, index=False)
+            latency = {
+                "1 row": tree_latency(clf, x_test.iloc[:1]),
+                f"{len(x_test)} rows": tree_latency(clf, x_test),
+            }
+        report += "\n" + _render_trees_md(
+            n_trees=len(clf.estimators_), added=added, fit_s=fit_s, latency=latency, curve=curve
+        )
+
+    # The artifact predicts on all cores, whatever budget it was trained with.
+    clf.set_params(n_jobs=-1)
+    joblib.dump(clf, model_out)
+    report_out.write_text(report, encoding="utf-8")
 
     print("Training complete.")
-    print(f"Saved model: {args.model_out}")
-    print(f"Wrote report: {args.report_out}")
+    print(f"Fitted {added} trees in {fit_s:.2f} s ({len(clf.estimators_)} in the forest)")
+    print(f"Saved model: {model_out}")
+    print(f"Wrote report: {report_out}")
+    if oob_curve_out is not None:
+        print(f"Wrote OOB curve: {oob_curve_out}")
     print(f"VAL metrics: {val_metrics}")
     print(f"TEST metrics: {test_metrics}")
 
 
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--train", default="data/processed/train.csv")
+    ap.add_argument("--val", default="data/processed/val.csv")
+    ap.add_argument("--test", default="data/processed/test.csv")
+    ap.add_argument("--model-out", default="models/rf_clf.joblib")
+    ap.add_argument("--report-out", default="reports/rf_metrics.md")
+    ap.add_argument("--n-estimators", type=int, default=400)
+    ap.add_argument("--max-depth", type=int, default=0, help="0 means None")
+    ap.add_argument("--random-state", type=int, default=42)
+    ap.add_argument(
+        "--params", default=None, help="Winning-config JSON of mlproj.models.search (overrides)"
+    )
+    ap.add_argument(
+        "--grow", type=int, default=None, help="Add this many trees to --model-in (warm start)"
+    )
+    ap.add_argument("--model-in", default=None, help="Forest to grow (default: --model-out)")
+    ap.add_argument("--oob-curve", default=None, help="Write OOB metrics vs tree count (CSV)")
+    ap.add_argument("--curve-step", type=int, default=10, help="Trees between OOB curve points")
+    args = ap.parse_args()
+
+    base = None
+    if args.grow is not None:
+        if args.grow < 1 or args.params:
+            raise SystemExit("--grow needs K >= 1 and keeps the artifact's hyperparameters")
+        model_in = Path(args.model_in or args.model_out)
+        base = joblib.load(model_in)
+        if not isinstance(base, RandomForestClassifier):
+            raise SystemExit(f"Not a RandomForestClassifier artifact: {model_in}")
+
+    train_rf(
+        read_table(args.train),
+        read_table(args.val),
+        read_table(args.test),
+        model_out=Path(args.model_out),
+        report_out=Path(args.report_out),
+        n_estimators=args.n_estimators,
+        max_depth=None if args.max_depth == 0 else args.max_depth,
+        random_state=args.random_state,
+        params=load_best_params(Path(args.params), "rf") if args.params else None,
+        base=base,
+        grow=args.grow or 0,
+        oob_curve_out=Path(args.oob_curve) if args.oob_curve else None,
+        curve_step=args.curve_step,
+    )
+
+
 if __name__ == "__main__":
     main()
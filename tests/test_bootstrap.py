@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from mlproj.evaluation.bootstrap import _unique_rows, bootstrap_metrics, percentile_interval
+from mlproj.evaluation.curves import BinaryCurves
+
+
+def _data(n: int = 80) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, n)
+    p = np.round(np.clip(0.4 * y + 0.6 * rng.random(n), 0, 1), 2)
+    return y, (p >= 0.5).astype(int), p
+
+
+def test_cell_bootstrap_matches_resampling_rows() -> None:
+    y, pred, p = _data()
+    boot = bootstrap_metrics(y, {"m": (pred, p)}, n_resamples=20_000, seed=1)
+
+    rng = np.random.default_rng(2)
+    auc, f1 = [], []
+    for idx in rng.integers(0, len(y), (4000, len(y))):
+        curves = BinaryCurves.from_scores(y[idx], p[idx])
+        auc.append(curves.roc_auc())
+        f1.append(curves.metrics_at(0.5)["f1"])
+
+    for metric, naive in (("roc_auc", auc), ("f1", f1)):
+        lo, hi = boot.interval("m", metric)
+        ref_lo, ref_hi = np.nanpercentile(naive, [2.5, 97.5])
+        assert abs(lo - ref_lo) < 0.02 and abs(hi - ref_hi) < 0.02
+
+
+def test_bootstrap_is_seeded_and_independent_of_workers() -> None:
+    y, pred, p = _data()
+    models = {"a": (pred, p), "b": (1 - pred, None)}
+    one = bootstrap_metrics(y, models, n_resamples=1200, seed=7)
+    two = bootstrap_metrics(y, models, n_resamples=1200, seed=7, workers=2)
+    assert np.array_equal(one.samples["a"]["roc_auc"], two.samples["a"]["roc_auc"])
+    assert not np.array_equal(
+        one.samples["a"]["f1"],
+        bootstrap_metrics(y, models, n_resamples=1200, seed=8).samples["a"]["f1"],
+    )
+    assert set(one.samples["b"]) == {"accuracy", "precision", "recall", "f1"}
+
+
+def test_paired_difference_of_a_model_with_itself_is_zero() -> None:
+    y, pred, p = _data()
+    boot = bootstrap_metrics(y, {"a": (pred, p), "b": (pred, p)}, n_resamples=500)
+    assert boot.diff_interval("a", "b", "f1") == (0.0, 0.0)
+
+
+def test_many_distinct_scores_are_binned_for_resampling() -> None:
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, 20_000)
+    p = rng.random(20_000)
+    boot = bootstrap_metrics(y, {"m": ((p >= 0.5).astype(int), p)}, n_resamples=100, max_bins=64)
+    assert boot.score_bins == 64 and boot.cells <= 4 * 64
+    assert all(np.isnan(percentile_interval(np.array([np.nan, np.nan]))))
+    with pytest.raises(ValueError, match="0/1"):
+        bootstrap_metrics([0, 2], {"m": ([0, 1], None)})
+
+
+def test_weighted_entries_resample_like_the_rows_they_stand_for() -> None:
+    y, pred, p = _data()
+    rows = bootstrap_metrics(y, {"m": (pred, p)}, n_resamples=300, seed=3)
+
+    key = np.stack([y, pred, p])
+    uniq, weights = np.unique(key, axis=1, return_counts=True)
+    collapsed = bootstrap_metrics(
+        uniq[0], {"m": (uniq[1], uniq[2])}, n_resamples=300, seed=3, weights=weights
+    )
+    assert collapsed.cells == rows.cells
+    for metric, values in rows.samples["m"].items():
+        assert np.array_equal(collapsed.samples["m"][metric], values, equal_nan=True)
+
+
+def test_intervals_contain_the_estimates_when_many_models_share_the_rows() -> None:
+    rng = np.random.default_rng(0)
+    n = 200_000
+    y = (rng.random(n) < 0.45).astype(int)
+    base = 0.35 * y + 0.65 * rng.random(n)
+    probas = [np.clip(base + rng.normal(0.0, 0.05, n), 0.0, 1.0) for _ in range(4)]
+    models = {f"m{i}": ((p >= 0.5).astype(int), p) for i, p in enumerate(probas)}
+
+    boot = bootstrap_metrics(y, models, n_resamples=200, seed=0)
+
+    assert not boot.paired_scores and boot.score_bins == 1024
+    for name, (_, p) in models.items():
+        curves = BinaryCurves.from_scores(y, p)
+        estimates = {
+            "roc_auc": curves.roc_auc(),
+            "average_precision": curves.average_precision(),
+            "f1": curves.metrics_at(0.5)["f1"],
+        }
+        for metric, value in estimates.items():
+            lo, hi = boot.interval(name, metric)
+            assert lo <= value <= hi, (name, metric, value, lo, hi)
+
+
+def test_cells_do_not_merge_when_the_packed_key_would_overflow() -> None:
+    rng = np.random.default_rng(0)
+    columns = [rng.integers(0, 2**20, 1000) for _ in range(4)]  # radix product 2**80
+    sizes, uniq = _unique_rows(columns, None)
+    assert len(uniq) == len(np.unique(np.stack(columns, axis=1), axis=0)) == 1000
+    assert sizes.sum() == 1000
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlproj.inference.cache import (
+    DiskTier,
+    PredictionCache,
+    add_cache_args,
+    cache_from_args,
+    check_cache_args,
+    row_keys,
+)
+
+
+def _scorer(calls: list[np.ndarray]):
+    def score(frame: pd.DataFrame) -> np.ndarray:
+        calls.append(frame.index.to_numpy())
+        return frame["a"].to_numpy() * 0.1 + frame["b"].to_numpy() * 0.01
+
+    return score
+
+
+def test_cache_scores_only_distinct_misses_and_returns_identical_values() -> None:
+    frame = pd.DataFrame({"a": [1.0, 2.0, 1.0, 3.0, 2.0], "b": [0.0, 1.0, 0.0, np.nan, 1.0]})
+    calls: list[np.ndarray] = []
+    score = _scorer(calls)
+    cached = PredictionCache("m").wrap(score)
+
+    first = cached(frame)
+    assert np.array_equal(first, score(frame), equal_nan=True)
+    assert calls[0].tolist() == [0, 1, 3]
+
+    calls.clear()
+    again = cached(frame.iloc[::-1].reset_index(drop=True))
+    assert calls == [] and np.array_equal(again, first[::-1], equal_nan=True)
+
+
+def test_row_keys_treat_signed_zero_and_nan_payloads_as_equal() -> None:
+    nan2 = np.frombuffer(np.uint64(0x7FF8000000000001).tobytes(), dtype=np.float64)[0]
+    x = np.array([[0.0, np.nan], [-0.0, nan2], [0.0, 1.0]])
+    keys = row_keys(x)
+    assert keys[0] == keys[1] != keys[2]
+
+
+def test_memory_tier_is_a_bounded_lru() -> None:
+    calls: list[np.ndarray] = []
+    cache = PredictionCache("m", max_entries=2)
+    cached = cache.wrap(_scorer(calls))
+    row = {
+        k: pd.DataFrame({"a": [v], "b": [0.0]}) for k, v in zip("xyz", [1.0, 2.0, 3.0], strict=True)
+    }
+
+    for k in "xyxz":
+        cached(row[k])
+    assert len(cache._memory) == 2
+    calls.clear()
+    cached(row["x"])  # recently used: kept
+    cached(row["y"])  # least recently used: evicted by z
+    assert len(calls) == 1
+    assert cache.stats.memory_hits == 2 and cache.stats.misses == 4
+
+
+def test_disk_tier_persists_across_instances_and_stays_under_its_size_bound(
+    tmp_path: Path,
+) -> None:
+    db = tmp_path / "cache.sqlite"
+    frame = pd.DataFrame({"a": np.arange(50.0), "b": np.zeros(50)})
+    calls: list[np.ndarray] = []
+
+    first = PredictionCache("m", disk=DiskTier(db, max_bytes=1 << 20))
+    expected = first.wrap(_scorer(calls))(frame)
+    first.close()
+
+    second = PredictionCache("m", disk=DiskTier(db, max_bytes=1 << 20))
+    calls.clear()
+    assert np.array_equal(second.wrap(_scorer(calls))(frame), expected)
+    assert calls == [] and second.stats.disk_hits == 50
+    assert second.stats.prior_seconds_per_row is not None
+    second.close()
+
+    # Another model's entries are separate.
+    other = PredictionCache("other", disk=DiskTier(db, max_bytes=1 << 20))
+    other.wrap(_scorer(calls))(frame)
+    assert other.stats.misses == 50
+    other.close()
+
+    small = DiskTier(tmp_path / "small.sqlite", max_bytes=16 * 4096)
+    big = pd.DataFrame({"a": np.arange(5000.0), "b": np.ones(5000)})
+    PredictionCache("m", max_entries=0, disk=small).wrap(_scorer(calls))(big)
+    assert small.live_bytes() <= 16 * 4096
+    (kept,) = small._db.execute("SELECT COUNT(*) FROM predictions").fetchone()
+    assert 0 < kept < 5000  # eviction trims the oldest entries, not the whole batch
+    small.close()
+
+
+def test_permuted_columns_do_not_hit_entries_of_another_layout() -> None:
+    frame = pd.DataFrame({"a": [1.0, 2.0], "b": [3.0, 4.0]})
+    calls: list[np.ndarray] = []
+    cached = PredictionCache("m").wrap(_scorer(calls))
+    cached(frame)
+    calls.clear()
+    # Same raw rows in another column order: must be scored, not served a's scores.
+    permuted = pd.DataFrame({"b": [1.0, 2.0], "a": [3.0, 4.0]})
+    assert np.array_equal(cached(permuted), _scorer([])(permuted))
+    assert len(calls) == 1
+
+
+def test_cache_options_build_a_memory_tier_and_add_disk_only_with_cache_dir(
+    tmp_path: Path,
+) -> None:
+    ap = argparse.ArgumentParser()
+    add_cache_args(ap)
+    model = tmp_path / "model.joblib"
+    model.write_bytes(b"model")
+
+    assert cache_from_args(ap.parse_args([]), model) is None
+    memory = cache_from_args(ap.parse_args(["--cache-entries", "10"]), model)
+    assert memory is not None and memory.disk is None and memory.max_entries == 10
+    both = cache_from_args(ap.parse_args(["--cache", "--cache-dir", str(tmp_path)]), model)
+    assert both is not None and both.disk is not None
+    both.close()
+
+    for argv in (["--cache"], ["--cache-entries", "10"], ["--cache-dir", str(tmp_path)]):
+        with pytest.raises(SystemExit):
+            check_cache_args(ap, ap.parse_args(argv), workers=2)
+    with pytest.raises(SystemExit):
+        check_cache_args(ap, ap.parse_args(["--cache-max-mb", "1"]))
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.calibration import calibration_curve
+from sklearn.metrics import brier_score_loss
+
+from mlproj.evaluation.calibration import (
+    CalibrationAccumulator,
+    calibration_from_arrays,
+    render_calibration_summary,
+    stream_calibration,
+)
+
+
+def _scores(n: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    proba = np.round(rng.random(n), 2)  # many scores exactly on bin edges
+    y = (rng.random(n) < proba**2).astype(int)
+    return y, proba
+
+
+def test_matches_sklearn_reliability_curve_and_brier() -> None:
+    y, proba = _scores(2_000, 0)
+    acc = calibration_from_arrays(y, proba, bins=10)
+    prob_true, prob_pred = calibration_curve(y, proba, n_bins=10)
+    curve = acc.curve()
+    np.testing.assert_allclose(curve["frac_positive"], prob_true)
+    np.testing.assert_allclose(curve["mean_proba"], prob_pred)
+
+    summary = acc.summary()
+    assert summary["brier"] == pytest.approx(brier_score_loss(y, proba))
+    gaps = np.abs(prob_true - prob_pred)
+    assert summary["mce"] == pytest.approx(gaps.max())
+    assert summary["ece"] == pytest.approx((curve["count"] * gaps).sum() / len(y))
+
+
+def test_chunks_and_merge_match_one_pass() -> None:
+    y, proba = _scores(1_000, 1)
+    whole = calibration_from_arrays(y, proba)
+    merged = CalibrationAccumulator.empty()
+    for part in np.array_split(np.arange(len(y)), 7):
+        merged.merge(calibration_from_arrays(y[part], proba[part]))
+    pd.testing.assert_frame_equal(merged.curve(), whole.curve())
+    assert merged.summary() == pytest.approx(whole.summary())
+
+
+def test_stream_calibration_reads_prediction_files(tmp_path: Path) -> None:
+    y, proba = _scores(500, 2)
+    pd.DataFrame({"x": 0.0, "target": y}).to_csv(tmp_path / "input.csv", index=False)
+    preds = pd.DataFrame({"row_id": np.arange(len(y)), "proba_disease": proba})
+    preds["pred"] = (proba >= 0.5).astype(int)
+    preds.to_csv(tmp_path / "preds.csv", index=False)
+
+    acc = stream_calibration(tmp_path / "input.csv", tmp_path / "preds.csv", chunksize=64)
+    pd.testing.assert_frame_equal(acc.curve(), calibration_from_arrays(y, proba).curve())
+
+    md = render_calibration_summary(acc)
+    assert md.startswith("# Calibration summary")
+    assert "**ECE (10 equal-width bins):**" in md
+    assert "| [0.00, 0.10] |" in md
+
+
+def test_rejects_scores_outside_unit_interval() -> None:
+    with pytest.raises(ValueError, match=r"\[0, 1\]"):
+        calibration_from_arrays([0, 1], [0.2, 1.5])
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.isotonic import IsotonicRegression
+
+from mlproj.inference.calibrator import (
+    fit_calibrator,
+    fit_platt_params,
+    load_calibrator,
+    save_calibrator,
+)
+from mlproj.inference.predict_rf import main as predict_rf_main
+from mlproj.inference.sharded import predict_sharded
+
+
+def _val(n: int = 2_000, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    proba = rng.random(n)
+    y = (rng.random(n) < proba**2).astype(int)  # over-confident scores
+    return y, proba
+
+
+def test_isotonic_lookup_matches_sklearn_predict(tmp_path: Path) -> None:
+    y, proba = _val()
+    cal = fit_calibrator(y, proba, "isotonic")
+    save_calibrator(cal, tmp_path / "iso.calib")
+    loaded = load_calibrator(tmp_path / "iso.calib")
+
+    iso = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds="clip").fit(proba, y)
+    grid = np.r_[np.linspace(0.0, 1.0, 1_001), proba]
+    np.testing.assert_allclose(loaded.apply(grid), iso.predict(grid), rtol=0, atol=1e-12)
+
+
+def test_platt_is_identity_on_calibrated_scores_and_corrects_overconfidence() -> None:
+    rng = np.random.default_rng(1)
+    proba = 1.0 / (1.0 + np.exp(-rng.normal(scale=2.0, size=20_000)))
+    y = (rng.random(len(proba)) < proba).astype(int)
+    a, b = fit_platt_params(y, proba)
+    assert a == pytest.approx(1.0, abs=0.05) and b == pytest.approx(0.0, abs=0.05)
+
+    y, proba = _val()
+    cal = fit_calibrator(y, proba, "platt")
+    # At p = 0.5 the true rate is 0.25: calibration pulls the score down.
+    assert cal.apply([0.5])[0] < 0.4
+    assert np.all(np.diff(cal.apply(np.linspace(0.0, 1.0, 101))) >= 0)
+    assert cal.apply([0.0, 1.0]).tolist() == pytest.approx([0.0, 1.0], abs=1e-3)
+
+
+def test_predict_rf_applies_calibrator_single_and_sharded(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({"a": rng.normal(size=300), "b": rng.normal(size=300)})
+    df["target"] = (df["a"] + rng.normal(size=300) > 0).astype(int)
+    clf = RandomForestClassifier(n_estimators=10, random_state=0).fit(df[["a", "b"]], df["target"])
+    joblib.dump(clf, tmp_path / "rf.joblib")
+    df.to_csv(tmp_path / "in.csv", index=False)
+    cal = fit_calibrator(df["target"], clf.predict_proba(df[["a", "b"]])[:, 1], "isotonic")
+    save_calibrator(cal, tmp_path / "rf.calib")
+
+    argv = [
+        "predict_rf",
+        "--input",
+        str(tmp_path / "in.csv"),
+        "--model",
+        str(tmp_path / "rf.joblib"),
+    ]
+    argv += ["--calibrator", str(tmp_path / "rf.calib"), "--out", str(tmp_path / "out.csv")]
+    monkeypatch.setattr("sys.argv", argv)
+    predict_rf_main()
+    out = pd.read_csv(tmp_path / "out.csv")
+    expected = cal.apply(clf.predict_proba(df[["a", "b"]])[:, 1])
+    np.testing.assert_allclose(out["proba_disease"], expected)
+    assert out["pred"].tolist() == (expected >= 0.5).astype(int).tolist()
+
+    predict_sharded(
+        tmp_path / "in.csv",
+        tmp_path / "sharded.csv",
+        model_path=tmp_path / "rf.joblib",
+        threshold=0.5,
+        workers=2,
+        calibrator_path=tmp_path / "rf.calib",
+    )
+    assert (tmp_path / "sharded.csv").read_bytes() == (tmp_path / "out.csv").read_bytes()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlproj.data.columnar import cache_dir, read_table
+
+
+def _write(path: Path, n: int = 50, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "age": rng.integers(30, 80, n),
+            "chol": rng.normal(240.0, 40.0, n).round(3),
+            "ca": np.where(rng.random(n) < 0.1, np.nan, rng.integers(0, 4, n)),
+            "target": rng.integers(0, 2, n),
+        }
+    )
+    df.to_csv(path, index=False)
+    return df
+
+
+def _versions(path: Path) -> list[str]:
+    return sorted(p.name for p in cache_dir(path).glob("*.cols"))
+
+
+def test_cached_reads_match_read_csv(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "train.csv"
+    _write(path)
+    expected = pd.read_csv(path)
+
+    pd.testing.assert_frame_equal(read_table(path, cache=True), expected)  # cold: parses and builds
+    assert len(_versions(path)) == 1
+
+    def no_parse(*args: object, **kwargs: object) -> pd.DataFrame:
+        raise AssertionError("warm read parsed the CSV")
+
+    monkeypatch.setattr(pd, "read_csv", no_parse)
+    warm = read_table(path, cache=True)
+    pd.testing.assert_frame_equal(warm, expected)
+    warm.loc[0, "age"] = 5  # a copy: writable, like a parsed CSV
+    mapped = read_table(path, cache=True, readonly=True)
+    pd.testing.assert_frame_equal(mapped, expected)
+    with pytest.raises(ValueError, match="read-only"):  # memory-mapped, no copy
+        mapped.loc[0, "age"] = 5
+
+    subset = read_table(path, cache=True, columns=["target", "age"])  # file order, like usecols
+    assert list(subset.columns) == ["age", "target"]
+    with pytest.raises(ValueError, match="not found"):
+        read_table(path, cache=True, columns=["nope"])
+
+
+def test_changed_csv_rebuilds_and_touched_csv_does_not(tmp_path: Path) -> None:
+    path = tmp_path / "val.csv"
+    _write(path, seed=0)
+    read_table(path, cache=True)
+    first = _versions(path)
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))  # touch only
+    read_table(path, cache=True)
+    assert _versions(path) == first
+
+    changed = _write(path, seed=1)
+    pd.testing.assert_frame_equal(read_table(path, cache=True), pd.read_csv(path))
+    assert read_table(path, cache=True)["age"].tolist() == changed["age"].tolist()
+    assert len(_versions(path)) == 1 and _versions(path) != first  # old version removed
+
+
+def test_non_numeric_tables_are_not_cached(tmp_path: Path) -> None:
+    path = tmp_path / "ids.csv"
+    pd.DataFrame({"id": ["a", "b"], "x": [1.0, 2.0]}).to_csv(path, index=False)
+    pd.testing.assert_frame_equal(read_table(path, cache=True), pd.read_csv(path))
+    assert not cache_dir(path).exists()
+
+
+def test_only_processed_splits_are_cached_by_default(tmp_path: Path) -> None:
+    adhoc = tmp_path / "inputs/batch.csv"
+    adhoc.parent.mkdir()
+    _write(adhoc)
+    read_table(adhoc)
+    assert not cache_dir(adhoc).exists()
+
+    split = tmp_path / "data/processed/test.csv"
+    split.parent.mkdir(parents=True)
+    _write(split)
+    read_table(split)
+    assert len(_versions(split)) == 1
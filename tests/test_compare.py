@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+from mlproj.evaluation import compare
+from mlproj.evaluation.eval_predictions import compute_metrics
+from mlproj.evaluation.pick_best_threshold import pick_best_threshold
+from mlproj.evaluation.sweep_thresholds import sweep_exact
+from mlproj.inference.calibrator import fit_calibrator
+
+
+def _split(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    a, b = rng.normal(size=n), rng.normal(size=n)
+    target = (a + 0.5 * b + rng.normal(scale=0.8, size=n) > 0).astype(int)
+    return pd.DataFrame({"a": a, "b": b, "target": target})
+
+
+def _manifest(tmp_path: Path) -> Path:
+    train = _split(120, 0)
+    _split(60, 1).to_csv(tmp_path / "val.csv", index=False)
+    _split(60, 2).to_csv(tmp_path / "test.csv", index=False)
+    x, y = train[["a", "b"]], train["target"]
+    joblib.dump(LogisticRegression().fit(x, y), tmp_path / "lr.joblib")
+    joblib.dump(
+        RandomForestClassifier(n_estimators=15, random_state=0).fit(x, y), tmp_path / "rf.joblib"
+    )
+    manifest = {
+        "metric": "f1",
+        "val": str(tmp_path / "val.csv"),
+        "test": str(tmp_path / "test.csv"),
+        "models": [
+            {"name": "lr", "artifact": str(tmp_path / "lr.joblib")},
+            {"name": "rf", "artifact": str(tmp_path / "rf.joblib"), "threshold": 0.4},
+        ],
+    }
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(manifest), encoding="utf-8")
+    return path
+
+
+def test_engine_matches_the_per_model_tuning_chain(tmp_path: Path) -> None:
+    manifest = compare.load_manifest(_manifest(tmp_path))
+    results = compare.evaluate_all(manifest, metric="f1")
+    lr, rf = results
+
+    val, test = pd.read_csv(tmp_path / "val.csv"), pd.read_csv(tmp_path / "test.csv")
+    model = joblib.load(tmp_path / "lr.joblib")
+    val_proba = model.predict_proba(val[["a", "b"]])[:, 1]
+    expected = pick_best_threshold(sweep_exact(val["target"], pd.Series(val_proba)), "f1")
+    assert lr.tuned and lr.threshold == expected
+
+    test_proba = model.predict_proba(test[["a", "b"]])[:, 1]
+    pred = (test_proba >= expected).astype(int)
+    assert lr.metrics == compute_metrics(test["target"].to_numpy(), pred, test_proba)
+    assert not rf.tuned and rf.threshold == 0.4
+
+    parallel = compare.evaluate_all(manifest, metric="f1", workers=2)
+    assert [r.metrics for r in parallel] == [r.metrics for r in results]
+
+
+def test_cli_writes_report_and_json(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    manifest = _manifest(tmp_path)
+    out, json_out = tmp_path / "cmp.md", tmp_path / "cmp.json"
+    argv = ["--manifest", str(manifest), "--out", str(out), "--json-out", str(json_out)]
+    monkeypatch.setattr("sys.argv", ["prog", *argv, "--bootstrap", "200"])
+    compare.main()
+
+    report = out.read_text(encoding="utf-8")
+    assert "| lr | " in report and "| rf | `0.400` | fixed |" in report
+    assert "val-tuned thresholds" not in report  # the policy is per row
+    assert "Paired bootstrap" in report
+    payload = json.loads(json_out.read_text(encoding="utf-8"))
+    assert payload["models"]["rf"]["threshold_policy"] == "fixed"
+    assert "roc_auc" in payload["models"]["lr"]["ci"]["metrics"]
+
+
+def test_manifest_rejects_bad_threshold_policies(tmp_path: Path) -> None:
+    path = tmp_path / "m.json"
+    path.write_text(
+        json.dumps(
+            {
+                "val": "v",
+                "test": "t",
+                "models": [{"name": "x", "artifact": "a", "threshold": "best"}],
+            }
+        ),
+        encoding="utf-8",
+    )
+    with pytest.raises(ValueError, match="tune"):
+        compare.load_manifest(path)
+
+
+def test_calibrated_model_is_tuned_on_calibrated_val_scores(tmp_path: Path) -> None:
+    manifest = compare.load_manifest(_manifest(tmp_path))
+    spec = compare.ModelSpec("lr", tmp_path / "lr.joblib", None, calibration="platt")
+    result = compare.evaluate_model(spec, metric="f1", val=manifest.val, test=manifest.test)
+
+    val, test = pd.read_csv(tmp_path / "val.csv"), pd.read_csv(tmp_path / "test.csv")
+    model = joblib.load(tmp_path / "lr.joblib")
+    cal = fit_calibrator(val["target"], model.predict_proba(val[["a", "b"]])[:, 1], "platt")
+    val_proba = cal.apply(model.predict_proba(val[["a", "b"]])[:, 1])
+    expected = pick_best_threshold(sweep_exact(val["target"], pd.Series(val_proba)), "f1")
+    assert result.calibration == "platt" and result.threshold == expected
+    np.testing.assert_array_equal(
+        result.test_proba, cal.apply(model.predict_proba(test[["a", "b"]])[:, 1])
+    )
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from mlproj.inference.compiled_forest import (
+    compile_forest,
+    load_compiled_forest,
+    save_compiled_forest,
+)
+
+
+def _fitted_forest() -> tuple[RandomForestClassifier, pd.DataFrame]:
+    rng = np.random.default_rng(0)
+    x = pd.DataFrame(rng.normal(size=(300, 4)), columns=["a", "b", "c", "d"])
+    y = ((x["a"] + x["b"] * x["c"] + rng.normal(scale=0.5, size=300)) > 0).astype(int)
+    x.iloc[::9, 1] = np.nan
+    clf = RandomForestClassifier(n_estimators=25, min_samples_leaf=2, random_state=0)
+    return clf.fit(x, y), x
+
+
+def test_compiled_forest_probabilities_are_identical_to_sklearn() -> None:
+    clf, x = _fitted_forest()
+    compiled = compile_forest(clf)
+
+    rng = np.random.default_rng(1)
+    x_new = pd.DataFrame(rng.normal(size=(500, 4)), columns=x.columns)
+    x_new.iloc[::5, 1] = np.nan
+
+    assert np.array_equal(
+        compiled.proba(x_new.to_numpy()), np.asarray(clf.predict_proba(x_new))[:, 1]
+    )
+    assert np.array_equal(compiled.proba(x.to_numpy()), np.asarray(clf.predict_proba(x))[:, 1])
+
+
+def test_compiled_forest_roundtrips_through_memory_mapped_file(tmp_path) -> None:
+    clf, x = _fitted_forest()
+    compiled = compile_forest(clf)
+
+    save_compiled_forest(compiled, tmp_path / "rf.trees")
+    loaded = load_compiled_forest(tmp_path / "rf.trees")
+
+    assert isinstance(loaded.children, np.memmap)
+    assert loaded.feature_names == ("a", "b", "c", "d")
+    assert loaded.n_trees == 25
+    assert np.array_equal(loaded.proba(x.to_numpy()), compiled.proba(x.to_numpy()))
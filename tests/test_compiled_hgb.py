@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier
+
+from mlproj.inference.compiled_hgb import compile_hgb, load_compiled_hgb, save_compiled_hgb
+from mlproj.inference.registry import load_model
+
+
+def _fitted_hgb() -> tuple[HistGradientBoostingClassifier, pd.DataFrame]:
+    rng = np.random.default_rng(0)
+    x = pd.DataFrame(rng.normal(size=(400, 4)), columns=["a", "b", "c", "d"])
+    y = ((x["a"] + x["b"] * x["c"] + rng.normal(scale=0.5, size=400)) > 0).astype(int)
+    x.iloc[::7, 2] = np.nan
+    clf = HistGradientBoostingClassifier(max_iter=40, max_leaf_nodes=15, random_state=0)
+    return clf.fit(x, y), x
+
+
+def test_compiled_hgb_scores_match_sklearn_for_both_methods() -> None:
+    clf, x = _fitted_hgb()
+    compiled = compile_hgb(clf)
+
+    rng = np.random.default_rng(1)
+    x_new = pd.DataFrame(rng.normal(scale=1.5, size=(500, 4)), columns=x.columns)
+    x_new.iloc[::5, 2] = np.nan
+    x_new.iloc[::11, 0] = np.nan
+
+    expected = np.asarray(clf.decision_function(x_new))
+    assert np.array_equal(compiled.decision_function(x_new.to_numpy()), expected)
+    assert np.array_equal(compiled.decision_function(x_new.to_numpy(), method="nodes"), expected)
+    assert np.array_equal(compiled.bin_features(x_new.to_numpy()), clf._bin_mapper.transform(x_new))
+    np.testing.assert_allclose(
+        compiled.proba(x_new.to_numpy()),
+        np.asarray(clf.predict_proba(x_new))[:, 1],
+        rtol=0,
+        atol=1e-15,
+    )
+
+
+def test_compiled_hgb_roundtrips_and_loads_through_registry(tmp_path) -> None:
+    clf, x = _fitted_hgb()
+    compiled = compile_hgb(clf)
+
+    path = tmp_path / "hgb.trees"
+    save_compiled_hgb(compiled, path)
+    loaded = load_compiled_hgb(path)
+    via_registry = load_model(path)
+
+    assert isinstance(loaded.leaf_masks, np.memmap)
+    assert loaded.baseline == compiled.baseline
+    assert loaded.n_trees == 40
+    assert np.array_equal(loaded.proba(x.to_numpy()), compiled.proba(x.to_numpy()))
+    assert np.array_equal(via_registry.proba(x.to_numpy()), compiled.proba(x.to_numpy()))
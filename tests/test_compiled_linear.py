@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+
+from mlproj.inference.compiled_linear import (
+    compile_pipeline,
+    load_compiled_linear,
+    save_compiled_linear,
+)
+from mlproj.models.train_baseline import build_pipeline
+
+
+def _fitted_pipeline() -> tuple[Pipeline, pd.DataFrame]:
+    rng = np.random.default_rng(0)
+    x = pd.DataFrame(rng.normal(loc=[50, 1, 200], scale=[10, 0.5, 40], size=(200, 3)))
+    x.columns = ["age", "sex", "chol"]
+    y = (x["age"] + rng.normal(scale=10, size=200) > 50).astype(int)
+    x.iloc[::7, 2] = np.nan
+    pipe = build_pipeline(x)
+    pipe.fit(x, y)
+    return pipe, x
+
+
+def test_compiled_pipeline_matches_predict_proba_including_nans() -> None:
+    pipe, x = _fitted_pipeline()
+    compiled = compile_pipeline(pipe)
+
+    expected = pipe.predict_proba(x)
+    got = compiled.predict_proba(x[list(compiled.feature_names)].to_numpy())
+
+    np.testing.assert_allclose(got, expected, rtol=0, atol=1e-12)
+
+
+def test_compiled_model_roundtrips_through_npz(tmp_path) -> None:
+    pipe, x = _fitted_pipeline()
+    compiled = compile_pipeline(pipe)
+
+    save_compiled_linear(compiled, tmp_path / "m.npz")
+    loaded = load_compiled_linear(tmp_path / "m.npz")
+
+    assert loaded.feature_names == ("age", "sex", "chol")
+    np.testing.assert_array_equal(loaded.proba(x.to_numpy()), compiled.proba(x.to_numpy()))
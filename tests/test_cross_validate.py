@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.model_selection import RepeatedStratifiedKFold, cross_val_score
+
+from mlproj.models.cross_validate import (
+    _STATE,
+    cross_validate,
+    load_grid,
+    load_state,
+    make_estimator,
+)
+
+GRID = {
+    "baseline": {"C": [0.1, 1.0]},
+    "rf": {"n_estimators": [20], "max_depth": [3, None]},
+    "hgb": {"max_iter": [20]},
+}
+
+
+def _dev(tmp_path: Path, n: int = 120) -> list[Path]:
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(n, 4))
+    df = pd.DataFrame(x, columns=["age", "chol", "thalach", "oldpeak"])
+    df["target"] = (x[:, 0] - x[:, 1] + rng.normal(scale=1.0, size=n) > 0).astype(int)
+    paths = [tmp_path / "train.csv", tmp_path / "val.csv"]
+    df.iloc[:90].to_csv(paths[0], index=False)
+    df.iloc[90:].to_csv(paths[1], index=False)
+    return paths
+
+
+def test_scores_match_cross_val_score_and_workers(tmp_path: Path) -> None:
+    paths = _dev(tmp_path)
+    grid_path = tmp_path / "grid.json"
+    grid_path.write_text(json.dumps(GRID), encoding="utf-8")
+    grid = load_grid(grid_path)
+
+    results, oof = cross_validate(grid, paths, n_splits=3, n_repeats=2, seed=0)
+
+    df = pd.concat([pd.read_csv(p) for p in paths], ignore_index=True)
+    x, y = df.drop(columns=["target"]), df["target"]
+    cv = RepeatedStratifiedKFold(n_splits=3, n_repeats=2, random_state=0)
+    for row in results.itertuples(index=False):
+        est = make_estimator(str(row.model), json.loads(str(row.params)), x)
+        expected = cross_val_score(est, x, y, cv=cv, scoring="roc_auc")
+        assert row.mean == pytest.approx(expected.mean(), abs=1e-12)
+        assert row.std == pytest.approx(expected.std(), abs=1e-12)
+
+    assert list(oof.columns[:2]) == ["row_id", "target"]
+    assert len(oof) == len(df) and oof["target"].tolist() == y.tolist()
+    for model in GRID:
+        assert oof[f"proba_{model}"].between(0.0, 1.0).all()
+
+    parallel, parallel_oof = cross_validate(grid, paths, n_splits=3, n_repeats=2, seed=0, workers=2)
+    pd.testing.assert_frame_equal(parallel, results)
+    pd.testing.assert_frame_equal(parallel_oof, oof)
+
+
+def test_load_grid_rejects_unknown_models(tmp_path: Path) -> None:
+    path = tmp_path / "grid.json"
+    path.write_text(json.dumps({"svm": {"C": [1.0]}}), encoding="utf-8")
+    with pytest.raises(ValueError, match="svm"):
+        load_grid(path)
+
+
+def test_forest_threads_are_capped_only_when_folds_run_in_parallel(tmp_path: Path) -> None:
+    paths = _dev(tmp_path)
+    for threads, n_jobs in ((None, -1), (1, 1)):
+        load_state(paths, {"rf": [{}]}, "roc_auc", 3, 1, 0, threads)
+        assert _STATE["n_jobs"] == n_jobs
+    x = pd.read_csv(paths[0]).drop(columns=["target"])
+    assert make_estimator("rf", {}, x).n_jobs == -1
+    assert make_estimator("rf", {}, x, n_jobs=1).n_jobs == 1
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from sklearn.metrics import (
+    accuracy_score,
+    average_precision_score,
+    confusion_matrix,
+    f1_score,
+    precision_recall_curve,
+    precision_score,
+    recall_score,
+    roc_auc_score,
+)
+
+from mlproj.evaluation.curves import BinaryCurves, pareto_downsample, pareto_mask
+from mlproj.evaluation.metrics import THRESHOLD_METRICS
+
+
+@pytest.mark.parametrize("scores", ["continuous", "tied", "signed"])
+def test_sweep_matches_sklearn_metrics_exactly(scores: str) -> None:
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, 300)
+    p = {
+        "continuous": np.clip(0.3 * y + 0.7 * rng.random(300), 0, 1),
+        "tied": rng.choice([0.0, 0.1, 0.5, 0.9, 1.0], 300),
+        "signed": rng.normal(size=300) + y,
+    }[scores]
+    thresholds = np.r_[np.arange(0.0, 1.0001, 0.05), p[:5]]
+
+    curves = BinaryCurves.from_scores(y, p)
+    df = curves.sweep(thresholds)
+
+    assert curves.roc_auc() == roc_auc_score(y, p)
+    for t, row in zip(thresholds, df.itertuples(), strict=True):
+        pred = (p >= t).astype(int)
+        tn, fp, fn, tp = confusion_matrix(y, pred, labels=[0, 1]).ravel()
+        assert (row.tp, row.fp, row.tn, row.fn) == (tp, fp, tn, fn)
+        assert row.accuracy == accuracy_score(y, pred)
+        assert row.precision == precision_score(y, pred, zero_division=0)  # pyright: ignore[reportArgumentType]
+        assert row.recall == recall_score(y, pred, zero_division=0)  # pyright: ignore[reportArgumentType]
+        assert row.f1 == f1_score(y, pred, zero_division=0)  # pyright: ignore[reportArgumentType]
+
+
+@pytest.mark.parametrize("labels", ["mixed", "no_positives"])
+def test_pr_curve_and_average_precision_match_sklearn_exactly(labels: str) -> None:
+    rng = np.random.default_rng(1)
+    y = rng.integers(0, 2, 500) if labels == "mixed" else np.zeros(500, dtype=int)
+    p = np.round(rng.random(500), 2)
+    curves = BinaryCurves.from_scores(y, p)
+
+    for got, want in zip(curves.pr_curve(), precision_recall_curve(y, p), strict=True):
+        assert np.array_equal(got, want)
+    assert curves.average_precision() == average_precision_score(y, p)
+
+    m = curves.metrics_at(0.5)
+    assert list(m) == ["accuracy", "precision", "recall", "f1", "roc_auc", "tp", "fp", "tn", "fn"]
+    assert isinstance(m["tp"], int) and isinstance(m["f1"], float)
+
+
+def test_single_class_and_invalid_input() -> None:
+    curves = BinaryCurves.from_scores([1, 1, 1], [0.2, 0.4, 0.9])
+    assert np.isnan(curves.roc_auc())
+    assert curves.sweep([0.5])["recall"].tolist() == [1 / 3]
+
+    with pytest.raises(ValueError, match="0/1"):
+        BinaryCurves.from_scores([0, 2], [0.1, 0.2])
+    with pytest.raises(ValueError, match="NaN"):
+        BinaryCurves.from_scores([0, 1], [0.1, float("nan")])
+
+
+def test_pareto_downsample_keeps_the_best_cutpoint_of_every_metric() -> None:
+    rng = np.random.default_rng(3)
+    y = rng.integers(0, 2, 2000)
+    p = np.round(np.clip(0.2 * y + 0.8 * rng.random(2000), 0, 1), 4)
+    full = BinaryCurves.from_scores(y, p).sweep_exact()
+
+    front = full.loc[pareto_mask(full["tp"].to_numpy(), full["fp"].to_numpy())]
+    assert len(front) < len(full)
+    for max_points in (len(full), 50, len(THRESHOLD_METRICS)):
+        small = pareto_downsample(full, max_points)
+        assert len(small) <= max_points
+        assert small["threshold"].is_monotonic_increasing
+        for metric in THRESHOLD_METRICS:
+            assert small[metric].max() == full[metric].max()
+            best = front.sort_values([metric, "threshold"], ascending=[False, True]).iloc[0]
+            assert best["threshold"] in set(small["threshold"])
+
+
+def test_pareto_downsample_pins_an_interior_precision_optimum() -> None:
+    y = np.array([0, 1, 0] + [1] * 20 + [0, 1] * 5 + [0] * 30 + [1])
+    full = BinaryCurves.from_scores(y, np.linspace(1, 0, len(y))).sweep_exact()
+
+    small = pareto_downsample(full, len(THRESHOLD_METRICS))
+
+    for metric in THRESHOLD_METRICS:
+        assert small[metric].max() == full[metric].max()
+
+
+def test_pareto_mask_drops_dominated_and_duplicate_rows() -> None:
+    tp = np.array([5, 5, 4, 3, 3, 0])
+    fp = np.array([3, 2, 2, 0, 0, 0])
+    assert pareto_mask(tp, fp).tolist() == [False, True, False, True, False, False]
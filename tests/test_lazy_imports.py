@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# CLIs whose startup must not pay for sklearn / joblib (imported on the paths that use them).
+LIGHT_CLIS = [
+    "mlproj.data.split",
+    "mlproj.evaluation.calibration",
+    "mlproj.evaluation.eval_predictions",
+    "mlproj.evaluation.pr_curve",
+    "mlproj.evaluation.sweep_thresholds",
+    "mlproj.evaluation.compare",
+    "mlproj.evaluation.compare_models_3",
+    "mlproj.evaluation.permutation_importance",
+    "mlproj.evaluation.write_final_report",
+    "mlproj.inference.calibrator",
+    "mlproj.inference.predict_baseline",
+    "mlproj.inference.predict_rf",
+    "mlproj.inference.predict_hgb",
+    "mlproj.inference.serve",
+]
+
+
+def test_light_clis_do_not_import_sklearn_or_joblib_at_startup() -> None:
+    code = (
+        f"import importlib, sys\n"
+        f"for m in {LIGHT_CLIS!r}:\n"
+        f"    importlib.import_module(m)\n"
+        f"print(sorted({{n.split('.')[0] for n in sys.modules}} & {{'sklearn', 'joblib', 'scipy'}}))"
+    )
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    out = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == "[]"
+
+
+def test_compare_models_3_renders_without_numpy_or_pandas() -> None:
+    code = (
+        "import sys\n"
+        "import mlproj.evaluation.compare_models_3\n"
+        "print(sorted({n.split('.')[0] for n in sys.modules} & {'numpy', 'pandas'}))"
+    )
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    out = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == "[]"
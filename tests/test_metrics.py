@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from typing import Any, cast
+
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+
+from mlproj.evaluation.metrics import (
+    UndefinedMetricWarning,
+    classification_metrics,
+    confusion_counts,
+    metrics_from_counts,
+)
+
+
+def _sklearn(y: np.ndarray, pred: np.ndarray, zero_division: Any) -> dict[str, float]:
+    zd = cast(Any, zero_division)
+    return {
+        "accuracy": float(accuracy_score(y, pred)),
+        "precision": float(precision_score(y, pred, zero_division=zd)),
+        "recall": float(recall_score(y, pred, zero_division=zd)),
+        "f1": float(f1_score(y, pred, zero_division=zd)),
+    }
+
+
+@pytest.mark.parametrize("zero_division", [0.0, 1.0])
+def test_metrics_match_sklearn_including_degenerate_inputs(zero_division: float) -> None:
+    rng = np.random.default_rng(0)
+    cases = [(rng.integers(0, 2, 300), rng.integers(0, 2, 300))]
+    cases += [
+        (np.array([0, 0, 0]), np.array([0, 0, 0])),  # nothing positive at all
+        (np.array([1, 1, 0]), np.array([0, 0, 0])),  # no predicted positives
+        (np.array([0, 0, 1]), np.array([1, 1, 1])),
+    ]
+    for y, pred in cases:
+        assert classification_metrics(y, pred, zero_division=zero_division) == _sklearn(
+            y, pred, zero_division
+        )
+
+
+def test_counts_are_vectorized_and_warn_mode_warns() -> None:
+    tp, fp = np.array([3, 0]), np.array([1, 0])
+    metrics = metrics_from_counts(tp, fp, np.array([4, 5]), np.array([2, 0]))
+    assert np.array_equal(metrics["precision"], [0.75, 0.0])
+    assert confusion_counts([1, 0, 1, 1], [1, 1, 0, 1]) == (2, 1, 0, 1)
+
+    with pytest.warns(UndefinedMetricWarning, match="Precision is ill-defined"):
+        assert classification_metrics([1, 0], [0, 0], zero_division="warn")["precision"] == 0.0
+    with pytest.raises(ValueError, match="0/1"):
+        confusion_counts([0, 2], [0, 1])
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+from mlproj.evaluation import permutation_importance as pi
+from mlproj.evaluation.write_final_report import render_final_report
+
+
+def _models(tmp_path: Path) -> tuple[dict[str, Path], Path]:
+    rng = np.random.default_rng(0)
+    n = 200
+    df = pd.DataFrame({"a": rng.normal(size=n), "noise": rng.normal(size=n)})
+    df["target"] = (df["a"] + rng.normal(scale=0.5, size=n) > 0).astype(int)
+    x, y = df[["a", "noise"]], df["target"]
+    paths = {"lr": tmp_path / "lr.joblib", "rf": tmp_path / "rf.joblib"}
+    joblib.dump(LogisticRegression().fit(x, y), paths["lr"])
+    joblib.dump(RandomForestClassifier(n_estimators=10, random_state=0).fit(x, y), paths["rf"])
+    # Columns in a different order than the models were fitted on.
+    df[["noise", "a", "target"]].to_csv(tmp_path / "test.csv", index=False)
+    return paths, tmp_path / "test.csv"
+
+
+def test_importance_ranks_informative_feature_and_ignores_workers(tmp_path: Path) -> None:
+    paths, test = _models(tmp_path)
+    df = pi.permutation_importance(paths, test, repeats=4, seed=1)
+    assert list(df.columns) == pi.CSV_COLUMNS
+    for _, rows in df.groupby("model"):
+        assert rows["feature"].iloc[0] == "a"
+        assert rows["importance_mean"].iloc[0] > 0.2
+
+    parallel = pi.permutation_importance(paths, test, repeats=4, seed=1, workers=2)
+    pd.testing.assert_frame_equal(df, parallel)
+
+
+def test_large_forest_scored_by_estimator_matches_compiled(tmp_path: Path) -> None:
+    paths, _ = _models(tmp_path)
+    rf = joblib.load(paths["rf"])
+    x = np.random.default_rng(2).normal(size=(50, 2))
+    small = pi._buffer_scorer(rf, ["a", "noise"], n_rows=len(x))
+    large = pi._buffer_scorer(rf, ["a", "noise"], n_rows=pi._FOREST_COMPILED_MAX_ROWS + 1)
+    np.testing.assert_array_equal(small(x), large(x))
+
+
+def test_markdown_section_embeds_in_final_report(tmp_path: Path) -> None:
+    paths, test = _models(tmp_path)
+    section = pi.render_importance_md(pi.permutation_importance(paths, test, repeats=2), top=1)
+    assert section.startswith("## Permutation feature importance")
+    assert "| Feature | lr | rf |" in section
+    assert "| a | +" in section and "| noise |" not in section
+
+    compare_md = "**Optimized metric (picked on val):** `f1`\n**Winner (by `f1` on test):** `rf`\n"
+    md = render_final_report("f1", "rf", compare_md, "# B\n", "# RF\n", importance_md=section)
+    assert md.rstrip().endswith(section.rstrip())
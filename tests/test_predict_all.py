@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+from mlproj.evaluation.eval_predictions import load_and_align
+from mlproj.inference.predict_all import main, score_all
+from mlproj.inference.wide import select_model_columns
+
+
+def _data() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(120, 3)), columns=["a", "b", "c"])
+    df["target"] = (df["a"] + df["b"] > 0).astype(int)
+    return df
+
+
+def test_predict_all_writes_one_wide_file_matching_each_model(tmp_path, monkeypatch) -> None:
+    df = _data()
+    x, y = df.drop(columns=["target"]), df["target"]
+    models = {
+        "lr": LogisticRegression().fit(x, y),
+        "rf": RandomForestClassifier(n_estimators=15, random_state=0).fit(x[["c", "a", "b"]], y),
+    }
+    for name, m in models.items():
+        joblib.dump(m, tmp_path / f"{name}.joblib")
+    df.to_csv(tmp_path / "in.csv", index=False)
+
+    out = tmp_path / "wide.csv"
+    specs = [f"{name}={tmp_path / f'{name}.joblib'}" for name in models]
+    argv = ["predict_all", "--input", str(tmp_path / "in.csv"), "--out", str(out)]
+    monkeypatch.setattr("sys.argv", [*argv, "--model", specs[0], "--model", specs[1]])
+    main()
+
+    wide = pd.read_csv(out, float_precision="round_trip")
+    # Compare against the same parsed input the per-model CLIs would score.
+    x = pd.read_csv(tmp_path / "in.csv").drop(columns=["target"])
+    assert list(wide.columns) == ["row_id", "proba_lr", "pred_lr", "proba_rf", "pred_rf"]
+    np.testing.assert_array_equal(
+        wide["proba_rf"], models["rf"].predict_proba(x[["c", "a", "b"]])[:, 1]
+    )
+    np.testing.assert_array_equal(wide["proba_lr"], models["lr"].predict_proba(x)[:, 1])
+
+    y_true, y_pred, y_proba, n = load_and_align(tmp_path / "in.csv", out, model="rf")
+    assert n == len(df) and y_proba is not None
+    np.testing.assert_array_equal(y_pred, wide["pred_rf"])
+
+
+def test_score_all_threads_match_serial_and_unknown_model_is_reported() -> None:
+    df = _data()
+    x, y = df.drop(columns=["target"]), df["target"]
+    models = {
+        "lr": LogisticRegression().fit(x, y),
+        "rf": RandomForestClassifier(n_estimators=15, random_state=0).fit(x, y),
+    }
+    serial = score_all(models, df)
+    threaded = score_all(models, df, threads=2)
+    for name in models:
+        np.testing.assert_array_equal(serial[name], threaded[name])
+
+    wide = pd.DataFrame({"row_id": [0], "proba_lr": [0.2], "pred_lr": [0]})
+    assert list(select_model_columns(wide, "lr").columns) == ["row_id", "proba_disease", "pred"]
+    with pytest.raises(ValueError, match="have: \\['lr'\\]"):
+        select_model_columns(wide, "hgb")
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import gc
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from mlproj.inference import records
+from mlproj.inference.records import RecordScorer, score_records
+from mlproj.inference.registry import compile_model
+
+
+def _frame() -> tuple[pd.DataFrame, np.ndarray]:
+    rng = np.random.default_rng(0)
+    x = pd.DataFrame(rng.normal(size=(200, 3)), columns=["a", "b", "c"])
+    y = (x["a"] - x["c"] > 0).astype(int).to_numpy()
+    return x, y
+
+
+def test_score_records_matches_predict_proba_for_compiled_and_plain_models() -> None:
+    x, y = _frame()
+    rf = RandomForestClassifier(n_estimators=10, random_state=0).fit(x, y)
+    logreg = LogisticRegression().fit(x, y)
+    records = [{"c": r.c, "target": 1, "a": r.a, "extra": "x", "b": r.b} for r in x.itertuples()]
+
+    # RF is compiled (bit-identical); a bare LogisticRegression has no compiled form.
+    assert np.array_equal(score_records(rf, records), np.asarray(rf.predict_proba(x))[:, 1])
+    np.testing.assert_allclose(
+        score_records(logreg, records), np.asarray(logreg.predict_proba(x))[:, 1]
+    )
+    assert np.array_equal(score_records(rf, x.to_numpy()), score_records(rf, records))
+
+
+def test_record_scorer_handles_missing_values_and_missing_columns() -> None:
+    x, y = _frame()
+    scorer = RecordScorer(RandomForestClassifier(n_estimators=5, random_state=0).fit(x, y))
+
+    m = scorer.matrix([{"a": 1, "b": None, "c": 2.5}])
+    assert m.shape == (1, 3) and np.isnan(m[0, 1])
+
+    with pytest.raises(ValueError, match=r"Missing required feature columns: \['b'\]"):
+        scorer.score([{"a": 1.0, "c": 2.0}])
+
+
+def test_scorer_cache_drops_collected_models() -> None:
+    x, y = _frame()
+    rf = RandomForestClassifier(n_estimators=5, random_state=0).fit(x, y)
+    score_records(rf, x.to_numpy())
+    assert id(rf) in records._SCORERS
+    key = id(rf)
+    del rf
+    gc.collect()
+    assert key not in records._SCORERS
+
+
+def test_pipeline_without_the_expected_steps_is_scored_uncompiled() -> None:
+    x, y = _frame()
+    pre = ColumnTransformer([("num", Pipeline([("scale", StandardScaler())]), ["a", "b", "c"])])
+    pipe = Pipeline([("pre", pre), ("clf", LogisticRegression())]).fit(x, y)
+    assert compile_model(pipe) is None
+    np.testing.assert_allclose(
+        score_records(pipe, [{"a": r.a, "b": r.b, "c": r.c} for r in x.itertuples()]),
+        np.asarray(pipe.predict_proba(x))[:, 1],
+    )
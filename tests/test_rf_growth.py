@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import roc_auc_score
+
+from mlproj.models.train_rf import _render_trees_md, build_model, oob_curve, train_rf
+
+
+def _split(rng: np.random.Generator, n: int) -> pd.DataFrame:
+    x = rng.normal(size=(n, 4))
+    df = pd.DataFrame(x, columns=["age", "chol", "thalach", "oldpeak"])
+    df["target"] = (x[:, 0] + rng.normal(scale=0.5, size=n) > 0).astype(int)
+    return df
+
+
+def _fit(
+    splits: tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame],
+    model_out: Path,
+    n_estimators: int,
+    **grow: Any,
+) -> RandomForestClassifier:
+    train_rf(
+        *splits,
+        model_out=model_out,
+        report_out=model_out.with_suffix(".md"),
+        n_estimators=n_estimators,
+        max_depth=None,
+        random_state=42,
+        n_jobs=1,
+        **grow,
+    )
+    return joblib.load(model_out)
+
+
+def test_growing_a_forest_matches_training_it_from_scratch(tmp_path: Path) -> None:
+    rng = np.random.default_rng(0)
+    splits = _split(rng, 120), _split(rng, 40), _split(rng, 40)
+    small = _fit(splits, tmp_path / "small.joblib", 20)
+    full = _fit(splits, tmp_path / "full.joblib", 30)
+
+    curve_out = tmp_path / "curve.csv"
+    clf = _fit(splits, tmp_path / "grown.joblib", 0, base=small, grow=10, oob_curve_out=curve_out)
+
+    assert len(clf.estimators_) == 30 and not clf.warm_start and clf.n_jobs == -1
+    x = splits[2].drop(columns=["target"])
+    assert np.array_equal(clf.predict_proba(x), full.predict_proba(x))
+    curve = pd.read_csv(curve_out)
+    assert curve["n_trees"].tolist() == [10, 20, 30]
+    assert "10 fitted this run" in (tmp_path / "grown.md").read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("max_samples", [None, 0.605])  # 150 * 0.605 = 90.75 draws 90 rows
+def test_oob_curve_ends_at_sklearn_oob_estimate(max_samples: float | None) -> None:
+    rng = np.random.default_rng(1)
+    train = _split(rng, 150)
+    x, y = train.drop(columns=["target"]), train["target"]
+    clf = build_model(n_estimators=25, random_state=3, n_jobs=1)
+    assert isinstance(clf, RandomForestClassifier)
+    clf.set_params(oob_score=True, min_samples_leaf=2, max_samples=max_samples).fit(x, y)
+
+    curve = oob_curve(clf, x, y, step=10)
+
+    assert curve["n_trees"].tolist() == [10, 20, 25]
+    assert curve["oob_rows"].iloc[-1] == len(x)
+    expected = (clf.oob_decision_function_[:, 1] >= 0.5).astype(int) == y.to_numpy()
+    assert np.isclose(curve["accuracy"].iloc[-1], expected.mean())
+    auc = roc_auc_score(y, clf.oob_decision_function_[:, 1])
+    assert np.isclose(curve["roc_auc"].iloc[-1], auc)
+
+
+def test_oob_plateau_starts_after_the_curve_last_leaves_the_band() -> None:
+    curve = pd.DataFrame({"n_trees": [10, 20, 30, 40, 50], "roc_auc": [0.9, 0.8, 0.7, 0.9, 0.9]})
+
+    md = _render_trees_md(n_trees=50, added=50, fit_s=1.0, latency={}, curve=curve, tol=0.01)
+
+    assert "within 0.01 of that from 40 trees on" in md
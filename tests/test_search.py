@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlproj.models import search
+from mlproj.models.search import load_best_params, rung_resources, successive_halving
+
+CANDIDATES = {
+    "rf": [{"max_depth": d, "min_samples_leaf": leaf} for d in (2, None) for leaf in (1, 5)],
+    "hgb": [{"learning_rate": 0.1}, {"learning_rate": 0.3}],
+}
+
+
+def _dev(tmp_path: Path, n: int = 90) -> list[Path]:
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(n, 3))
+    df = pd.DataFrame(x, columns=["age", "chol", "thalach"])
+    df["target"] = (x[:, 0] + rng.normal(scale=0.8, size=n) > 0).astype(int)
+    path = tmp_path / "dev.csv"
+    df.to_csv(path, index=False)
+    return [path]
+
+
+def test_rung_resources_end_at_the_full_resource() -> None:
+    assert rung_resources(48, eta=3, max_resource=400, min_resource=5) == [5, 15, 44, 133, 400]
+    assert rung_resources(48, eta=3, max_resource=400, min_resource=50) == [50, 133, 400]
+    assert rung_resources(1, eta=3, max_resource=400) == [400]
+
+
+def test_search_halves_to_one_winner_and_resumes_from_the_checkpoint(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    data = _dev(tmp_path)
+    ckpt = tmp_path / "ckpt.jsonl"
+    board, winners = successive_halving(CANDIDATES, data, ckpt, eta=2, min_resource=10)
+
+    # rf: 4 candidates at 100 trees, 2 at 200, 1 at 400; hgb: 2 at 200 iterations, 1 at 400.
+    assert board.groupby("model")["resource"].value_counts().to_dict() == {
+        ("hgb", 200): 2,
+        ("hgb", 400): 1,
+        ("rf", 100): 4,
+        ("rf", 200): 2,
+        ("rf", 400): 1,
+    }
+    assert set(winners) == {"rf", "hgb"} and all(w["complete"] for w in winners.values())
+    assert winners["rf"]["params"]["n_estimators"] == 400
+
+    best = tmp_path / "best.json"
+    best.write_text(json.dumps(winners), encoding="utf-8")
+    # The trainer's own number of iterations applies, not the halved resource.
+    assert load_best_params(best, "hgb") == {
+        "learning_rate": winners["hgb"]["params"]["learning_rate"]
+    }
+
+    def no_fit(job: object) -> tuple[float, float]:
+        raise AssertionError("resumed search re-fitted a candidate")
+
+    monkeypatch.setattr(search, "_evaluate", no_fit)
+    resumed_board, resumed = successive_halving(CANDIDATES, data, ckpt, eta=2, min_resource=10)
+    assert resumed == winners
+    pd.testing.assert_frame_equal(resumed_board, board)
+
+    with pytest.raises(ValueError, match="different search"):
+        successive_halving(CANDIDATES, data, ckpt, eta=3, min_resource=10)
+
+
+def test_exhausted_budget_stops_before_fitting(tmp_path: Path) -> None:
+    board, winners = successive_halving(
+        CANDIDATES, _dev(tmp_path), tmp_path / "ckpt.jsonl", budget_s=0.0
+    )
+    assert board.empty and winners == {}
+
+
+def test_winner_comes_from_the_last_fully_scored_rung(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    run_jobs = search._run_jobs
+    rungs: list[int] = []
+
+    def budget_ends_in_rung_1(jobs: list, ex: Any, deadline: float, on_result: Any) -> bool:
+        rungs.append(len(rungs))
+        if len(rungs) == 1:
+            return run_jobs(jobs, ex, deadline, on_result)
+        run_jobs(jobs[:1], ex, deadline, on_result)  # one finisher, then out of budget
+        return False
+
+    monkeypatch.setattr(search, "_run_jobs", budget_ends_in_rung_1)
+    board, winners = successive_halving(
+        CANDIDATES, _dev(tmp_path), tmp_path / "ckpt.jsonl", eta=2, min_resource=10
+    )
+
+    assert (board["rung"] == 1).sum() == 1
+    rung_0 = board[(board["model"] == "rf") & (board["rung"] == 0)]
+    assert winners["rf"]["resource"] == 100 and not winners["rf"]["complete"]
+    assert winners["rf"]["score"] == rung_0["score"].max()
+    best = tmp_path / "best.json"
+    best.write_text(json.dumps(winners), encoding="utf-8")
+    with pytest.raises(ValueError, match="full resource"):
+        load_best_params(best, "rf")
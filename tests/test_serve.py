@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from mlproj.inference.serve import MicroBatcher, ScoringServer
+
+
+def _toy_model() -> LogisticRegression:
+    x = pd.DataFrame({"a": [0.0, 1.0, 2.0, 3.0], "b": [1.0, 0.0, 1.0, 0.0]})
+    return LogisticRegression().fit(x, [0, 0, 1, 1])
+
+
+def test_micro_batcher_matches_predict_proba_and_batches_concurrent_jobs() -> None:
+    model = _toy_model()
+    records = [{"b": float(i % 2), "a": i / 10, "target": 1} for i in range(40)]
+    expected = model.predict_proba(pd.DataFrame(records)[["a", "b"]])[:, 1]
+
+    batcher = MicroBatcher(model, max_batch=16, max_wait_ms=20.0)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            got = list(ex.map(lambda r: batcher.score([r])[0], records))
+    finally:
+        batcher.close()
+
+    np.testing.assert_allclose(got, expected)
+    stats = batcher.stats.snapshot()
+    assert stats["requests"] == 40
+    assert stats["batches"] < 40
+    assert stats["p99_ms"] >= stats["p50_ms"] > 0
+
+
+def test_scoring_server_predict_and_stats_endpoints() -> None:
+    server = ScoringServer(("127.0.0.1", 0), {"toy": _toy_model()}, max_wait_ms=1.0)
+    port = server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        body = json.dumps({"record": {"a": 3.0, "b": 0.0}, "threshold": 0.5}).encode()
+        req = urllib.request.Request(f"http://127.0.0.1:{port}/predict/toy", data=body)
+        with urllib.request.urlopen(req) as resp:
+            out = json.loads(resp.read())
+        assert out["model"] == "toy"
+        assert 0.0 <= out["proba_disease"] <= 1.0
+        assert out["pred"] in (0, 1)
+
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/stats") as resp:
+            stats = json.loads(resp.read())
+        assert stats["toy"]["requests"] == 1
+
+        for bad in (b"[]", b"1", b'"record"'):
+            req = urllib.request.Request(f"http://127.0.0.1:{port}/predict/toy", data=bad)
+            with pytest.raises(urllib.error.HTTPError) as err:
+                urllib.request.urlopen(req)
+            assert err.value.code == 400
+            assert "JSON object" in json.loads(err.value.read())["error"]
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from mlproj.inference.predict_rf import main
+from mlproj.inference.sharded import predict_sharded, shard_byte_ranges
+
+
+def test_shard_byte_ranges_cover_every_line_exactly_once(tmp_path) -> None:
+    p = tmp_path / "in.csv"
+    lines = [f"{i},{i * 7 % 13}" for i in range(101)]
+    p.write_text("a,b\n" + "\n".join(lines) + "\n", encoding="utf-8")
+
+    header, ranges = shard_byte_ranges(p, 8)
+    data = p.read_bytes()
+
+    assert header == b"a,b\n"
+    assert b"".join(data[s:e] for s, e in ranges) == data[len(header) :]
+    assert all(data[e - 1 : e] == b"\n" for _, e in ranges)
+
+
+def test_predict_sharded_is_byte_identical_to_single_process(tmp_path, monkeypatch) -> None:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {"a": rng.normal(size=200), "b": rng.normal(size=200), "target": rng.integers(0, 2, 200)}
+    )
+    clf = RandomForestClassifier(n_estimators=15, random_state=0, n_jobs=-1)
+    clf.fit(df[["a", "b"]], df["target"])
+    joblib.dump(clf, tmp_path / "rf.joblib")
+    df.to_csv(tmp_path / "in.csv", index=False)
+
+    monkeypatch.setattr(
+        "sys.argv",
+        [
+            "predict_rf",
+            "--input",
+            str(tmp_path / "in.csv"),
+            "--out",
+            str(tmp_path / "single.csv"),
+            "--model",
+            str(tmp_path / "rf.joblib"),
+        ],
+    )
+    main()
+
+    n = predict_sharded(
+        tmp_path / "in.csv",
+        tmp_path / "sharded.csv",
+        model_path=tmp_path / "rf.joblib",
+        threshold=0.5,
+        workers=2,
+    )
+
+    assert n == len(df)
+    assert (tmp_path / "sharded.csv").read_bytes() == (tmp_path / "single.csv").read_bytes()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+from mlproj.inference import predict_baseline, predict_rf
+
+
+def _run(monkeypatch: pytest.MonkeyPatch, main: Callable[[], None], argv: list[str]) -> None:
+    monkeypatch.setattr("sys.argv", ["prog", *argv])
+    main()
+
+
+def _toy_input(n: int = 23) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {"a": rng.normal(size=n), "b": rng.normal(size=n), "target": rng.integers(0, 2, n)}
+    )
+
+
+def test_baseline_chunked_output_matches_whole_file(tmp_path, monkeypatch) -> None:
+    df = _toy_input()
+    model = LogisticRegression().fit(df[["a", "b"]], df["target"])
+    joblib.dump(model, tmp_path / "m.joblib")
+    df.to_csv(tmp_path / "in.csv", index=False)
+
+    common = ["--model", str(tmp_path / "m.joblib"), "--input", str(tmp_path / "in.csv")]
+    _run(monkeypatch, predict_baseline.main, [*common, "--out", str(tmp_path / "full.csv")])
+    _run(
+        monkeypatch,
+        predict_baseline.main,
+        [*common, "--out", str(tmp_path / "chunked.csv"), "--chunksize", "5"],
+    )
+
+    chunked = (tmp_path / "chunked.csv").read_bytes()
+    assert chunked == (tmp_path / "full.csv").read_bytes()
+    assert pd.read_csv(tmp_path / "chunked.csv")["row_id"].tolist() == list(range(len(df)))
+
+
+def test_rf_chunked_output_matches_whole_file(tmp_path, monkeypatch) -> None:
+    df = _toy_input()
+    clf = RandomForestClassifier(n_estimators=10, random_state=0).fit(df[["a", "b"]], df["target"])
+    joblib.dump(clf, tmp_path / "rf.joblib")
+    df.to_csv(tmp_path / "in.csv", index=False)
+
+    common = ["--model", str(tmp_path / "rf.joblib"), "--input", str(tmp_path / "in.csv")]
+    _run(monkeypatch, predict_rf.main, [*common, "--out", str(tmp_path / "full.csv")])
+    _run(
+        monkeypatch,
+        predict_rf.main,
+        [*common, "--out", str(tmp_path / "chunked.csv"), "--chunksize", "4"],
+    )
+
+    assert (tmp_path / "chunked.csv").read_bytes() == (tmp_path / "full.csv").read_bytes()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlproj.evaluation import eval_predictions
+from mlproj.evaluation.curves import BinaryCurves
+from mlproj.evaluation.streaming import MetricAccumulator
+
+
+def _data(n: int = 500, seed: int = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    y = rng.integers(0, 2, n)
+    p = np.clip(0.3 * y + 0.7 * rng.random(n), 0, 1)
+    return y, (p >= 0.5).astype(int), p
+
+
+def test_merged_shards_give_exact_threshold_metrics_and_bounded_auc_ap() -> None:
+    y, pred, p = _data()
+    acc = MetricAccumulator.empty(bins=16)
+    for part in np.array_split(np.arange(len(y)), 4):
+        shard = MetricAccumulator.empty(bins=16)
+        shard.update(y[part], pred[part], p[part])
+        acc.merge(shard)
+
+    single = MetricAccumulator.empty(bins=16)
+    single.update(y, pred, p)
+    assert np.array_equal(acc.counts, single.counts) and acc.n == len(y)
+
+    exact = BinaryCurves.from_scores(y, p)
+    metrics = acc.metrics()
+    at = exact.metrics_at(0.5)
+    for k in ("accuracy", "precision", "recall", "f1"):
+        assert metrics[k] == pytest.approx(at[k], abs=1e-15)
+
+    # Binned values are exactly sklearn's on the binned scores ...
+    binned = BinaryCurves.from_scores(y, np.floor(p * 16).clip(max=15))
+    assert metrics["roc_auc"] == pytest.approx(binned.roc_auc(), abs=1e-12)
+    assert metrics["average_precision"] == pytest.approx(binned.average_precision(), abs=1e-12)
+    # ... and the bounds contain the unbinned values.
+    bounds = acc.bounds()
+    lo, hi = bounds["roc_auc"]
+    assert lo <= exact.roc_auc() <= hi and hi - lo < 0.1
+    lo, hi = bounds["average_precision"]
+    assert lo <= exact.average_precision() <= hi
+
+
+def test_accumulator_rejects_mismatched_inputs() -> None:
+    acc = MetricAccumulator.empty(bins=8)
+    with pytest.raises(ValueError, match=r"\[0, 1\]"):
+        acc.update([0, 1], [0, 1], [0.5, np.nan])
+    with pytest.raises(ValueError, match="same binning"):
+        acc.merge(MetricAccumulator.empty(bins=4))
+    unscored = MetricAccumulator.empty(scored=False)
+    unscored.update([0, 1, 1], [0, 1, 0])
+    assert set(unscored.metrics()) == {"accuracy", "precision", "recall", "f1"}
+
+
+def _write(tmp_path: Path, preds: pd.DataFrame) -> tuple[Path, Path]:
+    y, _, _ = _data()
+    pd.DataFrame({"x": np.zeros(len(y)), "target": y}).to_csv(tmp_path / "in.csv", index=False)
+    preds.to_csv(tmp_path / "preds.csv", index=False)
+    return tmp_path / "in.csv", tmp_path / "preds.csv"
+
+
+def test_chunked_cli_matches_whole_file_threshold_metrics(tmp_path, monkeypatch) -> None:
+    y, pred, p = _data()
+    rows = np.arange(len(y))
+    input_path, preds_path = _write(
+        tmp_path, pd.DataFrame({"row_id": rows, "proba_disease": p, "pred": pred})
+    )
+    payloads = {}
+    for name, extra in (("full", []), ("chunked", ["--chunksize", "64"])):
+        out = tmp_path / f"{name}.json"
+        argv = ["--input", str(input_path), "--preds", str(preds_path), "--out", str(out)]
+        monkeypatch.setattr("sys.argv", ["prog", *argv, "--bootstrap", "200", *extra])
+        eval_predictions.main()
+        payloads[name] = json.loads(out.read_text())
+
+    full, chunked = payloads["full"], payloads["chunked"]
+    assert chunked["n_rows"] == full["n_rows"] == len(y)
+    for k in ("accuracy", "precision", "recall", "f1"):
+        assert chunked["metrics"][k] == pytest.approx(full["metrics"][k], abs=1e-15)
+    lo, hi = chunked["streaming"]["bounds"]["roc_auc"]
+    assert lo - 1e-12 <= full["metrics"]["roc_auc"] <= hi + 1e-12
+    assert set(chunked["ci"]["metrics"]) == set(full["ci"]["metrics"])
+
+
+def test_chunked_reading_requires_predictions_in_input_order(tmp_path) -> None:
+    y, pred, p = _data()
+    shuffled = pd.DataFrame({"row_id": np.arange(len(y))[::-1], "proba_disease": p, "pred": pred})
+    input_path, preds_path = _write(tmp_path, shuffled)
+    with pytest.raises(ValueError, match="input order"):
+        eval_predictions.stream_accumulate(input_path, preds_path, chunksize=100)
+
+    pd.DataFrame({"pred": pred[:-3]}).to_csv(preds_path, index=False)
+    with pytest.raises(ValueError, match="Row mismatch"):
+        eval_predictions.stream_accumulate(input_path, preds_path, chunksize=100)
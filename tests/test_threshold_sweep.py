@@ -1,6 +1,7 @@
 import pandas as pd
 
-from mlproj.evaluation.sweep_thresholds import sweep_thresholds
+from mlproj.evaluation.pick_best_threshold import pick_best_threshold
+from mlproj.evaluation.sweep_thresholds import sweep_exact, sweep_thresholds
 
 
 def test_sweep_thresholds_outputs_expected_columns() -> None:
@@ -26,3 +27,19 @@ def test_sweep_thresholds_outputs_expected_columns() -> None:
     row = df.iloc[0]
     assert row["threshold"] == 0.5
     assert 0.0 <= row["roc_auc"] <= 1.0
+
+
+def test_sweep_exact_finds_the_optimum_between_grid_points() -> None:
+    y_true = pd.Series([0, 0, 1, 1, 0, 1])
+    proba = pd.Series([0.1, 0.42, 0.43, 0.9, 0.44, 0.441])
+
+    grid = sweep_thresholds(y_true=y_true, proba=proba, t_min=0.05, t_max=0.95, t_step=0.05)
+    exact = sweep_exact(y_true=y_true, proba=proba)
+
+    assert exact["threshold"].tolist() == sorted(proba)
+    assert exact["f1"].max() > grid["f1"].max()
+    assert pick_best_threshold(exact, metric="f1") == 0.43
+
+    thinned = sweep_exact(y_true=y_true, proba=proba, max_points=2)
+    assert len(thinned) == 2
+    assert pick_best_threshold(thinned, metric="f1") == 0.43
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlproj.models.train_all import cpu_budgets, train_all
+
+
+def test_cpu_budgets_give_the_baseline_one_core_and_split_the_rest() -> None:
+    assert cpu_budgets(8) == {"baseline": 1, "rf": 4, "hgb": 3}
+    assert cpu_budgets(4) == {"baseline": 1, "rf": 2, "hgb": 1}
+    assert cpu_budgets(1) == {"baseline": 1, "rf": 1, "hgb": 1}
+    assert cpu_budgets(6, ("rf", "hgb")) == {"rf": 3, "hgb": 3}
+
+
+def test_train_all_writes_the_three_artifacts(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    rng = np.random.default_rng(0)
+    data_dir = tmp_path / "data/processed"
+    data_dir.mkdir(parents=True)
+    for split, n in (("train", 120), ("val", 40), ("test", 40)):
+        x = rng.normal(size=(n, 4))
+        df = pd.DataFrame(x, columns=["age", "chol", "thalach", "oldpeak"])
+        df["target"] = (x[:, 0] + rng.normal(scale=0.5, size=n) > 0).astype(int)
+        df.loc[::7, "chol"] = np.nan  # imputed from the read-only mapped columns
+        df.to_csv(data_dir / f"{split}.csv", index=False)
+    monkeypatch.chdir(tmp_path)
+
+    fit_s = train_all(cpus=2, workers=1)
+
+    assert set(fit_s) == {"baseline", "rf", "hgb"}
+    for path in ("models/baseline_logreg.joblib", "models/rf.joblib", "models/hgb.joblib"):
+        assert (tmp_path / path).exists()
+    for path in ("reports/baseline_metrics.md", "reports/rf_metrics.md", "reports/hgb_metrics.md"):
+        assert (tmp_path / path).read_text(encoding="utf-8").startswith("#")
+    assert joblib.load(tmp_path / "models/rf.joblib").n_jobs == -1  # budget used for fit only
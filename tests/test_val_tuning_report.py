@@ -12,3 +12,11 @@ def test_render_val_tuning_report_contains_metric_and_threshold() -> None:
     assert "`0.350`" in md
     assert "## Best row on val" in md
     assert "## Test metrics" in md
+
+
+def test_render_val_tuning_report_prints_an_exact_threshold_in_full() -> None:
+    thr = 0.35721893
+    md = render_val_tuning_report(
+        metric="f1", best_threshold=thr, val_best={"threshold": thr}, test_metrics={}
+    )
+    assert f"**Chosen threshold:** `{thr!r}`" in md